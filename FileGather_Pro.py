@@ -8,6 +8,7 @@
 
 import sys
 import os
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 
 # 添加components路径到模块搜索路径
@@ -37,4 +38,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后的程序启动内容提取子进程时需要
+    multiprocessing.freeze_support()
     main()
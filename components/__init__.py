@@ -14,7 +14,11 @@ from .utils import (
 )
 from .search_logic import (
     matches_keyword,
+    compile_keyword,
+    CompiledQuery,
+    ExactQuery,
     search_content,
+    extract_text,
     search_text_file,
     search_pdf,
     search_docx,
@@ -43,7 +47,11 @@ __all__ = [
     'is_file_locked',
     'get_file_info_dict',
     'matches_keyword',
+    'compile_keyword',
+    'CompiledQuery',
+    'ExactQuery',
     'search_content',
+    'extract_text',
     'search_text_file',
     'search_pdf',
     'search_docx',
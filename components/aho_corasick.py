@@ -0,0 +1,71 @@
+"""
+Aho-Corasick 多模式匹配模块
+一次扫描文本即可找出全部出现的模式串，用于大批量关键词的文件名匹配
+"""
+
+from collections import deque
+
+
+class AhoCorasick:
+    """Aho-Corasick 自动机"""
+
+    def __init__(self, patterns):
+        """
+        构建自动机
+
+        Args:
+            patterns: 模式串列表（应为非空字符串），其下标即模式编号
+        """
+        self.patterns = list(patterns)
+        # goto[state] 为 字符 -> 下一状态 的字典
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for index, pattern in enumerate(self.patterns):
+            self._add(pattern, index)
+        self._build_failure_links()
+
+    def _add(self, pattern, index):
+        """向字典树中加入一个模式串"""
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (index,)
+
+    def _build_failure_links(self):
+        """按广度优先顺序计算失败指针，并合并输出集合"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text):
+        """返回文本中出现过的全部模式编号集合"""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
@@ -0,0 +1,400 @@
+"""
+内容搜索模块
+一次搜索中每个文件只提取一次文本，再用全部关键词对同一份文本进行匹配；
+PDF、DOCX、XLSX 的解析可交给子进程并行执行，子进程超时或崩溃时只跳过对应文件
+"""
+
+import os
+import time
+import multiprocessing
+from multiprocessing import connection as mp_connection
+from pathlib import Path
+
+from .file_sniffer import KIND_TEXT, sniff_bytes, read_head
+from .search_logic import (
+    EXTRACTORS, DOCUMENT_CHAR_LIMIT, MMAP_THRESHOLD, extract_text, matches_keyword,
+    scan_text_file
+)
+
+
+def resolve_process_count(processes):
+    """将设置中的进程数转换为实际进程数（0 或负数表示按 CPU 核数自动选择）"""
+    if processes and processes > 0:
+        return int(processes)
+    return max(1, os.cpu_count() or 1)
+
+
+class ContentSearcher:
+    """
+    内容匹配器
+
+    extractor_calls 记录实际调用文本提取的次数（命中文本缓存的文件不计），便于测试和统计；
+    timings 记录每个文档的提取耗时。
+    """
+
+    def __init__(self, query, cache=None, pdf_max_pages=0, scan_chars=DOCUMENT_CHAR_LIMIT,
+                 mmap_threshold=MMAP_THRESHOLD, all_text=False):
+        """
+        Args:
+            query: 本次搜索的 CompiledQuery
+            cache: 可选的 TextCache
+            pdf_max_pages: PDF 最多读取的页数，0 表示不限制
+            scan_chars: 每个文件最多检查的字符数，0 表示整个文件
+            mmap_threshold: 超过该大小（字节）的纯文本文件用 mmap 扫描，0 表示不使用 mmap
+            all_text: 扩展名未知的文件也嗅探文件头：是文本就按纯文本扫描，
+                      符合某种文档格式特征的交给对应的提取器
+        """
+        self.query = query
+        self.cache = cache
+        self.pdf_max_pages = pdf_max_pages
+        self.scan_chars = scan_chars
+        self.mmap_threshold = mmap_threshold
+        self.all_text = all_text
+        self.extractor_calls = 0
+        # 嗅探为二进制而跳过的文件数
+        self.binary_skipped = 0
+        # [(路径, 秒), ...]，只记录 PDF、DOCX、XLSX 等文档
+        self.timings = []
+
+    def load_text(self, file_path, extractor=None):
+        """
+        提取文件文本，声明了 cached 的格式优先使用缓存；不支持或提取失败时返回 None
+
+        Args:
+            file_path: 文件路径
+            extractor: 可选，使用的提取器；默认按扩展名选择
+        """
+        file_path = Path(file_path)
+        if extractor is None:
+            extractor = EXTRACTORS.for_extension(file_path.suffix)
+        if extractor is None:
+            return None
+        if self.cache is None or not extractor.cached:
+            return self._extract(file_path, extractor)
+
+        text, key = self.lookup(file_path)
+        if text is self.cache.MISS:
+            text = self._extract(file_path, extractor)
+            self.store(key, text)
+        return text
+
+    def lookup(self, file_path):
+        """
+        查询文本缓存
+
+        Returns:
+            (文本或 TextCache.MISS, 缓存键)；未配置缓存时返回 (None, None)
+        """
+        if self.cache is None:
+            return None, None
+        st = Path(file_path).stat()
+        key = (str(file_path), st.st_size, st.st_mtime_ns)
+        return self.cache.get(*key), key
+
+    def store(self, key, text):
+        """把在其它地方（如进程池中）提取的文本写入缓存"""
+        if self.cache is not None and key is not None:
+            self.cache.put(*key, text)
+
+    def _extract(self, file_path, extractor, matchers=()):
+        """调用提取器并记录耗时；matchers 非空且提取器支持流式时各关键词结果确定后即停止读取"""
+        self.extractor_calls += 1
+        start = time.perf_counter()
+        try:
+            return extractor.extract(file_path, matchers, self.scan_chars,
+                                     max_pages=self.pdf_max_pages)
+        finally:
+            if extractor.cached:
+                self.timings.append((str(file_path), time.perf_counter() - start))
+
+    def route(self, file_path):
+        """
+        选择处理文件内容的提取器
+
+        先按扩展名查找；扩展名未注册且开启 all_text 时读取文件头：文本文件按纯文本扫描，
+        符合唯一一种文档格式特征的（如改了扩展名的 PDF）交给对应提取器，其余视为二进制跳过。
+
+        Returns:
+            Extractor；不处理该文件时返回 None
+        """
+        extractor = EXTRACTORS.for_extension(file_path.suffix)
+        if extractor is not None or not self.all_text:
+            return extractor
+        head = read_head(file_path)
+        if sniff_bytes(head) == KIND_TEXT:
+            return EXTRACTORS.get('text')
+        extractor = EXTRACTORS.for_head(head)
+        if extractor is None:
+            self.binary_skipped += 1
+        return extractor
+
+    def match(self, file_path, keywords=None):
+        """
+        返回内容命中的关键词列表（按原关键词顺序）
+
+        Args:
+            file_path: 文件路径
+            keywords: 可选，只检查这些关键词（如“两者同时”模式下文件名未命中的关键词）
+        """
+        if keywords is not None and not keywords:
+            return []
+        try:
+            file_path = Path(file_path)
+            extractor = self.route(file_path)
+            if extractor is None:
+                return []
+            if extractor.scanner is not None:
+                return self._scan_text_file(file_path, keywords)
+            if self.cache is None or not extractor.cached:
+                # 不需要缓存完整文本时，各关键词结果确定后即停止读取
+                text = self._extract(file_path, extractor, self.query.matchers_for(keywords))
+            else:
+                text = self.load_text(file_path, extractor)
+        except Exception as e:
+            print(f"内容搜索失败: {file_path} - {str(e)}")
+            return []
+        return self.match_text(text, keywords, file_path)
+
+    def _scan_text_file(self, file_path, keywords):
+        """分块扫描纯文本文件，不把整个文件读入内存；嗅探为二进制的文件直接跳过"""
+        stream = scan_text_file(file_path, self.query.matchers_for(keywords), self.scan_chars,
+                                mmap_threshold=self.mmap_threshold, skip_binary=True)
+        if stream is None:
+            self.binary_skipped += 1
+            return []
+        self.extractor_calls += 1
+        for keyword, error in stream.errors:
+            print(f"内容搜索失败: {file_path} - {keyword}: {str(error)}")
+        return stream.result()
+
+    def match_text(self, text, keywords=None, file_path=None):
+        """用关键词匹配已提取的文本，text 为 None 时返回空列表"""
+        if text is None:
+            return []
+        if keywords is not None and not keywords:
+            return []
+
+        text_lower = text.lower()
+        try:
+            return self.query.match_lower(text_lower, keywords)
+        except Exception:
+            # 某个关键词无法匹配（如无效的通配符）时，只让该关键词失败
+            matched = []
+            for keyword in (self.query.keywords if keywords is None else keywords):
+                try:
+                    if matches_keyword(text, keyword):
+                        matched.append(keyword)
+                except Exception as e:
+                    print(f"内容搜索失败: {file_path} - {str(e)}")
+            return matched
+
+
+# 跳过原因
+SKIP_TIMEOUT = "提取超时"
+SKIP_MEMORY = "内存超出上限"
+SKIP_CRASHED = "提取进程崩溃"
+SKIP_TOO_LARGE = "超过大小上限"
+
+
+def _limit_memory(memory_limit):
+    """在子进程中限制地址空间大小（Windows 没有 resource 模块，只依靠超时）"""
+    if not memory_limit:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    except (ValueError, OSError) as e:
+        print(f"无法设置提取进程内存上限: {str(e)}")
+
+
+def _extractor_main(conn, memory_limit, extractor):
+    """提取子进程的主循环：逐个接收路径并返回 (状态, 文本, 耗时)，收到 None 时退出"""
+    _limit_memory(memory_limit)
+    while True:
+        try:
+            path = conn.recv()
+        except (EOFError, OSError):
+            return
+        if path is None:
+            return
+        start = time.perf_counter()
+        try:
+            text = extractor(path)
+            status = "ok"
+        except MemoryError:
+            text, status = None, "memory"
+        except Exception as e:
+            print(f"内容提取失败: {path} - {str(e)}")
+            text, status = None, "ok"
+        conn.send((status, text, time.perf_counter() - start))
+
+
+class _ExtractorProcess:
+    """一个可随时终止的提取子进程，同一时间只处理一个文件"""
+
+    def __init__(self, context, memory_limit, extractor):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_extractor_main,
+                                       args=(child_conn, memory_limit, extractor), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None
+        self.started = 0.0
+
+    def send(self, token, file_path):
+        self.task = (token, str(file_path))
+        self.started = time.monotonic()
+        self.conn.send(str(file_path))
+
+    def stop(self, force=False):
+        """结束子进程；force 为 False 时先请求正常退出"""
+        if not force and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(1.0)
+            except (OSError, ValueError):
+                pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ContentPipeline:
+    """
+    文档文本提取流水线
+
+    每个提取子进程同一时间只处理一个文件，全部子进程忙碌时提交会等待（背压），
+    结果按完成顺序返回。超时、超出内存上限或崩溃的子进程被直接终止并在需要时重新启动，
+    对应文件连同跳过原因一起返回给调用方（由 SearchWorker 记录到 skipped），其余文件继续搜索。
+    子进程在第一次提交时才启动。
+    """
+
+    def __init__(self, processes, timeout=0, memory_limit=0, cancel=None, extractor=extract_text):
+        """
+        Args:
+            processes: 提取进程数
+            timeout: 单个文件的提取超时（秒），0 表示不限制
+            memory_limit: 子进程地址空间上限（字节），0 表示不限制
+            cancel: 可选的无参函数，返回 True 时停止等待
+            extractor: 在子进程中执行的提取函数（须可被 pickle，如模块级函数或其 functools.partial）
+        """
+        self.processes = max(1, int(processes))
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.cancel = cancel
+        self.extractor = extractor
+        self.submitted = 0
+        self.pool_starts = 0
+        # [(路径, 秒), ...]，子进程内测得的提取耗时
+        self.timings = []
+        # 主进程中运行着 Qt 线程，使用 spawn 避免 fork 带来的锁状态问题
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = []
+        self._busy = []
+
+    def __len__(self):
+        return len(self._busy)
+
+    def _cancelled(self):
+        return self.cancel is not None and self.cancel()
+
+    def submit(self, token, file_path):
+        """
+        提交一个文件；所有子进程都在忙时先等待部分任务完成
+
+        Returns:
+            等待期间完成的 [(token, 文本, 跳过原因或 None), ...]
+        """
+        done = []
+        while not self._idle and len(self._busy) >= self.processes:
+            if self._cancelled():
+                return done
+            done.extend(self.collect(timeout=0.1))
+
+        worker = self._idle.pop() if self._idle else self._start_worker()
+        try:
+            worker.send(token, file_path)
+        except (OSError, ValueError):
+            # 空闲的子进程已意外退出，换一个新进程
+            worker.stop(force=True)
+            worker = self._start_worker()
+            worker.send(token, file_path)
+        self._busy.append(worker)
+        self.submitted += 1
+        return done
+
+    def _start_worker(self):
+        self.pool_starts += 1
+        return _ExtractorProcess(self._context, self.memory_limit, self.extractor)
+
+    def collect(self, timeout=0):
+        """返回已完成的 [(token, 文本, 跳过原因或 None), ...]，最多等待 timeout 秒"""
+        if not self._busy:
+            return []
+        if self.timeout:
+            # 不要睡过最早的超时时刻
+            now = time.monotonic()
+            nearest = min(w.started for w in self._busy) + self.timeout
+            timeout = max(0, min(timeout, nearest - now))
+
+        handles = {}
+        for worker in self._busy:
+            handles[worker.conn] = worker
+            handles[worker.process.sentinel] = worker
+        ready = {handles[h] for h in mp_connection.wait(list(handles), timeout)}
+
+        results = []
+        now = time.monotonic()
+        for worker in list(self._busy):
+            token, path = worker.task
+            if worker in ready:
+                status, text, elapsed = self._receive(worker)
+            elif self.timeout and now - worker.started > self.timeout:
+                status, text, elapsed = "timeout", None, None
+            else:
+                continue
+
+            self._busy.remove(worker)
+            worker.task = None
+            self.timings.append((path, now - worker.started if elapsed is None else elapsed))
+            if status == "ok":
+                if worker.process.is_alive():
+                    self._idle.append(worker)
+                else:
+                    worker.stop(force=True)
+                results.append((token, text, None))
+                continue
+
+            # 子进程状态不可信，直接终止，下次提交时重新启动
+            worker.stop(force=True)
+            reason = {"timeout": SKIP_TIMEOUT, "memory": SKIP_MEMORY}.get(status, SKIP_CRASHED)
+            print(f"跳过文件 {path}，原因: {reason}")
+            results.append((token, None, reason))
+        return results
+
+    @staticmethod
+    def _receive(worker):
+        """读取子进程的结果；管道关闭说明子进程已异常退出"""
+        try:
+            if worker.conn.poll():
+                return worker.conn.recv()
+        except (EOFError, OSError):
+            pass
+        return "crashed", None, None
+
+    def drain(self):
+        """按完成顺序产出剩余的全部结果，取消时提前结束"""
+        while self._busy and not self._cancelled():
+            yield from self.collect(timeout=0.1)
+
+    def close(self):
+        """结束全部子进程；已取消或仍有未完成任务时直接终止"""
+        force = self._cancelled() or bool(self._busy)
+        for worker in self._idle + self._busy:
+            worker.stop(force=force)
+        self._idle = []
+        self._busy = []
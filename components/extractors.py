@@ -0,0 +1,133 @@
+"""
+内容提取器注册表
+每种格式登记一个 Extractor，声明扩展名、文件头特征、是否支持流式提前结束、典型开销，
+以及能否在搜索线程内运行；内容搜索按注册表分发，不再硬编码扩展名判断
+
+内置格式在 search_logic 中注册。提取子进程以 spawn 方式启动时会重新导入模块，
+因此新增格式应在模块导入时注册，而不是在运行中临时注册。
+"""
+
+
+class Extractor:
+    """
+    单个格式的提取器
+
+    function 的调用方式为 function(file_path, limit=..., **options)；streaming 为 True 时
+    还接受 matchers 参数，各关键词结果确定后即停止读取。
+    """
+
+    __slots__ = ('name', 'function', 'extensions', 'magic', 'streaming', 'cost',
+                 'needs_process', 'cached', 'scanner', 'options')
+
+    def __init__(self, name, function, extensions, magic=(), streaming=False, cost=1,
+                 needs_process=False, cached=False, scanner=None, options=()):
+        """
+        Args:
+            name: 格式名称，如 "pdf"
+            function: 提取函数，返回文本，失败时返回 None
+            extensions: 扩展名列表（含点号，不区分大小写）
+            magic: 文件头特征（字节串），任一前缀匹配即视为该格式
+            streaming: 是否支持传入 matchers 提前结束
+            cost: 单个文件的典型相对开销（纯文本为 1），调度时先提交开销大的文件
+            needs_process: 是否需要在子进程中运行（解析复杂格式，可能卡死、崩溃或占用大量内存）
+            cached: 提取结果是否写入文本缓存
+            scanner: 可选的扫描函数，直接对文件做分块匹配而不提取全文（如纯文本）
+            options: function 额外接受的参数名，如 PDF 的 max_pages
+        """
+        self.name = name
+        self.function = function
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.magic = tuple(magic)
+        self.streaming = streaming
+        self.cost = cost
+        self.needs_process = needs_process
+        self.cached = cached
+        self.scanner = scanner
+        self.options = tuple(options)
+
+    def __repr__(self):
+        return f"Extractor({self.name!r})"
+
+    def accepts_head(self, head):
+        """文件头是否符合该格式的特征"""
+        return bool(self.magic) and head.startswith(self.magic)
+
+    def extract(self, file_path, matchers=(), limit=None, **options):
+        """
+        提取文本
+
+        Args:
+            file_path: 文件路径
+            matchers: KeywordMatcher 列表，仅 streaming 提取器使用
+            limit: 最多提取的字符数，None 表示使用提取函数的默认值
+            **options: 额外参数，只传入 options 中声明的参数
+        """
+        kwargs = {name: value for name, value in options.items() if name in self.options}
+        if limit is not None:
+            kwargs['limit'] = limit
+        if self.streaming and matchers:
+            kwargs['matchers'] = matchers
+        return self.function(file_path, **kwargs)
+
+
+class ExtractorRegistry:
+    """扩展名到提取器的映射，后注册的提取器覆盖相同扩展名的旧提取器"""
+
+    def __init__(self):
+        self._by_name = {}
+        self._by_extension = {}
+
+    def register(self, extractor):
+        """注册提取器并返回它，同名的旧提取器被替换"""
+        self.unregister(extractor.name)
+        self._by_name[extractor.name] = extractor
+        for ext in extractor.extensions:
+            self._by_extension[ext] = extractor
+        return extractor
+
+    def unregister(self, name):
+        """移除指定名称的提取器，不存在时忽略"""
+        previous = self._by_name.pop(name, None)
+        if previous is not None:
+            for ext in previous.extensions:
+                if self._by_extension.get(ext) is previous:
+                    del self._by_extension[ext]
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    def __contains__(self, ext):
+        return ext.lower() in self._by_extension
+
+    def get(self, name):
+        """按名称查找，不存在时返回 None"""
+        return self._by_name.get(name)
+
+    def for_extension(self, ext):
+        """按扩展名查找（不区分大小写），不支持时返回 None"""
+        return self._by_extension.get(ext.lower())
+
+    def for_head(self, head):
+        """
+        按文件头查找
+
+        Returns:
+            唯一符合文件头特征的提取器；没有或有多个（如 DOCX 和 XLSX 都是 ZIP）时返回 None
+        """
+        found = [extractor for extractor in self if extractor.accepts_head(head)]
+        return found[0] if len(found) == 1 else None
+
+    def extensions(self, **capabilities):
+        """
+        具有指定能力的扩展名列表
+
+        例如 extensions(needs_process=True) 返回需要在子进程中提取的格式的扩展名。
+        """
+        return [ext for ext, extractor in self._by_extension.items()
+                if all(getattr(extractor, name) == value
+                       for name, value in capabilities.items())]
+
+    def cost(self, ext):
+        """扩展名对应格式的典型开销，不支持的格式为 0"""
+        extractor = self.for_extension(ext)
+        return extractor.cost if extractor is not None else 0
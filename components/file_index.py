@@ -0,0 +1,381 @@
+"""
+文件名索引模块
+为每个搜索根目录建立一个 SQLite 文件名索引（路径、名称、主体、扩展名、大小、修改时间），
+文件名模式的搜索可以直接查询索引，无需重新遍历磁盘
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+from operator import attrgetter
+
+from .settings import get_data_dir
+from .traversal import FileEntry, DirListing, TraversalStats, scan_directory
+from .search_logic import filename_stem
+
+
+# 索引结构版本，结构变化时旧索引需要重建
+INDEX_SCHEMA_VERSION = 3
+
+# 超过该时间（秒）未刷新的索引视为过期
+STALE_AFTER = 24 * 3600
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    CREATE TABLE IF NOT EXISTS dirs (
+        id INTEGER PRIMARY KEY,
+        parent_id INTEGER,
+        path TEXT NOT NULL UNIQUE,
+        mtime_ns INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS files (
+        dir_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        stem TEXT NOT NULL,
+        ext TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        mtime REAL NOT NULL,
+        PRIMARY KEY (dir_id, name)
+    );
+    CREATE INDEX IF NOT EXISTS files_stem ON files (stem);
+"""
+
+
+class RefreshStats(TraversalStats):
+    """索引刷新统计：在遍历统计之外记录重新枚举、跳过和删除的目录数及耗时"""
+
+    def __init__(self):
+        super().__init__()
+        self.dirs_rescanned = 0
+        self.dirs_skipped = 0
+        self.dirs_pruned = 0
+        self.elapsed = 0.0
+
+    def as_dict(self):
+        """以字典形式返回统计数据"""
+        data = super().as_dict()
+        data.update({
+            'dirs_rescanned': self.dirs_rescanned,
+            'dirs_skipped': self.dirs_skipped,
+            'dirs_pruned': self.dirs_pruned,
+            'elapsed': round(self.elapsed, 3),
+        })
+        return data
+
+
+def index_path_for(root):
+    """返回根目录对应的索引数据库路径"""
+    key = os.path.normcase(os.path.abspath(root))
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    index_dir = get_data_dir() / 'index'
+    index_dir.mkdir(parents=True, exist_ok=True)
+    return index_dir / f"{digest}.sqlite3"
+
+
+class FileIndex:
+    """
+    单个根目录的文件名索引
+
+    每个线程应使用自己的 FileIndex 实例（SQLite 连接不跨线程共享）。
+    数据库使用 WAL 模式，刷新索引时其它线程仍可读取。
+    """
+
+    # 修改时间距当前不足该秒数的目录视为“可能仍在变化”，下次刷新时重新枚举
+    RACY_WINDOW = 2.0
+
+    def __init__(self, root, db_path=None):
+        self.root = os.path.abspath(root)
+        self.db_path = str(db_path) if db_path else str(index_path_for(self.root))
+        self._conn = None
+
+    def _connect(self):
+        """打开数据库连接并确保表结构存在"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self):
+        """关闭数据库连接"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ---- 元数据 ----
+
+    def _get_meta(self, key):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def exists(self):
+        """索引是否已建立且结构版本一致"""
+        if not os.path.exists(self.db_path):
+            return False
+        try:
+            return (self._get_meta('schema_version') == str(INDEX_SCHEMA_VERSION)
+                    and self._get_meta('updated_at') is not None)
+        except sqlite3.Error:
+            return False
+
+    def updated_at(self):
+        """最近一次建立或刷新索引的时间戳，未建立时返回 None"""
+        if not self.exists():
+            return None
+        return float(self._get_meta('updated_at'))
+
+    def file_count(self):
+        """索引中的文件数"""
+        if not self.exists():
+            return 0
+        return self._connect().execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def is_stale(self, max_age=STALE_AFTER):
+        """索引是否不存在或超过 max_age 秒未刷新"""
+        updated = self.updated_at()
+        return updated is None or time.time() - updated > max_age
+
+    # ---- 建立和刷新 ----
+
+    def rebuild(self, cancel=None):
+        """
+        清空并重新建立索引
+
+        Returns:
+            RefreshStats；被取消时索引保持原状
+        """
+        if self._get_meta('schema_version') not in (None, str(INDEX_SCHEMA_VERSION)):
+            # 旧结构的索引无法沿用，直接重建表
+            self._reset_schema()
+
+        conn = self._connect()
+        stats = RefreshStats()
+        start = time.perf_counter()
+        with conn:
+            conn.execute("DELETE FROM files")
+            conn.execute("DELETE FROM dirs")
+            if not self._sync(stats, cancel):
+                conn.rollback()
+            else:
+                self._mark_updated()
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def refresh(self, cancel=None):
+        """
+        增量刷新索引
+
+        每个目录先 stat 一次：修改时间与索引记录一致的目录直接沿用记录（包括其子目录列表），
+        只有修改时间变化的目录才重新枚举；不再存在的目录连同其子树一起删除。
+        目录的修改时间只随条目的增删和重命名变化，文件内容的修改需要“建立索引”才能反映。
+
+        Returns:
+            RefreshStats；被取消时索引保持原状
+        """
+        if not self.exists():
+            return self.rebuild(cancel=cancel)
+
+        conn = self._connect()
+        stats = RefreshStats()
+        start = time.perf_counter()
+        with conn:
+            if not self._sync(stats, cancel):
+                conn.rollback()
+            else:
+                self._mark_updated()
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def _reset_schema(self):
+        """删除并重新创建全部表"""
+        conn = self._connect()
+        conn.execute("DROP TABLE IF EXISTS files")
+        conn.execute("DROP TABLE IF EXISTS dirs")
+        conn.execute("DELETE FROM meta")
+        conn.commit()
+        conn.executescript(_SCHEMA)
+
+    def _sync(self, stats, cancel=None):
+        """
+        自顶向下同步索引与磁盘（调用方负责事务）
+
+        Returns:
+            完整遍历返回 True，被取消返回 False
+        """
+        conn = self._connect()
+        known = {}
+        children = {}
+        for dir_id, parent_id, path, mtime_ns in conn.execute(
+                "SELECT id, parent_id, path, mtime_ns FROM dirs ORDER BY path"):
+            known[path] = (dir_id, mtime_ns)
+            children.setdefault(parent_id, []).append(path)
+
+        seen = set()
+        stack = [(self.root, None)]
+        while stack:
+            if cancel is not None and cancel():
+                return False
+            path, parent_id = stack.pop()
+            try:
+                st = os.stat(path)
+                stats.syscalls += 1
+            except OSError as e:
+                stats.errors += 1
+                print(f"访问文件夹出错: {path} - {str(e)}")
+                continue
+
+            record = known.get(path)
+            if record is not None and record[1] == st.st_mtime_ns:
+                # 目录未变化：沿用索引中的文件和子目录
+                stats.dirs_skipped += 1
+                seen.add(record[0])
+                stack.extend((child, record[0]) for child in reversed(children.get(record[0], [])))
+                continue
+
+            listing = scan_directory(path, stats)
+            if listing is None:
+                continue
+            stats.dirs_rescanned += 1
+            listing.dirs.sort(key=attrgetter('name'))
+
+            # 修改时间离现在太近时，同一时间刻度内可能还有未观察到的变化，下次强制重新枚举
+            mtime_ns = st.st_mtime_ns
+            if time.time() - st.st_mtime < self.RACY_WINDOW:
+                mtime_ns = -1
+            if record is None:
+                dir_id = conn.execute(
+                    "INSERT INTO dirs (parent_id, path, mtime_ns) VALUES (?, ?, ?)",
+                    (parent_id, path, mtime_ns)).lastrowid
+                self._insert_files(dir_id, listing.files)
+            else:
+                dir_id = record[0]
+                conn.execute(
+                    "UPDATE dirs SET parent_id = ?, mtime_ns = ? WHERE id = ?",
+                    (parent_id, mtime_ns, dir_id))
+                self._replace_dir_files(dir_id, listing.files)
+            seen.add(dir_id)
+            stack.extend((entry.path, dir_id) for entry in reversed(listing.dirs))
+
+        stats.dirs_pruned = self._prune_dirs(seen)
+        return True
+
+    def _insert_files(self, dir_id, entries):
+        """写入一个目录下的文件"""
+        self._connect().executemany(
+            "INSERT OR REPLACE INTO files (dir_id, name, stem, ext, size, mtime) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(dir_id, e.name, filename_stem(e.name).lower(), e.suffix, e.size, e.mtime)
+             for e in entries]
+        )
+
+    def _replace_dir_files(self, dir_id, entries):
+        """用最新的枚举结果替换一个目录下的文件记录"""
+        conn = self._connect()
+        names = {e.name for e in entries}
+        stale = [(dir_id, name) for (name,) in
+                 conn.execute("SELECT name FROM files WHERE dir_id = ?", (dir_id,))
+                 if name not in names]
+        if stale:
+            conn.executemany("DELETE FROM files WHERE dir_id = ? AND name = ?", stale)
+        self._insert_files(dir_id, entries)
+
+    def _prune_dirs(self, keep_ids):
+        """删除本次同步中未再出现的目录（已删除的子树）及其文件，返回删除的目录数"""
+        conn = self._connect()
+        gone = [(dir_id,) for (dir_id,) in conn.execute("SELECT id FROM dirs")
+                if dir_id not in keep_ids]
+        if gone:
+            conn.executemany("DELETE FROM files WHERE dir_id = ?", gone)
+            conn.executemany("DELETE FROM dirs WHERE id = ?", gone)
+        return len(gone)
+
+    def _mark_updated(self):
+        self._set_meta('schema_version', INDEX_SCHEMA_VERSION)
+        self._set_meta('root', self.root)
+        self._set_meta('updated_at', time.time())
+
+    # ---- 查询 ----
+
+    def iter_listings(self, recursive=True, size_range=None, extensions=None, stems=None):
+        """
+        按目录产出索引中的文件，顺序与目录路径和文件名排序一致
+
+        Args:
+            recursive: False 时只返回根目录下的文件
+            size_range: 可选的 (最小, 最大) 文件大小过滤
+            extensions: 可选的小写扩展名列表过滤
+            stems: 可选的小写文件名主体列表，只返回主体在其中的文件（走 stem 索引）
+
+        Yields:
+            DirListing（dirs 为空列表）
+        """
+        conn = self._connect()
+        sql = ("SELECT d.path, f.name, f.size, f.mtime FROM files f "
+               "JOIN dirs d ON d.id = f.dir_id")
+        where = []
+        params = []
+        if stems is not None:
+            # 关键词可能很多，放入临时表再连接，避免超出 SQL 参数个数上限
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted_stems (stem TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM wanted_stems")
+            conn.executemany("INSERT OR IGNORE INTO wanted_stems (stem) VALUES (?)",
+                             [(stem,) for stem in stems])
+            where.append("f.stem IN (SELECT stem FROM wanted_stems)")
+        if not recursive:
+            where.append("d.path = ?")
+            params.append(self.root)
+        if size_range is not None:
+            low, high = size_range
+            where.append("f.size >= ?")
+            params.append(low)
+            if high != float('inf'):
+                where.append("f.size <= ?")
+                params.append(high)
+        if extensions:
+            where.append(f"f.ext IN ({','.join('?' * len(extensions))})")
+            params.extend(extensions)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY d.path, f.name"
+
+        current_dir = None
+        files = []
+        for dir_path, name, size, mtime in conn.execute(sql, params):
+            if dir_path != current_dir:
+                if files:
+                    yield DirListing(current_dir, files, [])
+                current_dir = dir_path
+                files = []
+            files.append(FileEntry(os.path.join(dir_path, name), name, size, mtime))
+        if files:
+            yield DirListing(current_dir, files, [])
+
+
+def describe_age(timestamp, now=None):
+    """把时间戳格式化为“x 分钟前”一类的描述"""
+    if timestamp is None:
+        return "未建立"
+    seconds = max(0, (now or time.time()) - timestamp)
+    if seconds < 60:
+        return "刚刚"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} 分钟前"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} 小时前"
+    return f"{int(seconds // 86400)} 天前"
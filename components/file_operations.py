@@ -31,14 +31,14 @@ def copy_files_without_conflicts(parent, files_to_copy):
     if not files_to_copy:
         return
 
-    parent.progress_bar.setVisible(True)
-    parent.progress_bar.setValue(0)
-    parent.status_label.setText("正在复制文件...")
+    progress = parent.progress_reporter
+    progress.start("正在复制文件...", total=len(files_to_copy),
+                   status_format="正在复制文件... {files}/{total}（{bytes}）")
     QApplication.processEvents()
 
     error_files = []
 
-    for i, file_info in enumerate(files_to_copy):
+    for file_info in files_to_copy:
         src = Path(file_info['path'])
         dst = Path(parent.target_folder) / file_info['name']
 
@@ -48,12 +48,10 @@ def copy_files_without_conflicts(parent, files_to_copy):
         except Exception as e:
             error_files.append(f"{src} ({str(e)})")
 
-        progress = int((i + 1) / len(files_to_copy) * 100)
-        parent.progress_bar.setValue(progress)
-        if i % 10 == 0:
-            QApplication.processEvents()
+        progress.add_file(file_info['size'])
+        progress.pump()
 
-    parent.progress_bar.setVisible(False)
+    progress.finish()
 
     if error_files:
         error_msg = "以下文件复制失败：\n\n" + "\n".join(error_files[:10])
@@ -68,14 +66,14 @@ def copy_files_without_conflicts(parent, files_to_copy):
 
 def copy_selected_files(parent, files_to_copy):
     """复制指定的文件（处理冲突后）"""
-    parent.progress_bar.setVisible(True)
-    parent.progress_bar.setValue(0)
-    parent.status_label.setText("正在复制文件...")
+    progress = parent.progress_reporter
+    progress.start("正在复制文件...", total=len(files_to_copy),
+                   status_format="正在复制文件... {files}/{total}（{bytes}）")
     QApplication.processEvents()
 
     error_files = []
 
-    for i, file_info in enumerate(files_to_copy):
+    for file_info in files_to_copy:
         src = Path(file_info['path'])
         dst = Path(parent.target_folder) / file_info['new_name']
 
@@ -85,12 +83,10 @@ def copy_selected_files(parent, files_to_copy):
         except Exception as e:
             error_files.append(f"{src} ({str(e)})")
 
-        progress = int((i + 1) / len(files_to_copy) * 100)
-        parent.progress_bar.setValue(progress)
-        if i % 10 == 0:
-            QApplication.processEvents()
+        progress.add_file(file_info['size'])
+        progress.pump()
 
-    parent.progress_bar.setVisible(False)
+    progress.finish()
 
     if error_files:
         error_msg = "以下文件复制失败：\n\n" + "\n".join(error_files[:10])
@@ -104,25 +100,32 @@ def copy_selected_files(parent, files_to_copy):
 
 
 def delete_files_batch(parent, files_to_delete):
-    """批量删除文件"""
+    """
+    批量删除文件
+
+    Returns:
+        (已不在磁盘上的路径列表, 错误信息列表)；删除前就已不存在的文件同时记入两者，
+        调用方据此移除结果，无需再逐个检查文件是否存在
+    """
     if not files_to_delete:
-        return 0, []
+        return [], []
 
-    parent.progress_bar.setVisible(True)
-    parent.progress_bar.setValue(0)
-    parent.status_label.setText("正在删除文件...")
+    progress = parent.progress_reporter
+    progress.start("正在删除文件...", total=len(files_to_delete),
+                   status_format="正在删除文件... {files}/{total}")
     QApplication.processEvents()
 
-    success_count = 0
+    removed = []
     error_files = []
-    total_files = len(files_to_delete)
-    update_interval = max(1, total_files // 50)
 
-    for i, file_path in enumerate(files_to_delete):
-        file_path = Path(file_path)
+    for path in files_to_delete:
+        progress.add_file()
+        progress.pump()
+        file_path = Path(path)
         try:
             if not file_path.exists():
                 error_files.append(f"{file_path} (文件不存在)")
+                removed.append(path)
                 continue
 
             # 如果是目录，使用 rmtree 删除；否则使用 unlink 删除
@@ -132,18 +135,13 @@ def delete_files_batch(parent, files_to_delete):
                 file_path.unlink()
             
             parent.add_log(f"删除文件: {file_path}", file_path)
-            success_count += 1
+            removed.append(path)
 
         except Exception as e:
             error_files.append(f"{file_path} ({str(e)})")
 
-        if i % update_interval == 0 or i == total_files - 1:
-            progress = int((i + 1) / total_files * 100)
-            parent.progress_bar.setValue(progress)
-            QApplication.processEvents()
-
-    parent.progress_bar.setVisible(False)
-    return success_count, error_files
+    progress.finish()
+    return removed, error_files
 
 
 def copy_folders_without_conflicts(parent, folders_to_copy):
@@ -151,14 +149,14 @@ def copy_folders_without_conflicts(parent, folders_to_copy):
     if not folders_to_copy:
         return
 
-    parent.progress_bar.setVisible(True)
-    parent.progress_bar.setValue(0)
-    parent.status_label.setText("正在复制文件夹...")
+    progress = parent.progress_reporter
+    progress.start("正在复制文件夹...", total=len(folders_to_copy),
+                   status_format="正在复制文件夹... {files}/{total}")
     QApplication.processEvents()
 
     error_folders = []
 
-    for i, folder_info in enumerate(folders_to_copy):
+    for folder_info in folders_to_copy:
         src = Path(folder_info['path'])
         dst = Path(parent.target_folder) / folder_info['name']
 
@@ -176,12 +174,10 @@ def copy_folders_without_conflicts(parent, folders_to_copy):
         except Exception as e:
             error_folders.append(f"{src} ({str(e)})")
 
-        progress = int((i + 1) / len(folders_to_copy) * 100)
-        parent.progress_bar.setValue(progress)
-        if i % 10 == 0:
-            QApplication.processEvents()
+        progress.add_file()
+        progress.pump()
 
-    parent.progress_bar.setVisible(False)
+    progress.finish()
 
     if error_folders:
         error_msg = "以下文件夹复制失败：\n\n" + "\n".join(error_folders[:10])
@@ -0,0 +1,69 @@
+"""
+文件内容嗅探
+读取文件开头的一小段字节，按文件头特征和控制字符比例判断文件是文本还是二进制，
+内容搜索据此决定交给文本扫描器还是直接跳过，避免读取和解码二进制文件
+"""
+
+# 嗅探时读取的字节数
+SNIFF_BYTES = 4096
+
+KIND_TEXT = 'text'
+KIND_BINARY = 'binary'
+
+UTF8_BOM = b'\xef\xbb\xbf'
+
+# 常见二进制格式的文件头（图片、压缩包、Office 旧格式、可执行文件、数据库、音视频等）
+BINARY_SIGNATURES = (
+    b'%PDF-', b'PK\x03\x04', b'PK\x05\x06', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',
+    b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff', b'GIF87a', b'GIF89a', b'II*\x00', b'MM\x00*',
+    b'\x1f\x8b', b'7z\xbc\xaf\x27\x1c', b'Rar!\x1a\x07', b'BZh', b'\xfd7zXZ\x00',
+    b'\x7fELF', b'\xca\xfe\xba\xbe', b'\xcf\xfa\xed\xfe', b'SQLite format 3\x00',
+    b'ID3', b'fLaC', b'OggS', b'RIFF', b'\x1aE\xdf\xa3',
+    # UTF-16/32 文本：字节级扫描只支持 UTF-8 和 GBK，按二进制跳过
+    b'\xff\xfe', b'\xfe\xff',
+)
+
+# 含不可打印字节的文件头，文本文件不会以此开头。%PDF-、ID3、RIFF 等全为可打印字符的文件头
+# 可能就是文本的第一行，已知为文本的扩展名只按这些文件头和控制字符比例判断
+UNPRINTABLE_SIGNATURES = tuple(
+    sig for sig in BINARY_SIGNATURES if any(b < 0x20 or b >= 0x7f for b in sig))
+
+# 文本中常见的控制字符：退格、制表、换行、换页、回车和 ESC（日志中的颜色代码）
+_TEXT_CONTROLS = {0x08, 0x09, 0x0a, 0x0c, 0x0d, 0x1b}
+_BINARY_CONTROLS = bytes(b for b in range(0x20) if b not in _TEXT_CONTROLS) + b'\x7f'
+
+# 其他控制字符超过该比例时视为二进制
+MAX_CONTROL_RATIO = 0.1
+
+
+def sniff_bytes(head, known_text=False):
+    """
+    根据文件开头的字节判断内容类别
+
+    Args:
+        head: 文件开头的字节（通常为前 SNIFF_BYTES 个字节）
+        known_text: 文件扩展名已注册为文本格式时为 True，只匹配 UNPRINTABLE_SIGNATURES
+
+    Returns:
+        KIND_TEXT 或 KIND_BINARY；空文件视为文本
+    """
+    if not head or head.startswith(UTF8_BOM):
+        return KIND_TEXT
+    signatures = UNPRINTABLE_SIGNATURES if known_text else BINARY_SIGNATURES
+    if head.startswith(signatures) or b'\x00' in head:
+        return KIND_BINARY
+    controls = len(head) - len(head.translate(None, _BINARY_CONTROLS))
+    if controls > len(head) * MAX_CONTROL_RATIO:
+        return KIND_BINARY
+    return KIND_TEXT
+
+
+def read_head(file_path):
+    """读取文件前 SNIFF_BYTES 个字节"""
+    with open(file_path, 'rb') as f:
+        return f.read(SNIFF_BYTES)
+
+
+def sniff_file(file_path):
+    """读取文件前 SNIFF_BYTES 个字节并判断内容类别"""
+    return sniff_bytes(read_head(file_path))
@@ -12,9 +12,21 @@ from .folder_manager import (
     update_folder_list,
 )
 
+from .index_manager import (
+    rebuild_index,
+    refresh_index,
+    update_index_status,
+    _on_index_progress,
+    _on_index_finished,
+)
+
 from .search_manager import (
     get_search_mode,
     on_gather_mode_changed,
+    load_scan_depth,
+    on_scan_depth_changed,
+    load_all_text_option,
+    on_all_text_toggled,
 )
 
 from .search_operations import (
@@ -23,10 +35,15 @@ from .search_operations import (
     search_folders_by_name,
     _start_folder_search,
     _start_folder_exact_search,
+    _on_search_files_found,
+    _on_search_path_changed,
+    _on_search_finished,
+    is_search_running,
 )
 
 from .results_manager import (
     _display_search_results,
+    _update_keyword_summary,
     _update_unfound_keywords_display,
     _update_single_result_keywords_display,
     _create_keyword_view_buttons,
@@ -62,17 +79,32 @@ __all__ = [
     'remove_selected_folders',
     'clear_search_folders',
     'update_folder_list',
+    # Index Manager
+    'rebuild_index',
+    'refresh_index',
+    'update_index_status',
+    '_on_index_progress',
+    '_on_index_finished',
     # Search Manager
     'get_search_mode',
     'on_gather_mode_changed',
+    'load_scan_depth',
+    'on_scan_depth_changed',
+    'load_all_text_option',
+    'on_all_text_toggled',
     # Search Operations
     'start_search',
     'start_exact_search',
     'search_folders_by_name',
     '_start_folder_search',
     '_start_folder_exact_search',
+    '_on_search_files_found',
+    '_on_search_path_changed',
+    '_on_search_finished',
+    'is_search_running',
     # Results Manager
     '_display_search_results',
+    '_update_keyword_summary',
     '_update_unfound_keywords_display',
     '_update_single_result_keywords_display',
     '_create_keyword_view_buttons',
@@ -53,8 +53,8 @@ def copy_files(self):
         # 文件夹模式下，直接使用添加后缀的方式处理
         copy_folders_without_conflicts(self, self.search_results)
     else:
-        # 文件模式下，显示冲突对话框
-        conflict_dialog = FileConflictDialog(self, self.search_results, self.target_folder)
+        # 文件模式下，显示冲突对话框；对话框在记录上写入处理方式，需要固定的记录列表
+        conflict_dialog = FileConflictDialog(self, list(self.search_results), self.target_folder)
         if conflict_dialog.exec() == QDialog.DialogCode.Accepted:
             files_to_copy = conflict_dialog.get_selected_files()
             copy_selected_files(self, files_to_copy)
@@ -85,8 +85,10 @@ def delete_files(self):
                                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
 
     if reply == QMessageBox.StandardButton.Yes:
-        files_to_delete = [f['path'] for f in self.search_results]
-        success_count, error_files = delete_files_batch(self, files_to_delete)
+        results = self.search_results
+        total = len(results)
+        files_to_delete = [results.path(row) for row in range(total)]
+        removed, error_files = delete_files_batch(self, files_to_delete)
 
         if error_files:
             error_msg = "以下文件删除失败：\n\n" + "\n".join(error_files[:10])
@@ -95,24 +97,13 @@ def delete_files(self):
             QMessageBox.warning(self, "删除错误",
                                f"{error_msg}\n\n请手动删除这些文件。")
 
-        self.status_label.setText(f"已删除 {success_count}/{len(self.search_results)} 个文件")
+        self.status_label.setText(f"已删除 {total - len(error_files)}/{total} 个文件")
         
-        # 更新结果树
-        from PyQt6.QtCore import Qt
-        
-        remaining_files = []
-        for file_info in self.search_results:
-            if Path(file_info['path']).exists():
-                remaining_files.append(file_info)
-            else:
-                # 从树中移除
-                for index in range(self.results_tree.topLevelItemCount()):
-                    item = self.results_tree.topLevelItem(index)
-                    if item.data(0, Qt.ItemDataRole.UserRole) == file_info['path']:
-                        self.results_tree.takeTopLevelItem(index)
-                        break
-        
-        self.search_results = remaining_files
+        # 更新结果列表：按路径索引找到已不存在的文件所在行，一次性移除
+        rows = (results.row_of(path) for path in removed)
+        self.results_model.remove_rows([row for row in rows if row is not None])
+        # 行号已重新编号，关键词统计、查看按钮和未找到列表按剩余结果重建
+        self._update_keyword_summary()
         self.delete_button.setEnabled(bool(self.search_results))
 
 
@@ -69,3 +69,4 @@ def update_folder_list(self):
     self.folder_list.clear()
     for folder in self.search_folders:
         self.folder_list.addItem(folder)
+    self.update_index_status()
@@ -0,0 +1,103 @@
+"""
+Index Manager - Handles the persistent filename index
+Contains methods for building, refreshing and showing the state of per-folder indexes
+"""
+
+from PyQt6.QtWidgets import QMessageBox
+
+from ..file_index import FileIndex, describe_age
+from ..workers import IndexWorker, start_worker_thread
+
+
+def rebuild_index(self):
+    """为搜索文件夹重新建立文件名索引"""
+    _start_index_worker(self, rebuild=True)
+
+
+def refresh_index(self):
+    """刷新搜索文件夹的文件名索引"""
+    _start_index_worker(self, rebuild=False)
+
+
+def _start_index_worker(self, rebuild):
+    """在后台线程中建立或刷新索引"""
+    if self.index_thread is not None:
+        return
+
+    if not self.search_folders:
+        QMessageBox.warning(self, "错误", "请添加至少一个搜索文件夹或盘符！")
+        return
+
+    action = "建立" if rebuild else "刷新"
+    self.add_log(f"开始{action}文件名索引: {', '.join(self.search_folders)}")
+    self.build_index_button.setEnabled(False)
+    self.refresh_index_button.setEnabled(False)
+    self.index_status_label.setText(f"索引: 正在{action}...")
+
+    worker = IndexWorker(self.search_folders, rebuild=rebuild)
+    self.index_worker = worker
+    worker.progress.connect(self._on_index_progress)
+    worker.finished.connect(self._on_index_finished)
+    self.index_thread = start_worker_thread(worker)
+
+
+def _on_index_progress(self, root):
+    """显示正在处理的根目录"""
+    self.index_status_label.setText(f"索引: 正在处理 {root}")
+
+
+def _on_index_finished(self, results):
+    """索引线程结束后记录统计并更新状态"""
+    if self.index_thread is not None:
+        self.index_thread.quit()
+        self.index_thread.wait()
+    self.index_thread = None
+    self.index_worker = None
+
+    for root, stats in results.items():
+        self.add_log(f"索引已更新: 重新枚举 {stats.dirs_rescanned} 个目录, "
+                     f"跳过未变化目录 {stats.dirs_skipped} 个, 删除 {stats.dirs_pruned} 个, "
+                     f"耗时 {stats.elapsed:.2f} 秒", root)
+
+    self.build_index_button.setEnabled(True)
+    self.refresh_index_button.setEnabled(True)
+    self.update_index_status()
+
+
+def update_index_status(self):
+    """根据搜索文件夹的索引情况更新状态标签，过期时以橙色提示"""
+    if not self.search_folders:
+        self.index_status_label.setText("索引: 未添加文件夹")
+        self.index_status_label.setStyleSheet("color: #7f8c8d; font-size: 8pt;")
+        return
+
+    indexed = 0
+    stale = 0
+    oldest = None
+    for folder in self.search_folders:
+        try:
+            with FileIndex(folder) as index:
+                updated = index.updated_at()
+                if updated is None:
+                    continue
+                indexed += 1
+                if index.is_stale():
+                    stale += 1
+                oldest = updated if oldest is None else min(oldest, updated)
+        except Exception as e:
+            print(f"读取索引状态失败: {folder} - {str(e)}")
+
+    total = len(self.search_folders)
+    if indexed == 0:
+        text = "索引: 未建立"
+    else:
+        text = f"索引: {indexed}/{total} 个文件夹已建立，最早更新于{describe_age(oldest)}"
+    if stale:
+        text += "（已过期，建议刷新）"
+        color = "#e67e22"
+    elif indexed == total:
+        color = "#27ae60"
+    else:
+        color = "#7f8c8d"
+    self.index_status_label.setText(text)
+    self.index_status_label.setStyleSheet(f"color: {color}; font-size: 8pt;")
@@ -6,7 +6,6 @@ Includes keyword view buttons, result display, and UI updates
 import datetime
 from pathlib import Path
 
-from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QTreeWidgetItem, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget, QWidget, QApplication
 )
@@ -14,38 +13,37 @@ from PyQt6.QtWidgets import (
 from ..utils import format_size
 
 
-def _display_search_results(self, all_found_files, keyword_results):
-    """显示搜索结果"""
-    self.search_results = list(all_found_files.values())
-    self.results_tree.clear()
-    
-    # 建立文件路径到关键词的映射
-    file_to_keywords = {}
-    for keyword, files in keyword_results.items():
-        for file_info in files:
-            file_path = str(file_info['path'])
-            if file_path not in file_to_keywords:
-                file_to_keywords[file_path] = []
-            file_to_keywords[file_path].append(keyword)
+def _display_search_results(self, results):
+    """显示搜索结果（ResultStore）"""
+    self.search_results = results
+
+    # 显示结果，第5列为匹配的关键词；显示文字由模型在绘制时生成。
+    # 搜索过程中已逐批显示全部结果时保留，不重置视图（保持滚动位置和选中项）
+    if not self.results_model.holds(results):
+        self.results_model.set_results(results)
+
+    self._update_keyword_summary()
+
+    self.found_files_count = len(self.search_results)
+    self.status_count_label.setText(f"已找到: {self.found_files_count} 个文件")
     
-    # 显示结果，并在第5列显示匹配的关键词
-    for file_info in self.search_results:
-        file_path = str(file_info['path'])
-        matched_keywords = file_to_keywords.get(file_path, [])
-        keywords_str = ", ".join(matched_keywords) if matched_keywords else "-"
-        
-        item = QTreeWidgetItem([
-            file_info['name'],
-            str(Path(file_info['path']).parent),
-            format_size(file_info['size']),
-            file_info['mod_date'],
-            keywords_str
-        ])
-        item.setData(0, Qt.ItemDataRole.UserRole, file_info['path'])
-        item.setToolTip(0, file_info['name'])
-        item.setToolTip(1, str(Path(file_info['path']).parent))
-        item.setToolTip(4, f"匹配关键词: {keywords_str}")
-        self.results_tree.addTopLevelItem(item)
+    if self.cancel_search:
+        self.status_label.setText(f"搜索已取消，已找到 {self.found_files_count} 个文件")
+        self.add_log("搜索已取消")
+    else:
+        self.status_label.setText(f"搜索完成，找到 {self.found_files_count} 个文件")
+        self.add_log(f"搜索完成，找到 {self.found_files_count} 个文件")
+
+    self.copy_button.setEnabled(bool(self.search_results))
+    self.search_button.setEnabled(True)
+    self.exact_search_button.setEnabled(True)
+    self.cancel_button.setEnabled(False)
+
+
+def _update_keyword_summary(self):
+    """按当前结果重建关键词统计、未找到关键词列表和查看按钮（搜索完成或删除文件后调用）"""
+    # 结果行号变化后旧的命中序列不再有效，每次都从存储重新取
+    keyword_results = self.search_results.keyword_results()
 
     # 存储keyword_results以供查看按钮使用
     self.keyword_results = keyword_results
@@ -83,23 +81,8 @@ def _display_search_results(self, all_found_files, keyword_results):
     if multi_result_keywords_info:
         tooltip_text = "点击下方按钮查看具体结果: " + ", ".join([f"{kw}({count})" for kw, count in multi_result_keywords_info])
         self.keywords_info_label.setToolTip(tooltip_text)
-
-    self.found_files_count = len(self.search_results)
-    self.status_count_label.setText(f"已找到: {self.found_files_count} 个文件")
-    
-    self.progress_bar.setVisible(False)
-    self.current_path_label.setText("当前搜索路径: ")
-
-    if self.cancel_search:
-        self.status_label.setText(f"搜索已取消，已找到 {self.found_files_count} 个文件")
-        self.add_log("搜索已取消")
     else:
-        self.status_label.setText(f"搜索完成，找到 {self.found_files_count} 个文件")
-        self.add_log(f"搜索完成，找到 {self.found_files_count} 个文件")
-
-    self.copy_button.setEnabled(bool(self.search_results))
-    self.search_button.setEnabled(True)
-    self.cancel_button.setEnabled(False)
+        self.keywords_info_label.setToolTip("")
     
     # 创建多结果关键词的查看按钮
     self._create_keyword_view_buttons(multi_result_keywords_info)
@@ -129,6 +112,24 @@ def _update_unfound_keywords_display(self, unfound_keywords):
         self.unfound_keywords_container.setVisible(False)
 
 
+def _update_single_result_keywords_display(self, single_result_keywords):
+    """更新只找到一个结果的关键词显示区域 - 使用树形控件"""
+    self.single_result_keywords_tree.clear()
+
+    if single_result_keywords:
+        root_item = QTreeWidgetItem([f"只找到一个结果的关键词 ({len(single_result_keywords)}项)"])
+        root_item.setExpanded(True)
+        self.single_result_keywords_tree.addTopLevelItem(root_item)
+
+        for keyword in single_result_keywords:
+            child_item = QTreeWidgetItem([keyword])
+            root_item.addChild(child_item)
+
+        self.single_result_keywords_container.setVisible(True)
+    else:
+        self.single_result_keywords_container.setVisible(False)
+
+
 def _create_keyword_view_buttons(self, multi_result_keywords_info):
     """为多结果关键词创建查看按钮"""
     # 清空现有按钮
@@ -227,12 +228,12 @@ def show_context_menu(self, position):
     menu.exec_(self.results_tree.viewport().mapToGlobal(position))
 
 
-def show_file_info(self, item, column):
+def show_file_info(self, index):
     """显示文件详细信息"""
     import os
     from PyQt6.QtWidgets import QMessageBox
     
-    file_path = item.data(0, Qt.ItemDataRole.UserRole)
+    file_path = self.results_model.path_at(index.row())
     if not file_path:
         return
 
@@ -286,7 +287,6 @@ def show_file_info(self, item, column):
         <pre>{content_preview}</pre>
         """
     except Exception as e:
-        from PyQt6.QtWidgets import QMessageBox
         QMessageBox.warning(self, "错误", f"无法获取文件信息: {str(e)}")
 
 def toggle_unfound_list(self):
@@ -2,6 +2,8 @@
 Search Manager - Handles search mode configuration and cancellation
 """
 
+from ..settings import get_setting, set_setting
+
 
 def get_search_mode(self):
     """获取当前搜索模式"""
@@ -30,6 +32,31 @@ def on_gather_mode_changed(self):
         self.filetype_label.setVisible(True)
 
 
+def load_scan_depth(self):
+    """按设置选中内容扫描深度，设置值不在预设选项中时追加一项"""
+    scan_kb = get_setting('content_scan_kb')
+    index = self.scan_depth_combo.findData(scan_kb)
+    if index < 0:
+        self.scan_depth_combo.addItem(f"前 {scan_kb} KB", scan_kb)
+        index = self.scan_depth_combo.count() - 1
+    self.scan_depth_combo.setCurrentIndex(index)
+
+
+def on_scan_depth_changed(self):
+    """保存选择的内容扫描深度"""
+    set_setting('content_scan_kb', self.scan_depth_combo.currentData())
+
+
+def load_all_text_option(self):
+    """按设置勾选“所有文本类文件”"""
+    self.all_text_check.setChecked(bool(get_setting('content_all_text')))
+
+
+def on_all_text_toggled(self, checked):
+    """保存“所有文本类文件”选项"""
+    set_setting('content_all_text', bool(checked))
+
+
 def cancel_search_action(self):
     """取消搜索"""
     self.cancel_search = True
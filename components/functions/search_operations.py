@@ -3,19 +3,24 @@ Search Operations - Handles all search-related operations
 Contains methods for folder search, exact search, and main search functionality
 """
 
-import os
 import datetime
 import re
 from pathlib import Path
 
 from PyQt6.QtWidgets import QMessageBox, QInputDialog, QApplication
 
-from ..search_logic import matches_keyword, search_content, exact_match_filename
-from ..utils import get_file_info_dict
+from ..search_logic import matches_keyword, CompiledQuery, ExactQuery
+from ..workers import SearchWorker, start_worker_thread
+from ..result_store import ResultStore
+from ..traversal import ParallelWalker
+from ..settings import get_setting, load_settings, resolve_worker_count
 
 
 def start_search(self):
     """开始搜索"""
+    if self.is_search_running():
+        return
+
     if not self.search_folders:
         QMessageBox.warning(self, "错误", "请添加至少一个搜索文件夹或盘符！")
         return
@@ -56,107 +61,46 @@ def start_search(self):
             return
         file_types = [ext.strip().lower() for ext in custom_types.split(';') if ext.strip()]
 
-    self.search_results = []
-    self.results_tree.clear()
-    self.progress_bar.setVisible(True)
-    self.progress_bar.setValue(0)
+    self.search_results = ResultStore()
+    self.results_model.clear()
     self.found_files_count = 0
-    self.status_count_label.setText("已找到: 0 个文件")
-    self.status_label.setText("正在搜索文件...")
+    self.progress_reporter.start("正在搜索文件...", status_format="正在搜索: {path}",
+                                 count_format="已找到: {hits} 个文件")
     QApplication.processEvents()
 
     size_range = self.file_size_combo.currentData()
     mod_date_range = self.mod_date_combo.currentData()
-
-    keyword_results = {kw: [] for kw in keywords}
-    all_found_files = {}
-
-    # 执行搜索
-    for folder in self.search_folders:
-        if self.cancel_search:
-            break
-
-        folder_path = Path(folder)
-        if not folder_path.exists():
-            continue
-
-        if include_subfolders:
-            walk_iter = os.walk(folder)
-        else:
-            try:
-                files = [f for f in folder_path.iterdir() if f.is_file()]
-                walk_iter = [(str(folder_path), [], [f.name for f in files])]
-            except Exception as e:
-                print(f"访问文件夹出错: {folder} - {str(e)}")
-                continue
-
-        for root, _, files in walk_iter:
-            if self.cancel_search:
-                break
-
-            self.current_path_label.setText(f"当前搜索路径: {root}")
-            self.status_label.setText(f"正在搜索: {root}")
-            QApplication.processEvents()
-
-            for file in files:
-                if self.cancel_search:
-                    break
-
-                file_path = Path(root) / file
-
-                try:
-                    if not file_path.exists() or not os.access(str(file_path), os.R_OK):
-                        continue
-
-                    file_stat = file_path.stat()
-                    file_size = file_stat.st_size
-                    mod_date = datetime.datetime.fromtimestamp(file_stat.st_mtime).date()
-
-                    # 检查文件大小
-                    if not (size_range[0] <= file_size <= size_range[1]):
-                        continue
-
-                    # 检查修改日期
-                    if mod_date_range != (None, None) and mod_date_range != "custom":
-                        start_date, end_date = mod_date_range
-                        if not (start_date <= mod_date <= end_date):
-                            continue
-
-                    # 检查文件类型
-                    ext = file_path.suffix.lower()
-                    if file_types and ext not in file_types:
-                        continue
-
-                    # 关键词匹配
-                    for keyword in keywords:
-                        filename_match = False
-                        content_match = False
-
-                        if search_mode in ["filename", "both"]:
-                            filename_match = matches_keyword(file, keyword)
-
-                        if search_mode in ["content", "both"] and not filename_match:
-                            content_match = search_content(str(file_path), keyword)
-
-                        if (search_mode == "filename" and filename_match) or \
-                           (search_mode == "content" and content_match) or \
-                           (search_mode == "both" and (filename_match or content_match)):
-
-                            file_info = get_file_info_dict(file_path, file_size, mod_date)
-                            keyword_results[keyword].append(file_info)
-                            if str(file_path) not in all_found_files:
-                                all_found_files[str(file_path)] = file_info
-
-                except Exception as e:
-                    print(f"跳过文件 {file_path}，原因: {str(e)}")
-                    continue
-    
-    # 显示搜索结果
-    self._display_search_results(all_found_files, keyword_results)
+    # 每次搜索只读取一次设置文件
+    settings = load_settings()
+
+    # 在后台线程中执行搜索
+    worker = SearchWorker(
+        self.search_folders, keywords,
+        search_mode=search_mode,
+        file_types=file_types,
+        include_subfolders=include_subfolders,
+        size_range=size_range,
+        mod_date_range=mod_date_range,
+        workers=settings['search_workers'],
+        use_index=self.use_index_check.isChecked(),
+        text_cache_bytes=settings['text_cache_max_mb'] * 1024 * 1024,
+        processes=settings['content_processes'],
+        extract_timeout=settings['extract_timeout'],
+        memory_limit_mb=settings['extract_memory_mb'],
+        pdf_max_pages=settings['pdf_max_pages'],
+        pdf_max_mb=settings['pdf_max_mb'],
+        scan_chars=self.scan_depth_combo.currentData() * 1024,
+        mmap_threshold_mb=settings['mmap_threshold_mb'],
+        all_text=self.all_text_check.isChecked(),
+    )
+    _launch_search_worker(self, worker)
 
 
 def start_exact_search(self):
     """开始精确搜索 - 文件名必须严格匹配"""
+    if self.is_search_running():
+        return
+
     if not self.search_folders:
         QMessageBox.warning(self, "错误", "请添加至少一个搜索文件夹或盘符！")
         return
@@ -196,91 +140,106 @@ def start_exact_search(self):
             return
         file_types = [ext.strip().lower() for ext in custom_types.split(';') if ext.strip()]
 
-    self.search_results = []
-    self.results_tree.clear()
-    self.progress_bar.setVisible(True)
-    self.progress_bar.setValue(0)
+    self.search_results = ResultStore()
+    self.results_model.clear()
     self.found_files_count = 0
-    self.status_count_label.setText("已找到: 0 个文件")
-    self.status_label.setText("正在执行精确搜索...")
+    self.progress_reporter.start("正在执行精确搜索...", status_format="正在搜索: {path}",
+                                 count_format="已找到: {hits} 个文件")
     QApplication.processEvents()
 
     size_range = self.file_size_combo.currentData()
     mod_date_range = self.mod_date_combo.currentData()
 
-    keyword_results = {kw: [] for kw in keywords}
-    all_found_files = {}
-
-    # 执行精确搜索
-    for folder in self.search_folders:
-        if self.cancel_search:
-            break
-
-        folder_path = Path(folder)
-        if not folder_path.exists():
-            continue
-
-        if include_subfolders:
-            walk_iter = os.walk(folder)
-        else:
-            try:
-                files = [f for f in folder_path.iterdir() if f.is_file()]
-                walk_iter = [(str(folder_path), [], [f.name for f in files])]
-            except Exception as e:
-                print(f"访问文件夹出错: {folder} - {str(e)}")
-                continue
-
-        for root, _, files in walk_iter:
-            if self.cancel_search:
-                break
-
-            self.current_path_label.setText(f"当前搜索路径: {root}")
-            self.status_label.setText(f"正在搜索: {root}")
-            QApplication.processEvents()
-
-            for file in files:
-                if self.cancel_search:
-                    break
-
-                file_path = Path(root) / file
+    # 在后台线程中执行精确搜索
+    worker = SearchWorker(
+        self.search_folders, keywords,
+        exact=True,
+        file_types=file_types,
+        include_subfolders=include_subfolders,
+        size_range=size_range,
+        mod_date_range=mod_date_range,
+        workers=get_setting('search_workers'),
+        use_index=self.use_index_check.isChecked(),
+    )
+    _launch_search_worker(self, worker)
+
+
+def _launch_search_worker(self, worker):
+    """启动搜索工作线程并连接其信号"""
+    self.search_button.setEnabled(False)
+    self.exact_search_button.setEnabled(False)
+
+    self.search_worker = worker
+    worker.files_found.connect(self._on_search_files_found)
+    worker.path_changed.connect(self._on_search_path_changed)
+    worker.finished.connect(self._on_search_finished)
+    self.search_thread = start_worker_thread(worker)
+
+
+def _on_search_files_found(self, results, count):
+    """工作线程发来新一批结果，立即追加到结果列表；计数由进度报告定时刷新"""
+    self.results_model.append_results(results, count)
+    self.found_files_count = count
+    self.progress_reporter.set_hits(count)
+
+
+def _on_search_path_changed(self, path):
+    """记录当前搜索路径，由进度报告定时刷新到界面"""
+    self.progress_reporter.set_path(path)
+
+
+def _on_search_finished(self, results):
+    """工作线程结束后显示搜索结果"""
+    self.progress_reporter.finish()
+    if self.search_thread is not None:
+        self.search_thread.quit()
+        self.search_thread.wait()
+    if self.search_worker is not None:
+        stats = self.search_worker.traversal_stats
+        self.add_log(f"遍历统计: {stats.dirs} 个目录, {stats.files} 个文件, "
+                     f"每文件系统调用 {stats.syscalls_per_file:.2f} 次")
+        for root in self.search_worker.indexed_roots:
+            self.add_log(f"使用文件名索引搜索: {root}")
+        extractor_calls = self.search_worker.content_searcher.extractor_calls
+        if extractor_calls:
+            self.add_log(f"内容搜索: 提取文本 {extractor_calls} 次")
+        binary_skipped = self.search_worker.content_searcher.binary_skipped
+        if binary_skipped:
+            self.add_log(f"内容搜索: 跳过二进制文件 {binary_skipped} 个")
+        timings = self.search_worker.extract_timings
+        if timings:
+            total = sum(seconds for _, seconds in timings)
+            slowest = ", ".join(f"{Path(path).name} {seconds:.2f}s" for path, seconds in timings[:5])
+            self.add_log(f"文档提取共耗时 {total:.2f}s, 最慢: {slowest}")
+        cache = self.search_worker.text_cache
+        if cache is not None and (cache.hits or cache.misses):
+            self.add_log(f"文本缓存: 命中 {cache.hits} 次, 未命中 {cache.misses} 次")
+        skipped = self.search_worker.skipped
+    else:
+        skipped = []
+    self.search_thread = None
+    self.search_worker = None
 
-                try:
-                    if not file_path.exists() or not os.access(str(file_path), os.R_OK):
-                        continue
-
-                    file_stat = file_path.stat()
-                    file_size = file_stat.st_size
-                    mod_date = datetime.datetime.fromtimestamp(file_stat.st_mtime).date()
+    # 显示搜索结果
+    self._display_search_results(results)
+    if skipped:
+        _show_skipped_files(self, skipped)
 
-                    # 检查文件大小
-                    if not (size_range[0] <= file_size <= size_range[1]):
-                        continue
 
-                    # 检查修改日期
-                    if mod_date_range != (None, None) and mod_date_range != "custom":
-                        start_date, end_date = mod_date_range
-                        if not (start_date <= mod_date <= end_date):
-                            continue
+def _show_skipped_files(self, skipped):
+    """列出因提取超时、内存超限或崩溃而未搜索内容的文件"""
+    for path, reason in skipped:
+        self.add_log(f"已跳过（{reason}）: {path}")
+    lines = [f"{path}（{reason}）" for path, reason in skipped[:10]]
+    msg = "以下文件未能提取内容，已跳过：\n\n" + "\n".join(lines)
+    if len(skipped) > 10:
+        msg += f"\n\n...以及另外 {len(skipped)-10} 个文件"
+    QMessageBox.warning(self, "部分文件已跳过", msg)
 
-                    # 检查文件类型
-                    ext = file_path.suffix.lower()
-                    if file_types and ext not in file_types:
-                        continue
 
-                    # 精确关键词匹配 - 只在文件名中进行，且必须严格匹配
-                    for keyword in keywords:
-                        if exact_match_filename(file, keyword):
-                            file_info = get_file_info_dict(file_path, file_size, mod_date)
-                            keyword_results[keyword].append(file_info)
-                            if str(file_path) not in all_found_files:
-                                all_found_files[str(file_path)] = file_info
-
-                except Exception as e:
-                    print(f"跳过文件 {file_path}，原因: {str(e)}")
-                    continue
-    
-    # 显示搜索结果
-    self._display_search_results(all_found_files, keyword_results)
+def is_search_running(self):
+    """是否有搜索工作线程正在运行"""
+    return self.search_thread is not None
 
 
 def search_folders_by_name(self):
@@ -360,76 +319,52 @@ def _start_folder_search(self):
 
     self.add_log(f"开始搜索文件夹，关键词: {', '.join(keywords)}")
 
-    self.search_results = []
-    self.results_tree.clear()
-    self.progress_bar.setVisible(True)
-    self.progress_bar.setValue(0)
+    self.search_results = ResultStore()
+    self.results_model.clear()
     self.found_files_count = 0
-    self.status_count_label.setText("已找到: 0 个文件夹")
-    self.status_label.setText("正在搜索文件夹...")
+    self.progress_reporter.start("正在搜索文件夹...", status_format="正在搜索: {path}",
+                                 count_format="已找到: {hits} 个文件夹")
     QApplication.processEvents()
 
     search_mode = self.get_search_mode()
-    keyword_results = {kw: [] for kw in keywords}
-    all_found_folders = {}
+    query = CompiledQuery(keywords)
+    results = ResultStore(query.keywords)
 
     # 执行文件夹搜索
-    for folder in self.search_folders:
-        if self.cancel_search:
-            break
-
-        folder_path = Path(folder)
-        if not folder_path.exists():
-            continue
-
-        try:
-            # 仅搜索第一级子文件夹
-            subdirs = [d for d in folder_path.iterdir() if d.is_dir()]
-        except Exception as e:
-            print(f"访问文件夹出错: {folder} - {str(e)}")
-            continue
-
-        self.current_path_label.setText(f"当前搜索路径: {folder}")
-        self.status_label.setText(f"正在搜索: {folder}")
-        QApplication.processEvents()
-
-        for subdir in subdirs:
+    roots = [folder for folder in self.search_folders if Path(folder).exists()]
+    walker = ParallelWalker(roots, recursive=False,
+                            workers=resolve_worker_count(get_setting('search_workers')),
+                            cancel=lambda: self.cancel_search)
+    for listing in walker:
+        # 仅搜索第一级子文件夹
+        self.progress_reporter.add_dir(listing.path)
+        self.progress_reporter.pump()
+
+        for subdir in listing.dirs:
             if self.cancel_search:
                 break
 
             dir_name = subdir.name
 
             # 关键词匹配
-            for keyword in keywords:
-                matches = False
-
-                if search_mode in ["filename", "both"]:
-                    matches = matches_keyword(dir_name, keyword)
-
-                if matches:
-                    # 获取文件夹信息
-                    try:
-                        dir_stat = subdir.stat()
-                        mod_date = datetime.datetime.fromtimestamp(dir_stat.st_mtime).date()
-                        
-                        folder_info = {
-                            "path": str(subdir),
-                            "name": dir_name,
-                            "size": 0,
-                            "mod_date": mod_date.strftime("%Y-%m-%d")
-                        }
+            if search_mode not in ["filename", "both"]:
+                continue
 
-                        keyword_results[keyword].append(folder_info)
-                        if str(subdir) not in all_found_folders:
-                            all_found_folders[str(subdir)] = folder_info
-                            self.found_files_count += 1
-                            self.status_count_label.setText(f"已找到: {self.found_files_count} 个文件夹")
-                    except Exception as e:
-                        print(f"获取文件夹信息失败: {subdir} - {str(e)}")
-                        continue
+            for keyword in query.match(dir_name):
+                # 获取文件夹信息
+                try:
+                    dir_stat = subdir.stat()
+                    # 文件夹不计算大小
+                    if results.add(subdir.path, dir_name, 0, dir_stat.st_mtime, [keyword]) is not None:
+                        self.found_files_count += 1
+                        self.progress_reporter.add_hits()
+                except Exception as e:
+                    print(f"获取文件夹信息失败: {subdir.path} - {str(e)}")
+                    continue
 
     # 显示搜索结果
-    self._display_search_results(all_found_folders, keyword_results)
+    self.progress_reporter.finish()
+    self._display_search_results(results)
 
 
 def _start_folder_exact_search(self):
@@ -445,67 +380,45 @@ def _start_folder_exact_search(self):
 
     self.add_log(f"开始精确搜索文件夹，关键词: {', '.join(keywords)}")
 
-    self.search_results = []
-    self.results_tree.clear()
-    self.progress_bar.setVisible(True)
-    self.progress_bar.setValue(0)
+    self.search_results = ResultStore()
+    self.results_model.clear()
     self.found_files_count = 0
-    self.status_count_label.setText("已找到: 0 个文件夹")
-    self.status_label.setText("正在执行精确搜索...")
+    self.progress_reporter.start("正在执行精确搜索...", status_format="正在搜索: {path}",
+                                 count_format="已找到: {hits} 个文件夹")
     QApplication.processEvents()
 
-    keyword_results = {kw: [] for kw in keywords}
-    all_found_folders = {}
+    exact_query = ExactQuery(keywords)
+    results = ResultStore(exact_query.keywords)
 
     # 执行文件夹精确搜索
-    for folder in self.search_folders:
-        if self.cancel_search:
-            break
-
-        folder_path = Path(folder)
-        if not folder_path.exists():
-            continue
-
-        try:
-            # 仅搜索第一级子文件夹
-            subdirs = [d for d in folder_path.iterdir() if d.is_dir()]
-        except Exception as e:
-            print(f"访问文件夹出错: {folder} - {str(e)}")
-            continue
-
-        self.current_path_label.setText(f"当前搜索路径: {folder}")
-        self.status_label.setText(f"正在搜索: {folder}")
-        QApplication.processEvents()
-
-        for subdir in subdirs:
+    roots = [folder for folder in self.search_folders if Path(folder).exists()]
+    walker = ParallelWalker(roots, recursive=False,
+                            workers=resolve_worker_count(get_setting('search_workers')),
+                            cancel=lambda: self.cancel_search)
+    for listing in walker:
+        # 仅搜索第一级子文件夹
+        self.progress_reporter.add_dir(listing.path)
+        self.progress_reporter.pump()
+
+        for subdir in listing.dirs:
             if self.cancel_search:
                 break
 
             dir_name = subdir.name
 
             # 精确关键词匹配
-            for keyword in keywords:
-                if exact_match_filename(dir_name, keyword):
-                    # 获取文件夹信息
-                    try:
-                        dir_stat = subdir.stat()
-                        mod_date = datetime.datetime.fromtimestamp(dir_stat.st_mtime).date()
-                        
-                        folder_info = {
-                            "path": str(subdir),
-                            "name": dir_name,
-                            "size": 0,
-                            "mod_date": mod_date.strftime("%Y-%m-%d")
-                        }
-
-                        keyword_results[keyword].append(folder_info)
-                        if str(subdir) not in all_found_folders:
-                            all_found_folders[str(subdir)] = folder_info
-                            self.found_files_count += 1
-                            self.status_count_label.setText(f"已找到: {self.found_files_count} 个文件夹")
-                    except Exception as e:
-                        print(f"获取文件夹信息失败: {subdir} - {str(e)}")
-                        continue
+            for keyword in exact_query.match(dir_name):
+                # 获取文件夹信息
+                try:
+                    dir_stat = subdir.stat()
+                    # 文件夹不计算大小
+                    if results.add(subdir.path, dir_name, 0, dir_stat.st_mtime, [keyword]) is not None:
+                        self.found_files_count += 1
+                        self.progress_reporter.add_hits()
+                except Exception as e:
+                    print(f"获取文件夹信息失败: {subdir.path} - {str(e)}")
+                    continue
 
     # 显示搜索结果
-    self._display_search_results(all_found_folders, keyword_results)
+    self.progress_reporter.finish()
+    self._display_search_results(results)
@@ -12,6 +12,8 @@ from PyQt6.QtWidgets import (
     QMessageBox, QScrollArea, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QDialog
 )
 
+from ..result_store import ResultStore
+
 
 def add_log(self, action, file_path=None):
     """添加操作日志"""
@@ -23,11 +25,11 @@ def add_log(self, action, file_path=None):
 
 def open_selected_file(self):
     """打开选中的文件"""
-    selected_items = self.results_tree.selectedItems()
-    if not selected_items:
+    selected_rows = self.results_tree.selectionModel().selectedRows()
+    if not selected_rows:
         return
 
-    file_path = selected_items[0].data(0, Qt.UserRole)
+    file_path = self.results_model.path_at(selected_rows[0].row())
     try:
         os.startfile(file_path)
         self.add_log(f"打开文件: {file_path}", file_path)
@@ -37,11 +39,11 @@ def open_selected_file(self):
 
 def open_file_folder(self):
     """打开文件所在文件夹"""
-    selected_items = self.results_tree.selectedItems()
-    if not selected_items:
+    selected_rows = self.results_tree.selectionModel().selectedRows()
+    if not selected_rows:
         return
 
-    file_path = selected_items[0].data(0, Qt.ItemDataRole.UserRole)
+    file_path = self.results_model.path_at(selected_rows[0].row())
     folder_path = Path(file_path).parent
 
     try:
@@ -134,10 +136,11 @@ def show_help(self):
 def cancel_search_action(self):
     """取消搜索"""
     self.cancel_search = True
+    if self.search_worker is not None:
+        self.search_worker.cancel()
     self.status_label.setText("搜索已取消")
     self.cancel_button.setEnabled(False)
-    self.search_button.setEnabled(True)
-    self.exact_search_button.setEnabled(True)
+    # 搜索按钮在工作线程真正结束、显示结果时（_display_search_results）才恢复可用
     self.add_log("取消搜索")
 
 
@@ -145,7 +148,7 @@ def reset_application(self):
     """复位应用程序到初始状态"""
     # 清空所有搜索数据
     self.search_folders = []
-    self.search_results = []
+    self.search_results = ResultStore()
     self.target_folder = None
     self.cancel_search = False
     self.operation_log = []
@@ -157,7 +160,7 @@ def reset_application(self):
     # 清空UI
     self.folder_list.clear()
     self.keyword_entry.clear()
-    self.results_tree.clear()
+    self.results_model.clear()
     self.keywords_info_label.clear()
     self.status_count_label.setText("已找到: 0 个文件")
     self.current_path_label.setText("当前搜索路径: ")
@@ -20,6 +20,8 @@ from PyQt6.QtWidgets import (
 from .ui_builder import UIBuilder
 from .utils import register_multilingual_fonts
 from .dialogs import FileConflictDialog, PDFLogGenerator
+from .result_store import ResultStore
+from .progress import ProgressReporter
 
 # 导入所有的函数模块
 from . import functions
@@ -81,9 +83,20 @@ class FileGatherPro(QMainWindow):
         self.clear_search_folders = functions.clear_search_folders.__get__(self, FileGatherPro)
         self.update_folder_list = functions.update_folder_list.__get__(self, FileGatherPro)
         
+        # 文件名索引方法
+        self.rebuild_index = functions.rebuild_index.__get__(self, FileGatherPro)
+        self.refresh_index = functions.refresh_index.__get__(self, FileGatherPro)
+        self.update_index_status = functions.update_index_status.__get__(self, FileGatherPro)
+        self._on_index_progress = functions._on_index_progress.__get__(self, FileGatherPro)
+        self._on_index_finished = functions._on_index_finished.__get__(self, FileGatherPro)
+        
         # 搜索管理方法
         self.get_search_mode = functions.get_search_mode.__get__(self, FileGatherPro)
         self.on_gather_mode_changed = functions.on_gather_mode_changed.__get__(self, FileGatherPro)
+        self.load_scan_depth = functions.load_scan_depth.__get__(self, FileGatherPro)
+        self.on_scan_depth_changed = functions.on_scan_depth_changed.__get__(self, FileGatherPro)
+        self.load_all_text_option = functions.load_all_text_option.__get__(self, FileGatherPro)
+        self.on_all_text_toggled = functions.on_all_text_toggled.__get__(self, FileGatherPro)
         self.cancel_search_action = functions.cancel_search_action.__get__(self, FileGatherPro)
         
         # 搜索操作方法
@@ -92,9 +105,14 @@ class FileGatherPro(QMainWindow):
         self.search_folders_by_name = functions.search_folders_by_name.__get__(self, FileGatherPro)
         self._start_folder_search = functions._start_folder_search.__get__(self, FileGatherPro)
         self._start_folder_exact_search = functions._start_folder_exact_search.__get__(self, FileGatherPro)
+        self._on_search_files_found = functions._on_search_files_found.__get__(self, FileGatherPro)
+        self._on_search_path_changed = functions._on_search_path_changed.__get__(self, FileGatherPro)
+        self._on_search_finished = functions._on_search_finished.__get__(self, FileGatherPro)
+        self.is_search_running = functions.is_search_running.__get__(self, FileGatherPro)
         
         # 结果管理方法
         self._display_search_results = functions._display_search_results.__get__(self, FileGatherPro)
+        self._update_keyword_summary = functions._update_keyword_summary.__get__(self, FileGatherPro)
         self._update_unfound_keywords_display = functions._update_unfound_keywords_display.__get__(self, FileGatherPro)
         self._update_single_result_keywords_display = functions._update_single_result_keywords_display.__get__(self, FileGatherPro)
         self._create_keyword_view_buttons = functions._create_keyword_view_buttons.__get__(self, FileGatherPro)
@@ -122,7 +140,7 @@ class FileGatherPro(QMainWindow):
     def _init_state(self):
         """初始化应用程序状态"""
         self.search_folders = []
-        self.search_results = []
+        self.search_results = ResultStore()
         self.target_folder = None
         self.cancel_search = False
         self.operation_log = []
@@ -130,8 +148,26 @@ class FileGatherPro(QMainWindow):
         self.found_files_count = 0
         self.keyword_results = {}
         self.unfound_keywords = []
+        self.search_worker = None
+        self.search_thread = None
+        self.index_worker = None
+        self.index_thread = None
         self.version = "2.5.1"
 
+    def closeEvent(self, event):
+        """关闭窗口前停止正在运行的搜索线程"""
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+        if self.search_thread is not None:
+            self.search_thread.quit()
+            self.search_thread.wait()
+        if self.index_worker is not None:
+            self.index_worker.cancel()
+        if self.index_thread is not None:
+            self.index_thread.quit()
+            self.index_thread.wait()
+        super().closeEvent(event)
+
     def _build_ui(self):
         """构建用户界面"""
         main_components = UIBuilder.build_main_layout(self.version)
@@ -144,7 +180,10 @@ class FileGatherPro(QMainWindow):
         self.central_widget.setLayout(main_layout)
         
         # 连接信号槽
+        self.load_scan_depth()
+        self.load_all_text_option()
         self._connect_signals()
+        self.update_index_status()
 
     def _extract_ui_components(self, main_components):
         """提取UI组件引用"""
@@ -156,7 +195,9 @@ class FileGatherPro(QMainWindow):
          self.keyword_entry, self.filename_radio, self.content_radio, self.both_radio,
          self.search_mode_group, self.filetype_combo, self.mod_date_combo, 
          self.file_size_combo, self.subfolders_check, self.gather_mode_combo,
-         self.filetype_label, self.subfolders_container) = search_comp
+         self.filetype_label, self.subfolders_container,
+         self.use_index_check, self.index_status_label, self.build_index_button,
+         self.refresh_index_button, self.scan_depth_combo, self.all_text_check) = search_comp
         
         # 操作按钮组件
         (_, self.search_button, self.exact_search_button, self.cancel_button, 
@@ -169,8 +210,12 @@ class FileGatherPro(QMainWindow):
          self.keywords_buttons_container, self.unfound_keywords_container,
          self.unfound_keywords_tree, self.copy_unfound_button, self.copy_feedback_label,
          self.single_result_keywords_container, self.single_result_keywords_tree) = results_comp
+        self.results_model = self.results_tree.model()
         
         self.status_label = status_label
+        self.progress_reporter = ProgressReporter(self.progress_bar, self.status_label,
+                                                  self.current_path_label, self.status_count_label,
+                                                  self)
 
     def _connect_signals(self):
         """连接信号和槽"""
@@ -178,6 +223,8 @@ class FileGatherPro(QMainWindow):
         self.add_drive_button.clicked.connect(self.add_drive)
         self.remove_folder_button.clicked.connect(self.remove_selected_folders)
         self.clear_folders_button.clicked.connect(self.clear_search_folders)
+        self.build_index_button.clicked.connect(self.rebuild_index)
+        self.refresh_index_button.clicked.connect(self.refresh_index)
         
         self.search_button.clicked.connect(self.start_search)
         self.exact_search_button.clicked.connect(self.start_exact_search)
@@ -192,8 +239,10 @@ class FileGatherPro(QMainWindow):
         
         # 归集模式变化时隐藏/显示相关选项
         self.gather_mode_combo.currentIndexChanged.connect(self.on_gather_mode_changed)
+        self.scan_depth_combo.currentIndexChanged.connect(self.on_scan_depth_changed)
+        self.all_text_check.toggled.connect(self.on_all_text_toggled)
         
-        self.results_tree.itemDoubleClicked.connect(self.show_file_info)
+        self.results_tree.doubleClicked.connect(self.show_file_info)
         self.results_tree.customContextMenuRequested.connect(self.show_context_menu)
         
         # 未找到关键词的处理
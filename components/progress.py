@@ -0,0 +1,148 @@
+"""
+进度报告
+搜索、复制、删除和文件夹归集只累加计数（目录、文件、字节、命中）和当前路径，
+由 QTimer 以固定频率把计数推送到进度条和状态标签，界面重绘次数与文件数量无关
+"""
+
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from .utils import format_size
+
+
+class ProgressReporter(QObject):
+    """
+    累加进度计数并定时刷新界面控件
+
+    在后台线程中运行的操作（搜索）由事件循环驱动定时器；在界面线程中同步执行的循环
+    （复制、删除）每处理一项调用 pump()，按同样的频率让出事件循环，定时器随之刷新。
+    """
+
+    # 刷新间隔（毫秒）
+    INTERVAL_MS = 100
+
+    def __init__(self, progress_bar, status_label, path_label=None, count_label=None, parent=None):
+        """
+        Args:
+            progress_bar: 进度条
+            status_label: 状态栏文字
+            path_label: 可选，显示当前路径的标签
+            count_label: 可选，显示计数的标签
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.progress_bar = progress_bar
+        self.status_label = status_label
+        self.path_label = path_label
+        self.count_label = count_label
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.INTERVAL_MS)
+        self._timer.timeout.connect(self.refresh)
+        self._last_pump = 0.0
+        self._reset(0, None, None)
+
+    def _reset(self, total, status_format, count_format):
+        self.dirs = 0
+        self.files = 0
+        self.bytes = 0
+        self.hits = 0
+        self.path = None
+        self.total = total
+        self.status_format = status_format
+        self.count_format = count_format
+        self._changed = False
+
+    def start(self, status, total=0, status_format=None, count_format=None):
+        """
+        开始报告一项操作的进度
+
+        Args:
+            status: 立即显示的状态文字
+            total: 需处理的文件总数，用于计算百分比；0 表示未知，进度条显示为忙碌状态
+            status_format: 刷新时的状态文字模板，可使用 {path}、{dirs}、{files}、{total}、
+                           {bytes}（已格式化的大小）和 {hits}；为 None 时保持 status 不变
+            count_format: 刷新时计数标签的文字模板，可用字段同上
+        """
+        self._reset(total, status_format, count_format)
+        self.progress_bar.setRange(0, 100 if total else 0)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.status_label.setText(status)
+        if count_format is not None and self.count_label is not None:
+            self.count_label.setText(count_format.format(**self.counters()))
+        self._last_pump = time.monotonic()
+        self._timer.start()
+
+    def add_dir(self, path):
+        """进入一个目录"""
+        self.dirs += 1
+        self.path = path
+        self._changed = True
+
+    def add_file(self, size=0, path=None):
+        """处理完一个文件"""
+        self.files += 1
+        self.bytes += size
+        if path is not None:
+            self.path = path
+        self._changed = True
+
+    def add_hits(self, count=1):
+        """新增命中"""
+        self.hits += count
+        self._changed = True
+
+    def set_hits(self, count):
+        """设置命中总数（由工作线程汇报累计值时使用）"""
+        self.hits = count
+        self._changed = True
+
+    def set_path(self, path):
+        """设置当前路径"""
+        self.path = path
+        self._changed = True
+
+    def counters(self):
+        """当前计数，供文字模板使用"""
+        return {
+            'path': self.path or "",
+            'dirs': self.dirs,
+            'files': self.files,
+            'total': self.total,
+            'bytes': format_size(self.bytes),
+            'hits': self.hits,
+        }
+
+    def refresh(self):
+        """把计数推送到界面控件，自上次刷新以来没有变化时不做任何事"""
+        if not self._changed:
+            return
+        self._changed = False
+        counters = self.counters()
+        if self.total:
+            self.progress_bar.setValue(min(100, self.files * 100 // self.total))
+        if self.path is not None and self.path_label is not None:
+            self.path_label.setText(f"当前搜索路径: {self.path}")
+        if self.status_format is not None:
+            self.status_label.setText(self.status_format.format(**counters))
+        if self.count_format is not None and self.count_label is not None:
+            self.count_label.setText(self.count_format.format(**counters))
+
+    def pump(self):
+        """在界面线程的同步循环中调用，按刷新间隔处理一次事件（含定时刷新）"""
+        now = time.monotonic()
+        if now - self._last_pump >= self.INTERVAL_MS / 1000:
+            self._last_pump = now
+            QApplication.processEvents()
+
+    def finish(self):
+        """结束报告：推送最终计数，停止定时器并隐藏进度条"""
+        self._timer.stop()
+        self.refresh()
+        self.progress_bar.setVisible(False)
+        self.progress_bar.setRange(0, 100)
+        if self.path_label is not None:
+            self.path_label.setText("当前搜索路径: ")
@@ -0,0 +1,272 @@
+"""
+搜索结果存储
+按列保存命中的文件：所在目录登记一次后只存编号，大小和修改时间存于 array('q')，
+每个关键词的命中记录为行号数组；显示用的日期、路径等文字在读取时才生成。
+每个文件约 170 字节（大部分是文件名本身），原先每个文件一个字典约 460 字节。
+
+复制、删除、冲突对话框和 PDF 日志仍按 file_info 字典的方式读取结果，
+store[row] 返回的 ResultRecord 提供相同的键（path、name、size、mod_date）。
+"""
+
+import datetime
+import os
+from array import array
+from collections.abc import MutableMapping, Sequence
+from itertools import accumulate, compress
+
+# 路径分隔符，文件名中不会出现
+_SEPARATORS = tuple(sep for sep in (os.sep, os.altsep) if sep)
+
+
+class ResultRecord(MutableMapping):
+    """
+    单条结果的字典视图
+
+    path、name、size、mod_date 从存储中读取；其他键（如冲突对话框写入的 action、new_name）
+    保存在记录自身，不写回存储。
+    """
+
+    __slots__ = ('store', 'row', '_extra')
+
+    KEYS = ('path', 'name', 'size', 'mod_date')
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+        self._extra = {}
+
+    def __getitem__(self, key):
+        if key in self._extra:
+            return self._extra[key]
+        if key == 'path':
+            return self.store.path(self.row)
+        if key == 'name':
+            return self.store.name(self.row)
+        if key == 'size':
+            return self.store.size(self.row)
+        if key == 'mod_date':
+            return self.store.mod_date(self.row)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        self._extra[key] = value
+
+    def __delitem__(self, key):
+        del self._extra[key]
+
+    def __iter__(self):
+        yield from self.KEYS
+        yield from (key for key in self._extra if key not in self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS) + sum(1 for key in self._extra if key not in self.KEYS)
+
+    def __repr__(self):
+        return f"ResultRecord({self.store.path(self.row)!r})"
+
+
+class ResultRows(Sequence):
+    """按行号列表读取的结果序列，如某个关键词的全部命中"""
+
+    __slots__ = ('store', 'rows')
+
+    def __init__(self, store, rows):
+        self.store = store
+        self.rows = rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ResultRows(self.store, self.rows[index])
+        return self.store[self.rows[index]]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __eq__(self, other):
+        # 与列表等序列逐条比较，如 keyword_results[kw] == []
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+
+class ResultStore(Sequence):
+    """按列存储的搜索结果，行号即结果顺序"""
+
+    def __init__(self, keywords=()):
+        """
+        Args:
+            keywords: 关键词列表，决定 keyword_results() 的顺序
+        """
+        # 目录前缀（含末尾分隔符）及其编号，路径 = 前缀 + 文件名
+        self._dirs = []
+        self._dir_ids = {}
+        # 每个目录下 文件名 -> 行号，用于去重和按路径查找
+        self._rows_in_dir = []
+        self._dir_of = array('q')
+        self._names = []
+        self._sizes = array('q')
+        self._mtimes = array('q')
+        # 每行匹配的关键词组合编号，相同组合共用一个元组
+        self._combo_of = array('q')
+        self._combos = []
+        self._combo_ids = {}
+        self._hits = {keyword: array('q') for keyword in keywords}
+
+    @property
+    def keywords(self):
+        """关键词列表"""
+        return list(self._hits)
+
+    def add(self, path, name, size, mtime, keywords=()):
+        """
+        添加一条结果
+
+        Args:
+            path: 完整路径
+            name: 文件名（path 的最后一部分）
+            size: 文件大小（字节）
+            mtime: 修改时间（时间戳）
+            keywords: 命中的关键词
+
+        Returns:
+            新行的行号；路径已存在时把新关键词合并到原行并返回 None
+        """
+        prefix = path[:len(path) - len(name)]
+        dir_id = self._dir_ids.get(prefix)
+        if dir_id is None:
+            dir_id = self._dir_ids[prefix] = len(self._dirs)
+            self._dirs.append(prefix)
+            self._rows_in_dir.append({})
+
+        rows = self._rows_in_dir[dir_id]
+        row = rows.get(name)
+        if row is not None:
+            current = self._combos[self._combo_of[row]]
+            added = [keyword for keyword in keywords if keyword not in current]
+            for keyword in added:
+                self._add_hit(keyword, row)
+            if added:
+                merged = set(current).union(added)
+                self._combo_of[row] = self._combo_id(
+                    tuple(keyword for keyword in self._hits if keyword in merged))
+            return None
+
+        row = rows[name] = len(self._names)
+        self._dir_of.append(dir_id)
+        self._names.append(name)
+        self._sizes.append(size)
+        self._mtimes.append(int(mtime))
+        self._combo_of.append(self._combo_id(tuple(keywords)))
+        for keyword in keywords:
+            self._add_hit(keyword, row)
+        return row
+
+    def _add_hit(self, keyword, row):
+        hits = self._hits.get(keyword)
+        if hits is None:
+            hits = self._hits[keyword] = array('q')
+        hits.append(row)
+
+    def _combo_id(self, keywords):
+        combo = self._combo_ids.get(keywords)
+        if combo is None:
+            combo = self._combo_ids[keywords] = len(self._combos)
+            self._combos.append(keywords)
+        return combo
+
+    def __len__(self):
+        return len(self._names)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return ResultRows(self, range(len(self))[row])
+        if not -len(self) <= row < len(self):
+            raise IndexError(row)
+        return ResultRecord(self, row % len(self))
+
+    def __iter__(self):
+        return (ResultRecord(self, row) for row in range(len(self)))
+
+    def path(self, row):
+        """完整路径"""
+        return self._dirs[self._dir_of[row]] + self._names[row]
+
+    def name(self, row):
+        """文件名"""
+        return self._names[row]
+
+    def size(self, row):
+        """文件大小（字节）"""
+        return self._sizes[row]
+
+    def mtime(self, row):
+        """修改时间（整秒时间戳）"""
+        return self._mtimes[row]
+
+    def mod_date(self, row):
+        """修改日期，格式 YYYY-MM-DD"""
+        return datetime.datetime.fromtimestamp(self._mtimes[row]).strftime("%Y-%m-%d")
+
+    def keywords_at(self, row):
+        """该行匹配的关键词元组"""
+        return self._combos[self._combo_of[row]]
+
+    def row_of(self, path):
+        """按完整路径查找行号，不存在时返回 None"""
+        cut = max(path.rfind(sep) for sep in _SEPARATORS) + 1
+        dir_id = self._dir_ids.get(path[:cut])
+        if dir_id is None:
+            return None
+        return self._rows_in_dir[dir_id].get(path[cut:])
+
+    def hits(self, keyword):
+        """该关键词命中的行号数组"""
+        return self._hits.get(keyword, array('q'))
+
+    def keyword_results(self):
+        """{关键词: 命中结果序列}，与原先的 keyword_results 字典用法相同"""
+        return {keyword: ResultRows(self, hits) for keyword, hits in self._hits.items()}
+
+    def remove_rows(self, rows):
+        """
+        删除指定行，其余行保持原顺序并重新编号
+
+        各列用 itertools.compress 整体过滤，关键词命中和路径索引按新行号重建，
+        耗时与总行数成正比，与删除的行数无关。
+        """
+        count = len(self)
+        keep = bytearray(b'\x01') * count
+        for row in rows:
+            keep[row] = 0
+        # 原行号 -> 新行号（保留行之前的保留行数）
+        new_row = array('q', accumulate(keep, initial=-1))[1:]
+
+        self._dir_of = array('q', compress(self._dir_of, keep))
+        self._names = list(compress(self._names, keep))
+        self._sizes = array('q', compress(self._sizes, keep))
+        self._mtimes = array('q', compress(self._mtimes, keep))
+        self._combo_of = array('q', compress(self._combo_of, keep))
+        for keyword, hits in self._hits.items():
+            self._hits[keyword] = array('q', [new_row[row] for row in hits if keep[row]])
+        self._rows_in_dir = [{} for _ in self._dirs]
+        for row, (dir_id, name) in enumerate(zip(self._dir_of, self._names)):
+            self._rows_in_dir[dir_id][name] = row
+
+    def subset(self, rows):
+        """
+        按给定行号顺序生成新的存储（用于排序和删除后保留剩余结果）
+
+        Args:
+            rows: 行号序列，新存储的第 i 行为原存储的第 rows[i] 行
+        """
+        subset = ResultStore(self._hits)
+        for row in rows:
+            subset.add(self.path(row), self._names[row], self._sizes[row], self._mtimes[row],
+                       self.keywords_at(row))
+        return subset
+
+    def sorted_by(self, keys):
+        """按 keys（与行一一对应的序列）从小到大排序后的新存储"""
+        return self.subset(sorted(range(len(self)), key=keys.__getitem__))
@@ -0,0 +1,141 @@
+"""
+搜索结果表格模型
+模型直接读取按列存储的 ResultStore，所在文件夹、大小等显示文字和提示在视图请求时才生成，
+只为可见的行计算；结果再多也不会为每个文件创建界面对象
+"""
+
+from pathlib import Path
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from .utils import format_size
+from .result_store import ResultStore
+
+
+class ResultsModel(QAbstractTableModel):
+    """搜索结果表格：文件名、路径、大小、修改日期、匹配关键词"""
+
+    HEADERS = ("文件名", "路径", "大小", "修改日期", "匹配关键词")
+    # data() 中返回完整路径的角色
+    PATH_ROLE = Qt.ItemDataRole.UserRole
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 与 search_results 共用同一个 ResultStore；搜索过程中存储仍在增长，
+        # 只显示已通知的前 _count 行
+        self._store = ResultStore()
+        self._count = 0
+
+    @property
+    def store(self):
+        """当前显示的结果存储"""
+        return self._store
+
+    def set_results(self, store):
+        """替换全部结果"""
+        self.beginResetModel()
+        self._store = store
+        self._count = len(store)
+        self.endResetModel()
+
+    def append_results(self, store, count):
+        """
+        显示到第 count 行为止的结果（搜索过程中逐批追加）
+
+        Args:
+            store: 搜索线程写入的 ResultStore，与当前存储不同时先清空视图
+            count: 已可以显示的行数
+        """
+        if store is not self._store:
+            self.beginResetModel()
+            self._store = store
+            self._count = 0
+            self.endResetModel()
+        if count <= self._count:
+            return
+        self.beginInsertRows(QModelIndex(), self._count, count - 1)
+        self._count = count
+        self.endInsertRows()
+
+    def holds(self, store):
+        """是否已显示 store 的全部行"""
+        return store is self._store and self._count == len(store)
+
+    def remove_rows(self, rows):
+        """
+        从存储中删除指定行并通知视图
+
+        删除的行连续时只通知这一段，否则整体重置一次；不会逐行通知。
+        """
+        rows = sorted(set(rows))
+        if not rows:
+            return
+        if rows[-1] - rows[0] + 1 == len(rows):
+            self.beginRemoveRows(QModelIndex(), rows[0], rows[-1])
+            self._store.remove_rows(rows)
+            self._count = len(self._store)
+            self.endRemoveRows()
+        else:
+            self.beginResetModel()
+            self._store.remove_rows(rows)
+            self._count = len(self._store)
+            self.endResetModel()
+
+    def clear(self):
+        """清空结果"""
+        self.set_results(ResultStore())
+
+    def file_at(self, row):
+        """第 row 行的 file_info 视图"""
+        return self._store[row]
+
+    def path_at(self, row):
+        """第 row 行的完整路径"""
+        return self._store.path(row)
+
+    def keywords_at(self, row):
+        """第 row 行匹配的关键词元组"""
+        return self._store.keywords_at(row)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        store = self._store
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return store.name(row)
+            if column == 1:
+                return str(Path(store.path(row)).parent)
+            if column == 2:
+                return format_size(store.size(row))
+            if column == 3:
+                return store.mod_date(row)
+            if column == 4:
+                return self._keywords_text(row)
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            if column == 0:
+                return store.name(row)
+            if column == 1:
+                return str(Path(store.path(row)).parent)
+            if column == 4:
+                return f"匹配关键词: {self._keywords_text(row)}"
+        elif role == self.PATH_ROLE:
+            return store.path(row)
+        return None
+
+    def _keywords_text(self, row):
+        keywords = self._store.keywords_at(row)
+        return ", ".join(keywords) if keywords else "-"
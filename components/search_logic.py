@@ -1,5 +1,25 @@
+import datetime
+import io
+import mmap
+import os
 import re
+import zipfile
+from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
+from xml.etree import ElementTree
+
+from .aho_corasick import AhoCorasick
+from .extractors import Extractor, ExtractorRegistry
+from .file_sniffer import SNIFF_BYTES, KIND_TEXT, sniff_bytes
+
+def filename_stem(filename):
+    """返回文件名主体（不含扩展名），规则与 Path(filename).stem 一致"""
+    i = filename.rfind('.')
+    if 0 < i < len(filename) - 1:
+        return filename[:i]
+    return filename
+
 
 def exact_match_filename(filename, keyword):
     """
@@ -16,22 +36,136 @@ def exact_match_filename(filename, keyword):
     # 精确匹配：文件名必须完全等于关键词
     return name_without_ext == keyword_lower
 
-def matches_keyword(text, keyword):
-    if not keyword:
+
+class ExactQuery:
+    """
+    精确查找的关键词表
+    把关键词规范化（去空白、小写）后建立 关键词 -> 原关键词 的哈希表，
+    每个文件只需计算一次文件名主体并查表一次
+    """
+
+    def __init__(self, keywords):
+        # 去重并保持原有顺序
+        self.keywords = list(dict.fromkeys(keywords))
+        self._index = {}
+        self._always = []
+        for i, keyword in enumerate(self.keywords):
+            normalized = keyword.strip().lower()
+            if normalized:
+                self._index.setdefault(normalized, []).append(i)
+            else:
+                # 与 exact_match_filename 一致：空关键词匹配任何文件
+                self._always.append(i)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    @property
+    def stems(self):
+        """可能命中的小写文件名主体；含空关键词（匹配任何文件）时返回 None"""
+        if self._always:
+            return None
+        return list(self._index)
+
+    def match(self, filename):
+        """返回与文件名主体完全相同的关键词列表"""
+        hits = self._index.get(filename_stem(filename).lower())
+        if not self._always:
+            if hits is None:
+                return []
+            return [self.keywords[i] for i in hits]
+        return [self.keywords[i] for i in sorted((hits or []) + self._always)]
+
+class KeywordMatcher:
+    """
+    预编译的单个关键词查询
+    引号短语、+/- 前缀、| 或关系和通配符在编译时解析一次，匹配时只需对小写文本做子串判断
+    """
+
+    __slots__ = ('keyword', 'phrases', 'must_include', 'must_exclude', 'any_include')
+
+    def __init__(self, keyword, phrases, must_include, must_exclude, any_include):
+        self.keyword = keyword
+        self.phrases = phrases
+        self.must_include = must_include
+        self.must_exclude = must_exclude
+        # any_include 中每项为 (词, 正则)，普通词的正则为 None
+        self.any_include = any_include
+
+    def matches(self, text_lower):
+        """判断已转换为小写的文本是否满足该关键词"""
+        for phrase in self.phrases:
+            if phrase not in text_lower:
+                return False
+
+        for term in self.must_include:
+            if term not in text_lower:
+                return False
+
+        for term in self.must_exclude:
+            if term in text_lower:
+                return False
+
+        if self.any_include:
+            for term, regex in self.any_include:
+                if regex is None:
+                    if term in text_lower:
+                        return True
+                elif regex is _INVALID_PATTERN:
+                    # 与旧实现一致：无效的通配符模式在匹配时抛出 re.error
+                    if re.search(term.replace('*', '.*'), text_lower):
+                        return True
+                elif regex.search(text_lower):
+                    return True
+            return False
+
         return True
 
-    exact_matches = re.findall(r'"([^"]*)"', keyword)
-    for exact in exact_matches:
-        if exact.lower() not in text.lower():
+    def is_decided(self, text_lower):
+        """
+        文本继续增长时匹配结果是否已不会改变
+
+        包含类条件一旦满足就一直满足，排除词一旦出现就一直不满足；
+        含排除词的关键词在命中前无法提前确定；含无效通配符的关键词匹配时必然报错，
+        视为已确定，由调用方在完整匹配时只让该关键词失败。
+        """
+        for term in self.must_exclude:
+            if term in text_lower:
+                return True
+        if self.must_exclude:
             return False
+        try:
+            return self.matches(text_lower)
+        except re.error:
+            return True
+
+
+# 通配符模式无法编译时的占位标记
+_INVALID_PATTERN = object()
+
+
+def _compile_wildcard(term):
+    """编译通配符词，无法编译时返回占位标记"""
+    try:
+        return re.compile(term.replace('*', '.*'))
+    except re.error:
+        return _INVALID_PATTERN
+
+
+@lru_cache(maxsize=4096)
+def compile_keyword(keyword):
+    """将关键词解析为 KeywordMatcher，结果会被缓存"""
+    original = keyword
+    phrases = []
+    for exact in re.findall(r'"([^"]*)"', keyword):
+        phrases.append(exact.lower())
         keyword = keyword.replace(f'"{exact}"', '')
 
-    tokens = re.split(r'[\s\n]+', keyword.strip())
     must_include = []
     must_exclude = []
     any_include = []
 
-    for token in tokens:
+    for token in re.split(r'[\s\n]+', keyword.strip()):
         if not token:
             continue
         if token.startswith('+'):
@@ -39,112 +173,939 @@ def matches_keyword(text, keyword):
         elif token.startswith('-'):
             must_exclude.append(token[1:].lower())
         elif '|' in token:
-            any_include.extend([t.lower() for t in token.split('|')])
+            any_include.extend(t.lower() for t in token.split('|'))
         else:
             any_include.append(token.lower())
 
-    for term in must_include:
-        if term not in text.lower():
-            return False
+    return KeywordMatcher(
+        original,
+        tuple(phrases),
+        tuple(must_include),
+        tuple(must_exclude),
+        tuple((term, _compile_wildcard(term) if '*' in term else None) for term in any_include),
+    )
+
+
+# 纯包含型关键词数量达到该值时，文件名匹配改用 Aho-Corasick 自动机
+AHO_CORASICK_THRESHOLD = 16
+
+
+def _is_plain(matcher):
+    """关键词是否只由普通包含词组成（无引号、+/- 前缀和通配符）"""
+    if matcher.phrases or matcher.must_include or matcher.must_exclude:
+        return False
+    if not matcher.any_include:
+        return False
+    return all(term and regex is None for term, regex in matcher.any_include)
+
+
+class CompiledQuery:
+    """
+    一次搜索的全部关键词，在搜索开始时编译一次
+
+    关键词很多时，把只含普通包含词的关键词合并进一个 Aho-Corasick 自动机，
+    单次扫描即可得到它们的命中情况；含 +/-、通配符或引号的关键词仍逐个判断。
+    """
+
+    def __init__(self, keywords):
+        # 去重并保持原有顺序
+        self.keywords = list(dict.fromkeys(keywords))
+        self.matchers = [compile_keyword(kw) for kw in self.keywords]
+        self._by_keyword = dict(zip(self.keywords, self.matchers))
+
+        self._automaton = None
+        self._term_keywords = []
+        self._complex = []
+
+        plain = [i for i, matcher in enumerate(self.matchers) if _is_plain(matcher)]
+        if len(plain) >= AHO_CORASICK_THRESHOLD:
+            term_ids = {}
+            for i in plain:
+                for term, _ in self.matchers[i].any_include:
+                    term_id = term_ids.setdefault(term, len(term_ids))
+                    if term_id == len(self._term_keywords):
+                        self._term_keywords.append([])
+                    self._term_keywords[term_id].append(i)
+            self._automaton = AhoCorasick(list(term_ids))
+            plain_set = set(plain)
+            self._complex = [i for i in range(len(self.matchers)) if i not in plain_set]
+
+    def __len__(self):
+        return len(self.keywords)
+
+    @property
+    def uses_automaton(self):
+        """是否启用了 Aho-Corasick 自动机"""
+        return self._automaton is not None
+
+    def matchers_for(self, keywords=None):
+        """返回指定关键词（默认全部）的 KeywordMatcher 列表"""
+        if keywords is None:
+            return list(self.matchers)
+        return [self._by_keyword[kw] for kw in keywords]
+
+    def match(self, text):
+        """返回命中文本的关键词列表，文本只转换一次小写"""
+        return self.match_lower(text.lower())
+
+    def match_lower(self, text_lower, keywords=None):
+        """
+        对已转换为小写的文本进行匹配
+
+        Args:
+            text_lower: 小写文本
+            keywords: 可选，只检查这些关键词
+        """
+        if keywords is not None:
+            return [kw for kw in keywords if self._by_keyword[kw].matches(text_lower)]
+
+        if self._automaton is None:
+            return [matcher.keyword for matcher in self.matchers if matcher.matches(text_lower)]
+
+        hits = set()
+        for term_id in self._automaton.find(text_lower):
+            hits.update(self._term_keywords[term_id])
+        for i in self._complex:
+            if self.matchers[i].matches(text_lower):
+                hits.add(i)
+        return [self.keywords[i] for i in sorted(hits)]
+
+
+def matches_keyword(text, keyword):
+    """判断文本是否满足关键词（兼容接口，内部使用预编译的查询）"""
+    if not keyword:
+        return True
+    return compile_keyword(keyword).matches(text.lower())
+
+
+# 字节级扫描时关键词编码成的字节形式
+BYTE_ENCODINGS = ('utf-8', 'gbk')
+# UTF-8 每个字符最多 4 个字节。字节模式的扫描深度仍按字符计（见 _utf8_prefix），
+# 只在需要预先确定读取范围时（如 mmap 映射长度）以此为上限
+MAX_CHAR_BYTES = 4
 
-    for term in must_exclude:
-        if term in text.lower():
-            return False
 
-    if any_include:
-        found = False
-        for term in any_include:
-            if '*' in term:
-                # Simple wildcard matching
-                if re.search(term.replace('*', '.*'), text.lower()):
-                    found = True
+def _byte_forms(term, encodings):
+    """
+    词在各编码下的字节形式（去重）
+
+    扫描时文本块会做 bytes.lower()（只影响 ASCII 字节），GBK 双字节字符的第二个字节
+    可能落在 A-Z 范围内，因此字节形式也做同样的转换，两边保持一致。
+    """
+    forms = []
+    for encoding in encodings:
+        try:
+            form = term.encode(encoding).lower()
+        except UnicodeEncodeError:
+            continue
+        if form not in forms:
+            forms.append(form)
+    return tuple(forms)
+
+
+def _byte_pattern(pattern, encoding):
+    """把通配符转换后的正则编码为字节正则：ASCII 部分保持正则语义，其余字符按字面转义"""
+    parts = []
+    for char in pattern:
+        if ord(char) < 128:
+            parts.append(char.encode('ascii'))
+        else:
+            parts.append(re.escape(char.encode(encoding).lower()))
+    return b''.join(parts)
+
+
+def is_byte_searchable(matcher):
+    """
+    关键词能否直接在字节上匹配
+
+    bytes.lower() 只转换 ASCII 字母，含非 ASCII 且区分大小写的字母（如 É、Ж）时
+    需要解码后再匹配；中日韩文字没有大小写，可以按字节匹配。
+    """
+    terms = matcher.phrases + matcher.must_include + matcher.must_exclude
+    terms += tuple(term for term, _ in matcher.any_include)
+    return all(char.isascii() or char.lower() == char.upper()
+               for term in terms for char in term)
+
+
+class _StreamState:
+    """单个关键词在分块匹配中的状态"""
+
+    __slots__ = ('matcher', 'required', 'excludes', 'any_terms', 'any_found',
+                 'excluded', 'error')
+
+    def __init__(self, matcher, forms, regexes):
+        self.matcher = matcher
+        # 尚未出现的引号短语和 + 词：{词: 形式}
+        self.required = {term: forms(term)
+                         for term in matcher.phrases + matcher.must_include}
+        self.excludes = [forms(term) for term in matcher.must_exclude]
+        # [(词, 形式, 正则)]，正则为 None 表示普通词，为 _INVALID_PATTERN 表示无效的通配符
+        self.any_terms = [(term, forms(term), regexes(regex))
+                          for term, regex in matcher.any_include]
+        self.any_found = False
+        self.excluded = False
+        self.error = None
+
+    @property
+    def satisfied(self):
+        return not self.required and (not self.any_terms or self.any_found)
+
+    @property
+    def decided(self):
+        if self.excluded or self.error is not None:
+            return True
+        return not self.excludes and self.satisfied
+
+    def feed(self, window):
+        # 用 find 而不是 in：window 也可能是 mmap，其 in 只支持单个字节
+        if self.required:
+            self.required = {term: forms for term, forms in self.required.items()
+                             if not any(window.find(form) != -1 for form in forms)}
+        for forms in self.excludes:
+            if any(window.find(form) != -1 for form in forms):
+                self.excluded = True
+                return
+        if self.any_terms and not self.any_found:
+            for term, forms, regexes in self.any_terms:
+                if regexes is None:
+                    found = any(window.find(form) != -1 for form in forms)
+                elif regexes is _INVALID_PATTERN:
+                    # 与 KeywordMatcher.matches 一致：匹配到这个词时才报告错误
+                    try:
+                        re.compile(term.replace('*', '.*'))
+                    except re.error as e:
+                        self.error = e
+                    return
+                else:
+                    found = any(regex.search(window) for regex in regexes)
+                if found:
+                    self.any_found = True
                     break
-            elif term in text.lower():
-                found = True
-                break
-        if not found:
-            return False
 
-    return True
 
-def search_content(file_path, keyword):
-    try:
-        file_path = Path(file_path)
-        ext = file_path.suffix.lower()
+class StreamMatcher:
+    """
+    对分块到达的小写文本增量匹配一组关键词，内存占用与文件大小无关
+
+    相邻块之间保留 (最长词长度 - 1) 个字符（或字节）的重叠，跨越块边界的词和短语同样能找到；
+    通配符只在单个块（含重叠部分）内匹配。
+
+    encodings 为 None 时匹配 str；否则匹配 bytes，每个词在搜索开始时按这些编码
+    各转换一次（如 UTF-8 和 GBK），扫描时无需解码。
+    """
 
-        if ext in ['.txt', '.py', '.java', '.cpp', '.h', '.html', '.css', '.js', '.csv', '.ini', '.log']:
-            return search_text_file(file_path, keyword)
-        elif ext == '.pdf':
-            return search_pdf(file_path, keyword)
-        elif ext in ['.docx']:
-            return search_docx(file_path, keyword)
-        elif ext in ['.xlsx']:
-            return search_excel(file_path, keyword)
+    def __init__(self, matchers, encodings=None):
+        self.encodings = encodings
+        if encodings is None:
+            self._states = [_StreamState(matcher, lambda term: (term,), self._text_regexes)
+                            for matcher in matchers]
+            self._tail = ''
         else:
+            self._states = [_StreamState(matcher, lambda term: _byte_forms(term, encodings),
+                                         self._byte_regexes)
+                            for matcher in matchers]
+            self._tail = b''
+
+        lengths = [len(form) for state in self._states
+                   for forms in list(state.required.values()) + state.excludes
+                   + [forms for _, forms, _ in state.any_terms]
+                   for form in forms]
+        self.overlap = max(lengths, default=1) - 1
+        # 已读取的长度（字节模式下为字节数）
+        self.chars = 0
+
+    @staticmethod
+    def _text_regexes(regex):
+        if regex is None or regex is _INVALID_PATTERN:
+            return regex
+        return (regex,)
+
+    def _byte_regexes(self, regex):
+        """通配符词的字节正则（每种编码一个）"""
+        if regex is None or regex is _INVALID_PATTERN:
+            return regex
+        regexes = []
+        for encoding in self.encodings:
+            try:
+                regexes.append(re.compile(_byte_pattern(regex.pattern, encoding)))
+            except (UnicodeEncodeError, re.error):
+                continue
+        return tuple(regexes)
+
+    @property
+    def decided(self):
+        """全部关键词的结果是否都已确定"""
+        return all(state.decided for state in self._states)
+
+    @property
+    def case_free(self):
+        """字节模式下所有词都不含 ASCII 字母（如纯中文、数字），此时无需先把文本转为小写"""
+        if self.encodings is None:
             return False
-    except Exception as e:
-        print(f"内容搜索失败: {file_path} - {str(e)}")
-        return False
+        forms = [form for state in self._states
+                 for forms in list(state.required.values()) + state.excludes
+                 + [forms for _, forms, _ in state.any_terms]
+                 for form in forms]
+        return all(form.upper() == form for form in forms)
+
+    def feed(self, chunk_lower):
+        """匹配下一块小写文本（str 或 bytes，与 encodings 对应）"""
+        self.chars += len(chunk_lower)
+        window = self._tail + chunk_lower if self._tail else chunk_lower
+        for state in self._states:
+            if not state.decided:
+                state.feed(window)
+        self._tail = window[-self.overlap:] if self.overlap else window[:0]
+
+    def finish(self):
+        """文件结束：一块都没有读到（空文件）时用空文本匹配一次，使空词（如 * 或 |）照常命中"""
+        if not self.chars:
+            self.feed('' if self.encodings is None else b'')
+
+    @property
+    def errors(self):
+        """[(关键词, 异常), ...]：无法匹配的关键词（如无效的通配符），视为未命中"""
+        return [(state.matcher.keyword, state.error) for state in self._states
+                if state.error is not None]
+
+    def result(self):
+        """命中的关键词列表（按传入顺序）"""
+        return [state.matcher.keyword for state in self._states
+                if state.satisfied and not state.excluded and state.error is None]
+
+
+# 纯文本类文件扩展名
+TEXT_EXTENSIONS = ['.txt', '.py', '.java', '.cpp', '.h', '.html', '.css', '.js', '.csv', '.ini', '.log']
+
+# 格式提取器注册表，内置格式在本模块末尾注册
+EXTRACTORS = ExtractorRegistry()
+
+
+# 默认的内容扫描深度：每个文件最多检查的字符数（0 表示整个文件）
+DOCUMENT_CHAR_LIMIT = 3000
+
+# 分块扫描文本文件时每块的字符数
+SCAN_BLOCK_CHARS = 1024 * 1024
+# 超过该大小的文本文件用 mmap 扫描，0 表示不使用 mmap
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+
+def search_content(file_path, keyword, cache=None, all_text=False):
+    """
+    在文件内容中匹配关键词
+
+    与搜索线程使用同一个 ContentSearcher 分发（扩展名、文件头、缓存和流式提取），两者结果一致。
+
+    Args:
+        file_path: 文件路径
+        keyword: 关键词
+        cache: 可选的 TextCache，文档未变化时直接使用缓存的提取文本
+        all_text: 扩展名未注册的文件也嗅探文件头：是文本就按文本文件搜索，
+                  符合某种文档格式特征的交给对应的提取器
+    """
+    # content_search 依赖本模块，在调用时导入
+    from .content_search import ContentSearcher
+    searcher = ContentSearcher(CompiledQuery([keyword]), cache, all_text=all_text)
+    return bool(searcher.match(file_path))
+
+def extract_text(file_path, pdf_max_pages=0, limit=DOCUMENT_CHAR_LIMIT, keywords=()):
+    """
+    按扩展名选择注册的提取器提取文件文本，不支持的格式或提取失败时返回 None
+
+    Args:
+        file_path: 文件路径
+        pdf_max_pages: PDF 最多读取的页数，0 表示不限制
+        limit: 最多提取的字符数，0 表示不限制
+        keywords: 可选的关键词，流式提取器在全部关键词结果确定后即停止读取
+            （传字符串而不是 KeywordMatcher，便于在子进程中使用）；提取的文本不完整，不能写入缓存
+    """
+    file_path = Path(file_path)
+    extractor = EXTRACTORS.for_extension(file_path.suffix)
+    if extractor is None:
+        return None
+    matchers = [compile_keyword(keyword) for keyword in keywords]
+    return extractor.extract(file_path, matchers, limit=limit, max_pages=pdf_max_pages)
 
 def search_text_file(file_path, keyword):
+    stream = scan_text_file(file_path, [compile_keyword(keyword)] if keyword else [],
+                            skip_binary=True)
+    if stream is None:
+        return False
+    if not keyword:
+        return extract_text_file(Path(file_path)) is not None
+    return bool(stream.result())
+
+def extract_text_file(file_path, limit=DOCUMENT_CHAR_LIMIT):
+    # 依次尝试严格解码，latin-1 可以解码任何字节，保证有结果
     encodings = ['utf-8', 'gbk', 'latin-1']
     for encoding in encodings:
         try:
-            with file_path.open('r', encoding=encoding, errors='ignore') as f:
-                content = f.read(3000)
-                return matches_keyword(content, keyword)
+            with file_path.open('r', encoding=encoding) as f:
+                return f.read(limit or -1)
         except UnicodeDecodeError:
             continue
-    return False
+    return None
+
+def scan_text_file(file_path, matchers, limit=DOCUMENT_CHAR_LIMIT, block=SCAN_BLOCK_CHARS,
+                   mmap_threshold=MMAP_THRESHOLD, skip_binary=False):
+    """
+    分块读取文本文件并用 StreamMatcher 匹配，全部关键词确定后提前结束
+
+    关键词都能按字节匹配时（见 is_byte_searchable）直接扫描原始字节，同时查找 UTF-8 和 GBK
+    两种编码形式，不做解码；否则按 UTF-8 解码后匹配。字节模式下不小于 mmap_threshold 的
+    文件通过 mmap 扫描（见 _scan_mapped）。
+
+    Args:
+        file_path: 文件路径
+        matchers: KeywordMatcher 列表
+        limit: 最多检查的字符数，两种模式下都按 UTF-8 字符计（见 _utf8_prefix），0 表示读取整个文件
+        block: 每块的长度
+        mmap_threshold: 使用 mmap 的文件大小下限（字节），0 表示不使用 mmap
+        skip_binary: 先嗅探文件头（见 file_sniffer），二进制文件不扫描；读到的文件头直接作为第一块匹配
+
+    Returns:
+        StreamMatcher；skip_binary 为 True 且文件为二进制时返回 None
+    """
+    with open(file_path, 'rb') as f:
+        head = b''
+        if skip_binary:
+            head = f.read(SNIFF_BYTES)
+            if sniff_bytes(head, known_text=True) != KIND_TEXT:
+                return None
+
+        if not all(is_byte_searchable(matcher) for matcher in matchers):
+            stream = StreamMatcher(matchers)
+            f.seek(0)
+            text = io.TextIOWrapper(f, encoding='utf-8', errors='ignore')
+            _scan_blocks(text, stream, limit, block)
+            text.detach()
+            stream.finish()
+            return stream
+
+        stream = StreamMatcher(matchers, BYTE_ENCODINGS)
+        if mmap_threshold:
+            size = os.fstat(f.fileno()).st_size
+            if size >= mmap_threshold and _scan_mapped(f, stream, size, limit, block):
+                return stream
+        _scan_byte_blocks(f, stream, limit, block, head)
+        stream.finish()
+    return stream
+
+
+def _scan_blocks(f, stream, limit, block):
+    """从文件当前位置逐块读取并匹配，直到结果确定、读满 limit 或文件结束"""
+    while not stream.decided:
+        size = block if not limit else min(block, limit - stream.chars)
+        if size <= 0:
+            break
+        chunk = f.read(size)
+        if not chunk:
+            break
+        stream.feed(chunk.lower())
+
+
+# UTF-8 多字节字符的后续字节（10xxxxxx），不单独计为字符
+_UTF8_CONTINUATION = bytes(range(0x80, 0xc0))
+
+
+def _utf8_chars(data):
+    """按 UTF-8 计算 data 中的字符数：除后续字节外每个字节开始一个字符，与解码时的计数一致"""
+    return len(data.translate(None, _UTF8_CONTINUATION))
+
+
+def _utf8_prefix(data, chars):
+    """
+    data 开头 chars 个字符（按 UTF-8 计数）占用的字节数，含最后一个字符的全部后续字节
+
+    字节模式据此按字符截断扫描范围，与按 UTF-8 解码后匹配时的扫描深度相同。
+    data 可以是 bytes 或 mmap，每次只取出尚需的字节数。
+    """
+    end = 0
+    while chars > 0 and end < len(data):
+        piece = data[end:end + chars]
+        chars -= _utf8_chars(piece)
+        end += len(piece)
+    while end < len(data) and 0x80 <= data[end] < 0xc0:
+        end += 1
+    return end
+
+
+def _scan_byte_blocks(f, stream, limit, block, head=b''):
+    """
+    字节模式的 _scan_blocks：limit 按 UTF-8 字符计，读满时在字符边界截断
+
+    head 为已读取的文件开头，作为第一块匹配。
+    """
+    chunk = head or f.read(block)
+    while chunk and not stream.decided:
+        if limit:
+            end = _utf8_prefix(chunk, limit)
+            limit -= _utf8_chars(chunk[:end])
+            if not limit and end == len(chunk):
+                # 最后一个字符的后续字节可能在下一块开头
+                rest = f.read(MAX_CHAR_BYTES - 1)
+                chunk += rest[:_utf8_prefix(rest, 0)]
+                end = len(chunk)
+            stream.feed(chunk[:end].lower())
+            if not limit:
+                break
+        else:
+            stream.feed(chunk.lower())
+        chunk = f.read(block)
+
+
+def _scan_mapped(f, stream, size, limit, block):
+    """
+    通过 mmap 扫描已打开的二进制文件，由操作系统按需调入页面
+
+    所有词都不含 ASCII 字母时，把整个映射作为一个窗口直接查找，不复制文件内容；
+    否则逐块取出映射内容转为小写后匹配。无法映射时（如特殊文件）返回 False，由调用方改用普通读取。
+    limit 按 UTF-8 字符计，只映射最多 limit * MAX_CHAR_BYTES 个字节并在第 limit 个字符处截断。
+    """
+    length = min(size, limit * MAX_CHAR_BYTES) if limit else size
+    try:
+        mapped = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return False
+    with mapped:
+        if limit:
+            length = _utf8_prefix(mapped, limit)
+        if stream.case_free:
+            stream.feed(mapped if length == len(mapped) else mapped[:length])
+        else:
+            for start in range(0, length, block):
+                if stream.decided:
+                    break
+                stream.feed(mapped[start:min(start + block, length)].lower())
+    return True
+
 
 def search_pdf(file_path, keyword):
+    if not keyword:
+        return extract_pdf_text(file_path) is not None
+    text = extract_pdf_text(file_path, [compile_keyword(keyword)])
+    return text is not None and matches_keyword(text, keyword)
+
+def _import_pymupdf():
+    """导入 PyMuPDF（新版本的模块名为 pymupdf，旧版本为 fitz）"""
     try:
-        from fitz import fitz  # 使用PyMuPDF
-        doc = fitz.open(str(file_path))
-        text = ""
-        for page in doc:
-            text += page.get_text()
-            if len(text) > 3000:
-                break
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf
+    return pymupdf
+
+def iter_pdf_text(file_path, max_pages=0):
+    """
+    逐页产出 PDF 的文本，调用方停止迭代时不再解析后面的页面
+
+    Args:
+        file_path: 文件路径
+        max_pages: 最多读取的页数，0 表示不限制
+    """
+    pymupdf = _import_pymupdf()
+    doc = pymupdf.open(str(file_path))
+    try:
+        pages = doc.page_count if not max_pages else min(max_pages, doc.page_count)
+        for number in range(pages):
+            yield doc.load_page(number).get_text()
+    finally:
         doc.close()
-        return matches_keyword(text, keyword)
+
+def extract_pdf_text(file_path, matchers=(), max_pages=0, limit=DOCUMENT_CHAR_LIMIT):
+    try:
+        return read_text_until(iter_pdf_text(file_path, max_pages), matchers, limit)
     except ImportError:
-        return search_text_file(file_path, keyword)
+        return extract_text_file(file_path)
+    except MemoryError:
+        raise
     except Exception:
-        return False
+        return None
 
 def search_docx(file_path, keyword):
+    if not keyword:
+        return extract_docx_text(file_path) is not None
     try:
-        from docx import Document
-        doc = Document(str(file_path))
-        text = ""
-        for para in doc.paragraphs:
-            text += para.text + " "
-            if len(text) > 3000:
-                break
-        return matches_keyword(text, keyword)
-    except ImportError:
-        return search_text_file(file_path, keyword)
+        text = read_docx_until(file_path, [compile_keyword(keyword)])
+    except MemoryError:
+        raise
     except Exception:
         return False
+    return matches_keyword(text, keyword)
+
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_TEXT = _W_NS + 't'
+_W_PARAGRAPH = _W_NS + 'p'
+# 与 python-docx 的 paragraph.text 一致：制表符为 \t，换行为 \n
+_W_BREAKS = {_W_NS + 'tab': '\t', _W_NS + 'br': '\n', _W_NS + 'cr': '\n'}
+_DOCX_EXTRA_PARTS = re.compile(r'word/(header|footer)\d*\.xml$')
+
+
+def iter_docx_text(file_path, include_headers=True):
+    """
+    逐段产出 DOCX 的文本，不构建完整的文档对象
+
+    直接用 iterparse 流式解析 word/document.xml（表格中的段落按文档顺序一并产出），
+    之后是页眉和页脚；调用方停止迭代时不再读取剩余内容。
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        parts = ['word/document.xml']
+        if include_headers:
+            extra = [m for m in map(_DOCX_EXTRA_PARTS.match, archive.namelist()) if m]
+            parts += [m.string for m in sorted(extra, key=lambda m: (m.group(1) == 'footer', m.string))]
+        for part in parts:
+            with archive.open(part) as stream:
+                pieces = []
+                for _, elem in ElementTree.iterparse(stream):
+                    tag = elem.tag
+                    if tag == _W_TEXT:
+                        if elem.text:
+                            pieces.append(elem.text)
+                    elif tag in _W_BREAKS:
+                        pieces.append(_W_BREAKS[tag])
+                    elif tag == _W_PARAGRAPH:
+                        # 文本框中的段落嵌套在外层段落里，先于外层段落结束，各自单独产出
+                        yield ''.join(pieces)
+                        pieces = []
+                        elem.clear()
+
+
+def read_text_until(chunks, matchers=(), limit=DOCUMENT_CHAR_LIMIT):
+    """
+    从逐段产出的文本中读取，直到达到字符上限或全部 matchers 的结果已确定
+
+    Args:
+        chunks: 文本片段的迭代器（如 iter_docx_text 的结果），片段之间以空格连接
+        matchers: KeywordMatcher 列表；为空时读到字符上限为止
+        limit: 最多读取的字符数，0 表示读完全部片段
+    """
+    pieces = []
+    length = 0
+    checked = 0
+    fed = 0
+    # 只把新读到的片段（连同 StreamMatcher 保留的重叠部分）交给关键词匹配，耗时与文本长度成正比
+    stream = StreamMatcher(matchers) if matchers else None
+    chunks = iter(chunks)
+    try:
+        for chunk in chunks:
+            pieces.append(chunk)
+            pieces.append(' ')
+            length += len(chunk) + 1
+            if limit and length > limit:
+                break
+            # 每增加约 500 个字符判断一次，避免每段都单独匹配一次
+            if stream is not None and length - checked >= 500:
+                stream.feed(''.join(pieces[fed:]).lower())
+                checked = length
+                fed = len(pieces)
+                if stream.decided:
+                    break
+    finally:
+        # 提前结束时立即关闭压缩包
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+    return ''.join(pieces)
+
+
+def read_docx_until(file_path, matchers=(), limit=DOCUMENT_CHAR_LIMIT):
+    """读取 DOCX 文本，直到达到字符上限或全部 matchers 的结果已确定"""
+    return read_text_until(iter_docx_text(file_path), matchers, limit)
+
+
+def extract_docx_text(file_path, matchers=(), limit=DOCUMENT_CHAR_LIMIT):
+    try:
+        return read_docx_until(file_path, matchers, limit)
+    except MemoryError:
+        raise
+    except Exception:
+        return None
 
 def search_excel(file_path, keyword):
+    if not keyword:
+        return extract_excel_text(file_path) is not None
+    text = extract_excel_text(file_path, [compile_keyword(keyword)])
+    return text is not None and matches_keyword(text, keyword)
+
+_X_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_X_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_X_SI = _X_NS + 'si'
+_X_TEXT = _X_NS + 't'
+_X_RUN = _X_NS + 'r'
+_X_ROW = _X_NS + 'row'
+_X_CELL = _X_NS + 'c'
+_X_VALUE = _X_NS + 'v'
+_X_INLINE = _X_NS + 'is'
+
+
+def _xlsx_sheet_parts(archive):
+    """按工作簿中的顺序返回工作表的压缩包内路径"""
+    names = set(archive.namelist())
+    try:
+        with archive.open('xl/_rels/workbook.xml.rels') as stream:
+            targets = {rel.get('Id'): rel.get('Target')
+                       for rel in ElementTree.parse(stream).getroot()}
+        with archive.open('xl/workbook.xml') as stream:
+            sheets = ElementTree.parse(stream).getroot().find(_X_NS + 'sheets')
+        parts = []
+        for sheet in sheets:
+            target = targets[sheet.get(_X_REL_NS + 'id')]
+            part = target.lstrip('/') if target.startswith('/') else 'xl/' + target
+            if part in names:
+                parts.append(part)
+        return parts
+    except (KeyError, TypeError, ElementTree.ParseError):
+        numbered = [n for n in names if re.match(r'xl/worksheets/sheet\d+\.xml$', n)]
+        return sorted(numbered, key=lambda n: int(re.search(r'\d+', n[14:]).group()))
+
+
+def _xlsx_string(elem):
+    """共享字符串或内联字符串的文本：富文本各段拼接，跳过注音（rPh）"""
+    pieces = []
+    for child in elem:
+        if child.tag == _X_TEXT:
+            text = child.text
+        elif child.tag == _X_RUN:
+            text = child.findtext(_X_TEXT)
+        else:
+            continue
+        if text:
+            pieces.append(text)
+    return ''.join(pieces)
+
+
+class _SharedStrings:
+    """
+    按需读取的 xl/sharedStrings.xml
+
+    单元格引用第 n 项时才解析到第 n 项为止；Excel 基本按首次出现的顺序写入共享字符串，
+    因此在字数上限处提前结束时，后面的条目不会被解析。
+    """
+
+    def __init__(self, archive):
+        self._items = []
+        self._pending = self._parse(archive)
+
+    @staticmethod
+    def _parse(archive):
+        if 'xl/sharedStrings.xml' not in archive.namelist():
+            return
+        with archive.open('xl/sharedStrings.xml') as stream:
+            root = None
+            for event, elem in ElementTree.iterparse(stream, events=('start', 'end')):
+                if root is None:
+                    root = elem
+                elif event == 'end' and elem.tag == _X_SI:
+                    text = _xlsx_string(elem)
+                    # 已解析的条目只保留文本
+                    root.clear()
+                    yield text
+
+    def get(self, index):
+        """第 index 项的文本，不存在时返回 None"""
+        while len(self._items) <= index:
+            text = next(self._pending, None)
+            if text is None:
+                return None
+            self._items.append(text)
+        return self._items[index]
+
+    def close(self):
+        """关闭尚未读完的 sharedStrings.xml"""
+        self._pending.close()
+
+
+# 内置数字格式中的日期格式（14-22）和时长格式（45-47），与 openpyxl 的内置格式表一致
+_XLSX_DATE_FORMAT_IDS = frozenset(range(14, 23)) | {45, 46, 47}
+_XLSX_TIMEDELTA_FORMAT_IDS = frozenset({46})
+# 判断自定义格式是否为日期时忽略引号中的文字和 [Red]、[$-409] 等方括号内容
+_XLSX_FORMAT_LITERAL = re.compile(r'".*?"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+_XLSX_DATE_CODE = re.compile(r'(?<![_\\])[dmhysDMHYS]')
+_XLSX_TIMEDELTA_CODE = re.compile(
+    r'\[hh?\](:mm(:ss(\.0*)?)?)?|\[mm?\](:ss(\.0*)?)?|\[ss?\](\.0*)?', re.I)
+_XLSX_EPOCH = datetime.datetime(1899, 12, 30)
+_XLSX_EPOCH_1904 = datetime.datetime(1904, 1, 1)
+
+
+def _xlsx_date_styles(archive):
+    """
+    从 xl/styles.xml 读取使用日期格式的单元格样式编号
+
+    Returns:
+        (日期样式编号集合, 其中时长格式的编号集合)
+    """
+    try:
+        with archive.open('xl/styles.xml') as stream:
+            root = ElementTree.parse(stream).getroot()
+    except KeyError:
+        return frozenset(), frozenset()
+
+    custom = {}
+    num_fmts = root.find(_X_NS + 'numFmts')
+    for fmt in num_fmts if num_fmts is not None else ():
+        code = fmt.get('formatCode', '').split(';')[0]
+        custom[int(fmt.get('numFmtId', -1))] = code
+
+    dates, timedeltas = set(), set()
+    cell_xfs = root.find(_X_NS + 'cellXfs')
+    for style, xf in enumerate(cell_xfs if cell_xfs is not None else ()):
+        fmt_id = int(xf.get('numFmtId', 0))
+        if fmt_id in custom:
+            code = custom[fmt_id]
+            if _XLSX_DATE_CODE.search(_XLSX_FORMAT_LITERAL.sub('', code)):
+                dates.add(style)
+                if _XLSX_TIMEDELTA_CODE.search(code):
+                    timedeltas.add(style)
+        elif fmt_id in _XLSX_DATE_FORMAT_IDS:
+            dates.add(style)
+            if fmt_id in _XLSX_TIMEDELTA_FORMAT_IDS:
+                timedeltas.add(style)
+    return dates, timedeltas
+
+
+def _xlsx_epoch(archive):
+    """工作簿的日期起点：默认 1900 日期系统，workbookPr date1904 时为 1904 日期系统"""
     try:
-        from openpyxl import load_workbook
-        wb = load_workbook(str(file_path), read_only=True)
-        text = ""
-        for sheet in wb:
-            for row in sheet.iter_rows(values_only=True):
-                for cell in row:
-                    if cell:
-                        text += str(cell) + " "
-                if len(text) > 3000:
+        with archive.open('xl/workbook.xml') as stream:
+            for _, elem in ElementTree.iterparse(stream):
+                if elem.tag == _X_NS + 'workbookPr':
+                    if elem.get('date1904') in ('1', 'true'):
+                        return _XLSX_EPOCH_1904
                     break
-            if len(text) > 3000:
-                break
+    except (KeyError, ElementTree.ParseError):
+        pass
+    return _XLSX_EPOCH
+
+
+def _format_date(value, epoch, timedelta):
+    """按 openpyxl 的规则把日期序列号转换为 datetime、time 或 timedelta 的字符串"""
+    try:
+        number = float(value)
+        if timedelta:
+            return str(datetime.timedelta(days=number))
+        day, fraction = divmod(number, 1)
+        diff = datetime.timedelta(milliseconds=round(fraction * 86400 * 1000))
+        if 0 <= number < 1 and diff.days == 0:
+            minutes, seconds = divmod(diff.seconds, 60)
+            hours, minutes = divmod(minutes, 60)
+            return str(datetime.time(hours, minutes, seconds, diff.microseconds))
+        if 0 < number < 60 and epoch is _XLSX_EPOCH:
+            # 1900 日期系统把不存在的 1900-02-29 计为第 60 天
+            day += 1
+        return str(epoch + datetime.timedelta(days=day) + diff)
+    except (ValueError, OverflowError):
+        return value
+
+
+def iter_xlsx_text(file_path):
+    """
+    逐项产出 XLSX 的文本，不加载 openpyxl
+
+    按工作表顺序逐个单元格读取，顺序与 openpyxl 路径一致：共享字符串在引用它的单元格处产出，
+    其余为内联字符串、数字、公式结果和 TRUE。空值、0 和 FALSE 不产出；
+    日期格式的单元格按 styles.xml 中的数字格式转换为日期文字（如 2024-01-15 00:00:00）。
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        shared = _SharedStrings(archive)
+        date_styles, timedelta_styles = _xlsx_date_styles(archive)
+        epoch = _xlsx_epoch(archive) if date_styles else _XLSX_EPOCH
+
+        try:
+            for part in _xlsx_sheet_parts(archive):
+                with archive.open(part) as stream:
+                    for event, elem in ElementTree.iterparse(stream, events=('end',)):
+                        if elem.tag == _X_CELL:
+                            cell_type = elem.get('t')
+                            if cell_type == 's':
+                                index = elem.findtext(_X_VALUE)
+                                text = shared.get(int(index)) if index and index.isdigit() else None
+                                if text:
+                                    yield text
+                            elif cell_type == 'inlineStr':
+                                inline = elem.find(_X_INLINE)
+                                text = _xlsx_string(inline) if inline is not None else ''
+                                if text:
+                                    yield text
+                            else:
+                                value = elem.findtext(_X_VALUE)
+                                if cell_type == 'b':
+                                    value = 'True' if value == '1' else None
+                                elif cell_type in (None, 'n') and value:
+                                    style = int(elem.get('s', 0))
+                                    if style in date_styles:
+                                        value = _format_date(value, epoch, style in timedelta_styles)
+                                    else:
+                                        value = _format_number(value)
+                                if value:
+                                    yield value
+                        elif elem.tag == _X_ROW:
+                            elem.clear()
+        finally:
+            shared.close()
+
+
+def _format_number(value):
+    """
+    按 openpyxl 的规则把数字文本转换为 int 或 float 再转回字符串，0 返回 None
+
+    超过 16 位的整数按原文展开，不写成 1.234567890123457e+19 这样的科学计数法。
+    """
+    try:
+        number = float(value) if '.' in value or 'e' in value.lower() else int(value)
+    except ValueError:
+        return value
+    if not number:
+        return None
+    text = str(number)
+    if 'e' in text and number.is_integer():
+        return format(Decimal(value), 'f')
+    return text
+
+
+def _extract_excel_openpyxl(file_path, matchers=(), limit=DOCUMENT_CHAR_LIMIT):
+    """用 openpyxl 逐行读取，供快速路径无法解析的文件使用"""
+    from openpyxl import load_workbook
+    wb = load_workbook(str(file_path), read_only=True)
+    try:
+        def cells():
+            for sheet in wb:
+                for row in sheet.iter_rows(values_only=True):
+                    for cell in row:
+                        if cell:
+                            yield str(cell)
+        return read_text_until(cells(), matchers, limit)
+    finally:
         wb.close()
-        return matches_keyword(text, keyword)
+
+
+def extract_excel_text(file_path, matchers=(), limit=DOCUMENT_CHAR_LIMIT):
+    try:
+        return read_text_until(iter_xlsx_text(file_path), matchers, limit)
+    except MemoryError:
+        raise
+    except (KeyError, ElementTree.ParseError):
+        # 压缩包结构不标准时退回 openpyxl
+        pass
+    except Exception:
+        return None
+    try:
+        return _extract_excel_openpyxl(file_path, matchers, limit)
     except ImportError:
-        return search_text_file(file_path, keyword)
+        return extract_text_file(file_path)
+    except MemoryError:
+        raise
     except Exception:
-        return False
+        return None
+
+
+# 内置格式。cost 按本机实测的单文件耗时量级粗略设定（纯文本 3 KB 为 1）
+EXTRACTORS.register(Extractor(
+    'text', extract_text_file, TEXT_EXTENSIONS, scanner=scan_text_file))
+EXTRACTORS.register(Extractor(
+    'pdf', extract_pdf_text, ['.pdf'], magic=[b'%PDF-'], streaming=True, cost=50,
+    needs_process=True, cached=True, options=['max_pages']))
+EXTRACTORS.register(Extractor(
+    'docx', extract_docx_text, ['.docx'], magic=[b'PK\x03\x04'], streaming=True, cost=10,
+    needs_process=True, cached=True))
+EXTRACTORS.register(Extractor(
+    'xlsx', extract_excel_text, ['.xlsx'], magic=[b'PK\x03\x04'], streaming=True, cost=10,
+    needs_process=True, cached=True))
@@ -0,0 +1,96 @@
+"""
+设置模块
+读写用户设置文件（默认位于 ~/.filegather_pro/settings.json），
+未配置的项使用 DEFAULT_SETTINGS 中的默认值
+"""
+
+import os
+import json
+from pathlib import Path
+
+
+# 默认设置
+DEFAULT_SETTINGS = {
+    # 目录遍历线程数，0 表示按 CPU 核数自动选择
+    'search_workers': 0,
+    # 提取文本缓存的大小上限（MB），0 表示不使用缓存
+    'text_cache_max_mb': 256,
+    # 文档内容提取进程数，0 表示按 CPU 核数自动选择
+    'content_processes': 0,
+    # 单个文档提取的超时时间（秒），超时的文件跳过；0 表示不限制，且单进程时在搜索线程内提取
+    'extract_timeout': 60,
+    # 提取子进程的内存上限（MB，仅 Linux/macOS 有效），0 表示不限制
+    'extract_memory_mb': 1024,
+    # PDF 最多读取的页数，0 表示不限制
+    'pdf_max_pages': 50,
+    # 超过该大小（MB）的 PDF 不提取内容（多为扫描件），0 表示不限制
+    'pdf_max_mb': 200,
+    # 内容搜索时每个文件检查的深度（KB，按字符计：1 KB 为 1024 个字符），0 表示整个文件
+    'content_scan_kb': 3,
+    # 超过该大小（MB）的文本和日志文件用 mmap 扫描，0 表示始终使用普通分块读取
+    'mmap_threshold_mb': 8,
+    # 内容搜索是否包括扩展名未知、但文件头嗅探为文本的文件
+    'content_all_text': False,
+}
+
+
+def get_data_dir():
+    """返回应用数据目录，可通过环境变量 FILEGATHER_DATA_DIR 覆盖"""
+    data_dir = os.environ.get('FILEGATHER_DATA_DIR')
+    if data_dir:
+        path = Path(data_dir)
+    else:
+        path = Path.home() / '.filegather_pro'
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _settings_file():
+    """设置文件路径"""
+    return get_data_dir() / 'settings.json'
+
+
+def load_settings():
+    """读取设置，缺失或损坏时返回默认值"""
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        with open(_settings_file(), 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        if isinstance(stored, dict):
+            settings.update({k: v for k, v in stored.items() if k in DEFAULT_SETTINGS})
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"读取设置失败: {str(e)}")
+    return settings
+
+
+def save_settings(settings):
+    """保存设置，只写入已知的设置项"""
+    data = {k: settings[k] for k in DEFAULT_SETTINGS if k in settings}
+    try:
+        with open(_settings_file(), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return True
+    except Exception as e:
+        print(f"保存设置失败: {str(e)}")
+        return False
+
+
+def get_setting(key):
+    """读取单个设置项；每次调用都会读取设置文件，需要多个设置项时用 load_settings 一次读取"""
+    return load_settings().get(key, DEFAULT_SETTINGS.get(key))
+
+
+def set_setting(key, value):
+    """修改并保存单个设置项"""
+    settings = load_settings()
+    settings[key] = value
+    return save_settings(settings)
+
+
+def resolve_worker_count(workers):
+    """将设置中的线程数转换为实际线程数（0 或负数表示自动）"""
+    if workers and workers > 0:
+        return int(workers)
+    return min(16, (os.cpu_count() or 1) * 2)
@@ -0,0 +1,174 @@
+"""
+文本缓存模块
+把 PDF、DOCX、XLSX 等文档提取出的文本按 (路径, 大小, 修改时间) 压缩保存到 SQLite，
+文档未变化时再次内容搜索无需重新解析；总大小超过上限时按最近使用时间淘汰
+"""
+
+import zlib
+import sqlite3
+
+from .settings import get_data_dir
+
+
+# 表结构版本，与数据库中的 user_version 不同时重建缓存；提取结果的格式变化时也递增
+CACHE_SCHEMA_VERSION = 3
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS texts (
+        path TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        variant TEXT NOT NULL,
+        data BLOB,
+        nbytes INTEGER NOT NULL,
+        last_used INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS texts_last_used ON texts (last_used);
+"""
+
+
+class TextCache:
+    """
+    提取文本的磁盘缓存
+
+    data 为 zlib 压缩的 UTF-8 文本；提取失败的文档以 NULL 记录，避免每次都重新解析损坏的文件。
+    variant 描述提取参数（扫描深度、PDF 页数上限等），参数不同的缓存条目视为未命中。
+    每个线程应使用自己的 TextCache 实例（SQLite 连接不跨线程共享）。
+    """
+
+    # get() 未命中时的返回值（命中时可能返回 None，表示该文档无法提取）
+    MISS = object()
+
+    # 累计写入多少条后提交一次事务
+    COMMIT_EVERY = 50
+
+    def __init__(self, max_bytes, db_path=None, variant=''):
+        """
+        Args:
+            max_bytes: 缓存数据（压缩后）的总大小上限
+            db_path: 数据库路径，默认位于应用数据目录
+            variant: 提取参数的描述，只命中以相同参数提取的文本
+        """
+        self.max_bytes = max_bytes
+        self.variant = variant
+        self.db_path = str(db_path) if db_path else str(get_data_dir() / 'text_cache.sqlite3')
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._total = None
+        self._uncommitted = 0
+        # 递增的使用序号，用于 LRU 排序（不受系统时钟精度影响）
+        self._clock = 0
+        # 同一文件通常会连续查询多次（多个关键词），保留最近一条避免重复解压
+        self._last = None
+
+    def _connect(self):
+        """打开数据库连接并确保表结构存在"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != CACHE_SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS texts")
+                self._conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+            self._conn.executescript(_SCHEMA)
+            self._total, self._clock = self._conn.execute(
+                "SELECT COALESCE(SUM(nbytes), 0), COALESCE(MAX(last_used), 0) FROM texts"
+            ).fetchone()
+        return self._conn
+
+    def close(self):
+        """提交未保存的修改并关闭连接"""
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get(self, path, size, mtime_ns):
+        """
+        读取缓存的文本
+
+        Returns:
+            文本；文档曾提取失败时返回 None；未命中（或文件已变化）时返回 TextCache.MISS
+        """
+        key = (path, size, mtime_ns)
+        if self._last is not None and self._last[0] == key:
+            self.hits += 1
+            return self._last[1]
+
+        conn = self._connect()
+        row = conn.execute("SELECT size, mtime_ns, variant, data FROM texts WHERE path = ?",
+                           (path,)).fetchone()
+        if row is None or row[:3] != (size, mtime_ns, self.variant):
+            self.misses += 1
+            return self.MISS
+
+        text = None if row[3] is None else zlib.decompress(row[3]).decode('utf-8', 'surrogatepass')
+        conn.execute("UPDATE texts SET last_used = ? WHERE path = ?", (self._tick(), path))
+        self._after_write()
+        self._last = (key, text)
+        self.hits += 1
+        return text
+
+    def put(self, path, size, mtime_ns, text):
+        """保存提取结果，text 为 None 表示提取失败"""
+        if self.max_bytes <= 0:
+            return
+        data = None if text is None else zlib.compress(text.encode('utf-8', 'surrogatepass'))
+        nbytes = len(data) if data else 0
+
+        conn = self._connect()
+        old = conn.execute("SELECT nbytes FROM texts WHERE path = ?", (path,)).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO texts (path, size, mtime_ns, variant, data, nbytes, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, self.variant, data, nbytes, self._tick()))
+        self._total += nbytes - (old[0] if old else 0)
+        self._last = ((path, size, mtime_ns), text)
+        if self._total > self.max_bytes:
+            self._evict()
+        self._after_write()
+
+    def total_bytes(self):
+        """缓存数据当前占用的字节数"""
+        self._connect()
+        return self._total
+
+    def clear(self):
+        """清空缓存"""
+        conn = self._connect()
+        conn.execute("DELETE FROM texts")
+        conn.commit()
+        self._total = 0
+        self._last = None
+
+    def _tick(self):
+        """返回下一个使用序号"""
+        self._clock += 1
+        return self._clock
+
+    def _evict(self):
+        """按最近使用时间淘汰，直到总大小降到上限的 90% 以下"""
+        conn = self._connect()
+        target = self.max_bytes * 0.9
+        victims = []
+        for path, nbytes in conn.execute("SELECT path, nbytes FROM texts ORDER BY last_used"):
+            if self._total <= target:
+                break
+            victims.append((path,))
+            self._total -= nbytes
+        conn.executemany("DELETE FROM texts WHERE path = ?", victims)
+
+    def _after_write(self):
+        """定期提交，避免每次写入都同步磁盘"""
+        self._uncommitted += 1
+        if self._uncommitted >= self.COMMIT_EVERY:
+            self._conn.commit()
+            self._uncommitted = 0
@@ -0,0 +1,320 @@
+"""
+目录遍历模块
+基于 os.scandir 的目录遍历引擎，复用 DirEntry 自带的类型和 stat 信息，
+避免对每个文件重复调用 exists / access / stat
+"""
+
+import os
+import datetime
+import threading
+from collections import namedtuple, deque
+from operator import attrgetter
+
+
+# Windows 下 DirEntry.stat() 直接使用目录枚举返回的数据，不产生额外系统调用
+STAT_FROM_LISTING = os.name == 'nt'
+
+
+class FileEntry:
+    """轻量文件条目，携带目录枚举时得到的大小和修改时间"""
+
+    __slots__ = ('path', 'name', 'size', 'mtime')
+
+    def __init__(self, path, name, size, mtime):
+        self.path = path
+        self.name = name
+        self.size = size
+        self.mtime = mtime
+
+    @classmethod
+    def from_dir_entry(cls, entry, stats=None):
+        """从 os.DirEntry 创建条目，stat 结果取自 DirEntry 缓存"""
+        st = entry.stat()
+        if stats is not None and not STAT_FROM_LISTING:
+            stats.syscalls += 1
+        return cls(entry.path, entry.name, st.st_size, st.st_mtime)
+
+    @property
+    def suffix(self):
+        """小写扩展名，与 Path.suffix 规则一致"""
+        i = self.name.rfind('.')
+        if 0 < i < len(self.name) - 1:
+            return self.name[i:].lower()
+        return ''
+
+    @property
+    def mod_date(self):
+        """修改日期"""
+        return datetime.datetime.fromtimestamp(self.mtime).date()
+
+    def __repr__(self):
+        return f"FileEntry({self.path!r}, size={self.size})"
+
+
+# 单个目录的枚举结果: files 为 FileEntry 列表，dirs 为子目录的 os.DirEntry 列表
+DirListing = namedtuple('DirListing', ['path', 'files', 'dirs'])
+
+
+class TraversalStats:
+    """遍历统计：目录数、文件数和估算的系统调用次数"""
+
+    def __init__(self):
+        self.dirs = 0
+        self.files = 0
+        self.syscalls = 0
+        self.errors = 0
+
+    @property
+    def syscalls_per_file(self):
+        """平均每个文件的系统调用次数"""
+        if not self.files:
+            return 0.0
+        return self.syscalls / self.files
+
+    def merge(self, other):
+        """累加另一个统计对象的数据"""
+        self.dirs += other.dirs
+        self.files += other.files
+        self.syscalls += other.syscalls
+        self.errors += other.errors
+
+    def as_dict(self):
+        """以字典形式返回统计数据"""
+        return {
+            'dirs': self.dirs,
+            'files': self.files,
+            'syscalls': self.syscalls,
+            'errors': self.errors,
+            'syscalls_per_file': round(self.syscalls_per_file, 3),
+        }
+
+
+def scan_directory(path, stats=None):
+    """
+    枚举单个目录
+
+    Args:
+        path: 目录路径
+        stats: 可选的 TraversalStats，用于累计统计
+
+    Returns:
+        DirListing；目录无法访问时返回 None
+    """
+    files = []
+    dirs = []
+    try:
+        with os.scandir(path) as it:
+            if stats is not None:
+                stats.syscalls += 1
+            for entry in it:
+                try:
+                    # 与 os.walk 一致：不进入指向目录的符号链接
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry)
+                    elif entry.is_file():
+                        files.append(FileEntry.from_dir_entry(entry, stats))
+                except OSError as e:
+                    if stats is not None:
+                        stats.errors += 1
+                    print(f"跳过文件 {entry.path}，原因: {str(e)}")
+    except OSError as e:
+        if stats is not None:
+            stats.errors += 1
+        print(f"访问文件夹出错: {path} - {str(e)}")
+        return None
+
+    if stats is not None:
+        stats.dirs += 1
+        stats.files += len(files)
+    return DirListing(path, files, dirs)
+
+
+def walk_entries(root, recursive=True, stats=None, cancel=None):
+    """
+    自顶向下遍历目录树，按目录产出 DirListing
+
+    Args:
+        root: 根目录
+        recursive: 是否进入子目录
+        stats: 可选的 TraversalStats
+        cancel: 可选的无参函数，返回 True 时停止遍历
+    """
+    stack = [root]
+    while stack:
+        if cancel is not None and cancel():
+            return
+        path = stack.pop()
+        listing = scan_directory(path, stats)
+        if listing is None:
+            continue
+        yield listing
+        if recursive:
+            stack.extend(entry.path for entry in reversed(listing.dirs))
+
+
+class _DirTask:
+    """并行遍历中的单个目录任务"""
+
+    __slots__ = ('path', 'state', 'listing', 'children')
+
+    PENDING, CLAIMED, DONE = 0, 1, 2
+
+    def __init__(self, path):
+        self.path = path
+        self.state = _DirTask.PENDING
+        self.listing = None
+        self.children = ()
+
+
+class ParallelWalker:
+    """
+    多根目录并行遍历器
+
+    多个线程共享一组目录任务队列：每个线程优先从自己队列的尾部取任务
+    （深度优先，贴近消费顺序），空闲时从其它线程队列的头部窃取任务。
+    消费方按“根目录顺序 + 先序遍历 + 名称排序”的固定顺序产出 DirListing，
+    因此结果顺序与线程调度无关；所需目录尚未被任何线程领取时由消费方直接枚举。
+    """
+
+    def __init__(self, roots, recursive=True, workers=4, stats=None, cancel=None,
+                 max_buffered=4096):
+        """
+        Args:
+            roots: 根目录列表
+            recursive: 是否进入子目录
+            workers: 遍历线程数
+            stats: 可选的 TraversalStats，遍历结束时汇总各线程统计
+            cancel: 可选的无参函数，返回 True 时停止遍历
+            max_buffered: 已枚举但尚未被消费的目录数上限，限制内存占用
+        """
+        self.roots = list(roots)
+        self.recursive = recursive
+        self.workers = max(1, int(workers))
+        self.stats = stats
+        self.cancel = cancel
+        self.max_buffered = max_buffered
+
+        self._cond = threading.Condition()
+        self._queues = [deque() for _ in range(self.workers)]
+        self._next_queue = 0
+        self._buffered = 0
+        self._stop = False
+
+    def _cancelled(self):
+        return self.cancel is not None and self.cancel()
+
+    def _list(self, task, stats):
+        """枚举目录并按名称排序，保证输出顺序确定"""
+        listing = scan_directory(task.path, stats)
+        if listing is not None:
+            listing.files.sort(key=attrgetter('name'))
+            listing.dirs.sort(key=attrgetter('name'))
+        return listing
+
+    def _push(self, tasks, queue_index=None):
+        """把任务放入队列（调用方需持有锁）"""
+        if queue_index is None:
+            queue_index = self._next_queue
+            self._next_queue = (self._next_queue + 1) % self.workers
+        # 逆序追加，使第一个子目录最先从队尾被取出
+        self._queues[queue_index].extend(reversed(tasks))
+
+    def _complete(self, task, listing, queue_index=None):
+        """记录枚举结果并派发子目录任务（调用方需持有锁）"""
+        task.listing = listing
+        task.state = _DirTask.DONE
+        self._buffered += 1
+        if self.recursive and listing is not None and listing.dirs:
+            task.children = [_DirTask(entry.path) for entry in listing.dirs]
+            self._push(task.children, queue_index)
+        self._cond.notify_all()
+
+    def _take(self, index):
+        """取一个待处理任务：先取自己队尾，再从其它队列头部窃取（调用方需持有锁）"""
+        own = self._queues[index]
+        while own:
+            task = own.pop()
+            if task.state == _DirTask.PENDING:
+                return task
+        for offset in range(1, self.workers):
+            victim = self._queues[(index + offset) % self.workers]
+            while victim:
+                task = victim.popleft()
+                if task.state == _DirTask.PENDING:
+                    return task
+        return None
+
+    def _worker(self, index, stats):
+        """遍历线程主循环"""
+        while True:
+            with self._cond:
+                task = None
+                while task is None:
+                    if self._stop:
+                        return
+                    if self._buffered < self.max_buffered:
+                        task = self._take(index)
+                        if task is not None:
+                            task.state = _DirTask.CLAIMED
+                            break
+                    self._cond.wait(0.05)
+            listing = self._list(task, stats)
+            with self._cond:
+                self._complete(task, listing, index)
+
+    def __iter__(self):
+        thread_stats = [TraversalStats() for _ in range(self.workers)]
+        own_stats = TraversalStats()
+        threads = [
+            threading.Thread(target=self._worker, args=(i, thread_stats[i]),
+                             name=f"ParallelWalker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+
+        root_tasks = [_DirTask(root) for root in self.roots]
+        with self._cond:
+            for task in root_tasks:
+                self._push([task])
+        for thread in threads:
+            thread.start()
+
+        stack = list(reversed(root_tasks))
+        try:
+            while stack:
+                if self._cancelled():
+                    return
+                task = stack.pop()
+
+                inline = False
+                with self._cond:
+                    while task.state == _DirTask.CLAIMED:
+                        if self._cancelled():
+                            return
+                        self._cond.wait(0.05)
+                    if task.state == _DirTask.PENDING:
+                        task.state = _DirTask.CLAIMED
+                        inline = True
+                if inline:
+                    listing = self._list(task, own_stats)
+                    with self._cond:
+                        self._complete(task, listing)
+
+                with self._cond:
+                    self._buffered -= 1
+                    self._cond.notify_all()
+
+                listing, task.listing = task.listing, None
+                if listing is not None:
+                    yield listing
+                stack.extend(reversed(task.children))
+                task.children = ()
+        finally:
+            with self._cond:
+                self._stop = True
+                self._cond.notify_all()
+            for thread in threads:
+                thread.join()
+            if self.stats is not None:
+                for item in thread_stats:
+                    self.stats.merge(item)
+                self.stats.merge(own_stats)
@@ -9,11 +9,13 @@ from PyQt6.QtGui import QColor, QPalette, QLinearGradient, QBrush, QFont, QActio
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QComboBox, QCheckBox, QGroupBox, QFileDialog,
-    QMessageBox, QTreeWidget, QProgressBar, QListWidget,
+    QMessageBox, QTreeWidget, QTreeView, QProgressBar, QListWidget,
     QTextEdit, QRadioButton, QButtonGroup, QHeaderView, QAbstractItemView,
     QMenu, QPlainTextEdit
 )
 
+from .results_model import ResultsModel
+
 
 class UIBuilder:
     """UI构建器类，负责创建和管理所有UI组件"""
@@ -59,7 +61,7 @@ class UIBuilder:
             color: #95a5a6;
             border: 2px solid #bdc3c7;
         }
-        QTreeWidget {
+        QTreeView {
             background-color: rgba(255, 255, 255, 200);
             border: 1px solid #3498db;
             border-radius: 3px;
@@ -147,9 +149,30 @@ class UIBuilder:
         folder_button_layout.addWidget(remove_folder_button)
         folder_button_layout.addWidget(clear_folders_button)
 
+        # 文件名索引部分
+        index_layout = QHBoxLayout()
+        index_layout.setSpacing(4)
+        use_index_check = QCheckBox("使用文件名索引")
+        use_index_check.setToolTip(
+            "仅文件名模式和精确查找时，已建立索引的文件夹直接查询索引，无需重新遍历磁盘。\n"
+            "未建立索引的文件夹仍按常规方式搜索；索引过期时请先刷新"
+        )
+        index_status_label = QLabel("索引: 未建立")
+        index_status_label.setStyleSheet("color: #7f8c8d; font-size: 8pt;")
+        build_index_button = QPushButton("建立索引")
+        build_index_button.setToolTip("为列表中的文件夹重新建立文件名索引")
+        refresh_index_button = QPushButton("刷新索引")
+        refresh_index_button.setToolTip("同步索引与磁盘上的变化")
+
+        index_layout.addWidget(use_index_check)
+        index_layout.addWidget(index_status_label, 1)
+        index_layout.addWidget(build_index_button)
+        index_layout.addWidget(refresh_index_button)
+
         folder_layout.addWidget(folder_label)
         folder_layout.addWidget(folder_list)
         folder_layout.addLayout(folder_button_layout)
+        folder_layout.addLayout(index_layout)
         search_layout.addLayout(folder_layout)
 
         # 关键词部分
@@ -191,16 +214,38 @@ class UIBuilder:
             "- 仅文件名: 只在文件名中匹配关键词\n"
             "- 仅内容: 只在文件内容中匹配关键词\n"
             "- 两者同时: 在文件名或内容中匹配关键词即可\n\n"
-            "注意：内容搜索仅检查文件的前3000个字符"
+            "内容搜索检查的范围由右侧的“扫描深度”决定"
         )
         filename_radio.setToolTip(tooltip)
         content_radio.setToolTip(tooltip)
         both_radio.setToolTip(tooltip)
 
+        scan_depth_combo = QComboBox()
+        scan_depth_combo.addItem("前 3 KB", 3)
+        scan_depth_combo.addItem("前 64 KB", 64)
+        scan_depth_combo.addItem("前 1 MB", 1024)
+        scan_depth_combo.addItem("整个文件", 0)
+        scan_depth_combo.setToolTip(
+            "内容搜索时每个文件检查的深度：\n"
+            "- 按字符计（1 KB 即 1024 个字符，中文每字算一个字符）\n"
+            "- 文本文件分块流式读取，选择“整个文件”也不会把大文件整体读入内存\n"
+            "- PDF、Word、Excel 提取到该深度的文字为止"
+        )
+
+        all_text_check = QCheckBox("所有文本类文件")
+        all_text_check.setToolTip(
+            "内容搜索时也检查扩展名不在内置列表中的文件（如 .md、.json、.xml、.yaml、.sql、.conf）\n"
+            "每个文件只读取开头 4 KB 判断是否为文本，改了扩展名的 PDF 按 PDF 提取，\n"
+            "图片、压缩包等其他二进制文件直接跳过"
+        )
+
         search_mode_layout.addWidget(search_mode_label)
         search_mode_layout.addWidget(filename_radio)
         search_mode_layout.addWidget(content_radio)
         search_mode_layout.addWidget(both_radio)
+        search_mode_layout.addWidget(QLabel("扫描深度:"))
+        search_mode_layout.addWidget(scan_depth_combo)
+        search_mode_layout.addWidget(all_text_check)
         
         # 添加分隔符
         separator = QLabel("|")
@@ -322,7 +367,9 @@ class UIBuilder:
                 remove_folder_button, clear_folders_button, keyword_entry, 
                 filename_radio, content_radio, both_radio, search_mode_group,
                 filetype_combo, mod_date_combo, file_size_combo, subfolders_check,
-                gather_mode_combo, filetype_label, subfolders_container)
+                gather_mode_combo, filetype_label, subfolders_container,
+                use_index_check, index_status_label, build_index_button,
+                refresh_index_button, scan_depth_combo, all_text_check)
 
     @staticmethod
     def build_action_buttons():
@@ -395,8 +442,11 @@ class UIBuilder:
         results_layout.setSpacing(5)
         results_layout.setContentsMargins(8, 8, 8, 8)
 
-        results_tree = QTreeWidget()
-        results_tree.setHeaderLabels(["文件名", "路径", "大小", "修改日期", "匹配关键词"])
+        # 结果由模型按需提供显示文字，数量很大时也不为每个文件创建条目对象
+        results_tree = QTreeView()
+        results_tree.setModel(ResultsModel(results_tree))
+        results_tree.setRootIsDecorated(False)
+        results_tree.setUniformRowHeights(True)
         results_tree.setColumnWidth(0, 180)
         results_tree.setColumnWidth(1, 250)
         results_tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
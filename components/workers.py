@@ -0,0 +1,455 @@
+"""
+后台工作线程模块
+在独立的 QThread 中执行文件遍历和关键词匹配，通过批量信号把结果回传给主窗口，
+避免搜索过程阻塞 GUI 线程
+"""
+
+import os
+import threading
+import time
+from array import array
+from functools import partial
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from .search_logic import (
+    CompiledQuery, ExactQuery, EXTRACTORS, DOCUMENT_CHAR_LIMIT, MMAP_THRESHOLD, extract_text
+)
+from .content_search import (
+    ContentSearcher, ContentPipeline, SKIP_TOO_LARGE, resolve_process_count
+)
+from .traversal import ParallelWalker, TraversalStats
+from .file_index import FileIndex
+from .text_cache import TextCache
+from .settings import resolve_worker_count
+from .result_store import ResultStore
+
+
+class SearchWorker(QObject):
+    """文件搜索工作者，由 QThread 驱动执行 run()"""
+
+    # 批量结果: ResultStore, 已发送的行数（其后新增的行在下一批发送）
+    files_found = pyqtSignal(object, int)
+    # 当前搜索目录（按时间节流）
+    path_changed = pyqtSignal(str)
+    # 搜索结束: ResultStore
+    finished = pyqtSignal(object)
+
+    # 结果批量发送的条数和时间间隔（秒），界面按批次追加到结果列表
+    BATCH_SIZE = 500
+    BATCH_INTERVAL = 0.1
+
+    def __init__(self, folders, keywords, search_mode="filename", exact=False,
+                 file_types=None, include_subfolders=True,
+                 size_range=(0, float('inf')), mod_date_range=(None, None), workers=0,
+                 use_index=False, text_cache_bytes=0, processes=1,
+                 extract_timeout=0, memory_limit_mb=0, pdf_max_pages=0, pdf_max_mb=0,
+                 scan_chars=DOCUMENT_CHAR_LIMIT,
+                 mmap_threshold_mb=MMAP_THRESHOLD // (1024 * 1024), all_text=False):
+        """
+        初始化搜索工作者
+
+        Args:
+            folders: 搜索文件夹列表
+            keywords: 关键词列表
+            search_mode: "filename" / "content" / "both"
+            exact: 是否精确查找（仅匹配文件名主体）
+            file_types: 扩展名列表，为空表示不限
+            include_subfolders: 是否包含子文件夹
+            size_range: 文件大小范围 (最小, 最大)
+            mod_date_range: 修改日期范围 (开始, 结束)
+            workers: 目录遍历线程数，0 表示自动
+            use_index: 仅文件名匹配时，已建立索引的根目录直接查询索引
+            text_cache_bytes: 提取文本缓存的大小上限，0 表示不使用缓存
+            processes: 文档提取进程数，0 表示按 CPU 核数自动选择
+            extract_timeout: 单个文档的提取超时（秒）；大于 0 时即使只有 1 个进程也在子进程中提取，
+                             为 0 且只有 1 个进程时在搜索线程内提取
+            memory_limit_mb: 提取子进程的内存上限（MB），0 表示不限制
+            pdf_max_pages: PDF 最多读取的页数，0 表示不限制
+            pdf_max_mb: 超过该大小（MB）的 PDF 不提取内容，记为跳过；0 表示不限制
+            scan_chars: 内容搜索时每个文件最多检查的字符数，0 表示整个文件
+            mmap_threshold_mb: 超过该大小（MB）的纯文本文件用 mmap 扫描，0 表示不使用 mmap
+            all_text: 内容搜索包括扩展名未知但嗅探为文本的文件（如 .md、.json、.yaml），
+                      以及文件头符合某种文档格式的文件（如改了扩展名的 PDF）
+        """
+        super().__init__()
+        self.folders = list(folders)
+        self.query = CompiledQuery(keywords)
+        self.exact_query = ExactQuery(keywords) if exact else None
+        self.keywords = self.query.keywords
+        self.search_mode = search_mode
+        self.exact = exact
+        self.file_types = file_types or []
+        self.include_subfolders = include_subfolders
+        self.size_range = size_range
+        self.mod_date_range = mod_date_range
+        self.workers = resolve_worker_count(workers)
+        # 索引只包含文件名信息，内容搜索仍需遍历磁盘
+        self.use_index = use_index and (exact or search_mode == "filename")
+        self.indexed_roots = []
+        self.text_cache_bytes = text_cache_bytes
+        self.text_cache = None
+        self.content_searcher = ContentSearcher(self.query, pdf_max_pages=pdf_max_pages,
+                                                scan_chars=scan_chars,
+                                                mmap_threshold=mmap_threshold_mb * 1024 * 1024,
+                                                all_text=all_text)
+        self.pdf_max_bytes = pdf_max_mb * 1024 * 1024
+        self.processes = resolve_process_count(processes)
+        self.extract_timeout = extract_timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.pipeline = None
+        # 超时、内存超限、崩溃或超过大小上限而跳过的文档 [(路径, 原因), ...]
+        self.skipped = []
+
+        self.results = ResultStore(self.keywords)
+        self.traversal_stats = TraversalStats()
+
+        self._cancel_event = threading.Event()
+        # 已通过 files_found 发送的行数
+        self._sent = 0
+        self._last_flush = 0.0
+        self._last_path_emit = 0.0
+        self._keyword_order = {kw: i for i, kw in enumerate(self.keywords)}
+        # 文件在遍历中的序号，用于把进程池按完成顺序返回的结果恢复为遍历顺序；
+        # _seqs 与结果行一一对应
+        self._seq = 0
+        self._seqs = array('q')
+
+    def cancel(self):
+        """请求取消搜索，可从任意线程调用"""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+
+    @property
+    def keyword_results(self):
+        """{关键词: 命中结果序列}"""
+        return self.results.keyword_results()
+
+    @property
+    def extract_timings(self):
+        """每个文档的提取耗时 [(路径, 秒), ...]，按耗时从长到短排列"""
+        timings = list(self.content_searcher.timings)
+        if self.pipeline is not None:
+            timings += self.pipeline.timings
+        return sorted(timings, key=lambda item: item[1], reverse=True)
+
+    def run(self):
+        """执行搜索，结束时总会发出 finished 信号"""
+        needs_content = not self.exact and self.search_mode != "filename"
+        if needs_content and self.text_cache_bytes > 0:
+            # 缓存连接必须在工作线程中创建
+            searcher = self.content_searcher
+            self.text_cache = TextCache(
+                self.text_cache_bytes,
+                variant=f"chars={searcher.scan_chars};pdf_pages={searcher.pdf_max_pages}")
+            self.content_searcher.cache = self.text_cache
+        if needs_content and (self.processes > 1 or self.extract_timeout > 0):
+            # 不使用文本缓存时，子进程在全部关键词结果确定后即停止读取文档
+            extractor = partial(extract_text, pdf_max_pages=self.content_searcher.pdf_max_pages,
+                                limit=self.content_searcher.scan_chars,
+                                keywords=tuple(self.keywords) if self.text_cache is None else ())
+            self.pipeline = ContentPipeline(self.processes, timeout=self.extract_timeout,
+                                            memory_limit=self.memory_limit_mb * 1024 * 1024,
+                                            cancel=self.is_cancelled, extractor=extractor)
+        try:
+            self._search_folders()
+            if self.pipeline is not None:
+                for result in self.pipeline.drain():
+                    self._on_extracted(*result)
+        finally:
+            if self.pipeline is not None:
+                self.pipeline.close()
+                self._restore_order()
+            if self.text_cache is not None:
+                try:
+                    self.text_cache.close()
+                except Exception as e:
+                    print(f"保存文本缓存失败: {str(e)}")
+            self._flush()
+            self.finished.emit(self.results)
+
+    def _search_folders(self):
+        """按根文件夹顺序逐个目录匹配，已建立索引的根目录查询索引，其余并行遍历"""
+        roots = [folder for folder in self.folders if os.path.isdir(folder)]
+        if not self.use_index:
+            self._match_listings(self._walk(roots))
+            return
+
+        for root in roots:
+            if self.is_cancelled():
+                return
+            index = FileIndex(root)
+            try:
+                if index.exists():
+                    self.indexed_roots.append(root)
+                    self._match_listings(index.iter_listings(
+                        recursive=self.include_subfolders,
+                        size_range=self.size_range,
+                        extensions=self.file_types or None,
+                        stems=self.exact_query.stems if self.exact else None))
+                    continue
+            finally:
+                index.close()
+            self._match_listings(self._walk([root]))
+
+    def _walk(self, roots):
+        """并行遍历目录树"""
+        return ParallelWalker(roots, recursive=self.include_subfolders,
+                              workers=self.workers, stats=self.traversal_stats,
+                              cancel=self.is_cancelled)
+
+    def _match_listings(self, listings):
+        """对逐个目录的枚举结果执行匹配"""
+        for listing in listings:
+            if self.is_cancelled():
+                return
+            self._report_path(listing.path)
+            self._collect_extracted()
+            self._maybe_flush()
+
+            # 序号按遍历顺序分配，调度顺序变化不影响最终结果顺序
+            base = self._seq
+            self._seq += len(listing.files)
+            for index, entry in self._schedule(listing.files):
+                if self.is_cancelled():
+                    return
+                try:
+                    self._process_file(entry, base + index)
+                except Exception as e:
+                    print(f"跳过文件 {entry.path}，原因: {str(e)}")
+
+    def _schedule(self, files):
+        """
+        决定目录内文件的处理顺序，返回 [(遍历序号, 文件), ...]
+
+        使用进程池时，先在线程内处理开销小的文件（此时子进程仍在解析上一个目录的文档），
+        再按提取器声明的开销从大到小提交需要子进程的文档，让耗时最长的文件最早开始。
+        """
+        files = list(enumerate(files))
+        if self.pipeline is None:
+            return files
+
+        def key(item):
+            extractor = EXTRACTORS.for_extension(item[1].suffix)
+            if extractor is None or not extractor.needs_process:
+                return (0, 0)
+            return (1, -extractor.cost)
+        return sorted(files, key=key)
+
+    def _process_file(self, entry, seq):
+        """对单个文件执行过滤和关键词匹配，大小和日期取自遍历缓存"""
+        file_size = entry.size
+
+        # 检查文件大小
+        if not (self.size_range[0] <= file_size <= self.size_range[1]):
+            return
+
+        # 检查修改日期
+        if self.mod_date_range != (None, None) and self.mod_date_range != "custom":
+            mod_date = entry.mod_date
+            start_date, end_date = self.mod_date_range
+            if not (start_date <= mod_date <= end_date):
+                return
+
+        # 检查文件类型
+        if self.file_types and entry.suffix not in self.file_types:
+            return
+
+        if (self.pdf_max_bytes and entry.suffix == '.pdf' and file_size > self.pdf_max_bytes
+                and not self.exact and self.search_mode != "filename"):
+            # 过大的 PDF（多为扫描件）不提取内容，只保留文件名的命中
+            self.skipped.append((entry.path, SKIP_TOO_LARGE))
+            self._record(entry, self._split_keywords(entry.name)[0], seq)
+            return
+        extractor = EXTRACTORS.for_extension(entry.suffix)
+        if self.pipeline is not None and extractor is not None and extractor.needs_process:
+            self._submit_content(entry, seq)
+            return
+
+        matched = self._match_keywords(entry.path, entry.name)
+        self._record(entry, matched, seq)
+
+    def _record(self, entry, matched, seq):
+        """记录命中的文件，新行计入待发送批次"""
+        if not matched:
+            return
+
+        if self.results.add(entry.path, entry.name, entry.size, entry.mtime, matched) is not None:
+            self._seqs.append(seq)
+            self._maybe_flush()
+
+    def _match_keywords(self, file_path, file):
+        """返回命中该文件的关键词列表"""
+        if self.exact:
+            # 精确关键词匹配 - 只在文件名中进行，且必须严格匹配
+            return self.exact_query.match(file)
+
+        if self.search_mode == "filename":
+            return self.query.match(file)
+
+        name_hits, remaining = self._split_keywords(file)
+        if remaining == []:
+            return name_hits
+        return self._merge(name_hits, self.content_searcher.match(file_path, remaining))
+
+    def _split_keywords(self, file):
+        """
+        “两者同时”模式下先匹配文件名
+
+        Returns:
+            (文件名命中的关键词, 仍需检查内容的关键词)；后者为 None 表示全部关键词，
+            为空列表表示文件名已命中全部关键词，无需提取文本
+        """
+        if self.search_mode != "both":
+            return [], None
+        name_hits = self.query.match(file)
+        if not name_hits:
+            return [], None
+        hit = set(name_hits)
+        return name_hits, [kw for kw in self.keywords if kw not in hit]
+
+    def _merge(self, name_hits, content_hits):
+        """合并文件名和内容命中的关键词，保持关键词原有顺序"""
+        if not name_hits:
+            return content_hits
+        if not content_hits:
+            return name_hits
+        return sorted(name_hits + content_hits, key=self._keyword_order.__getitem__)
+
+    def _submit_content(self, entry, seq):
+        """把文档交给提取子进程；文件名已命中全部关键词或文本缓存命中时直接匹配"""
+        name_hits, remaining = self._split_keywords(entry.name)
+        if remaining == []:
+            self._record(entry, name_hits, seq)
+            return
+
+        text, key = self.content_searcher.lookup(entry.path)
+        if key is not None and text is not self.text_cache.MISS:
+            content_hits = self.content_searcher.match_text(text, remaining, entry.path)
+            self._record(entry, self._merge(name_hits, content_hits), seq)
+            return
+
+        token = (entry, seq, name_hits, remaining, key)
+        for result in self.pipeline.submit(token, entry.path):
+            self._on_extracted(*result)
+
+    def _collect_extracted(self):
+        """处理子进程中已完成的提取结果（不等待）"""
+        if self.pipeline is not None:
+            for result in self.pipeline.collect():
+                self._on_extracted(*result)
+
+    def _on_extracted(self, token, text, skip_reason=None):
+        """子进程返回文本后写入缓存并完成匹配；被跳过的文件不写缓存，下次搜索会重试"""
+        entry, seq, name_hits, remaining, key = token
+        if skip_reason is not None:
+            self.skipped.append((entry.path, skip_reason))
+            self._record(entry, name_hits, seq)
+            return
+        try:
+            self.content_searcher.extractor_calls += 1
+            self.content_searcher.store(key, text)
+            content_hits = self.content_searcher.match_text(text, remaining, entry.path)
+            self._record(entry, self._merge(name_hits, content_hits), seq)
+        except Exception as e:
+            print(f"跳过文件 {entry.path}，原因: {str(e)}")
+
+    def _restore_order(self):
+        """进程池结果按完成顺序到达，结束时按遍历顺序重新排列，使结果顺序稳定"""
+        seqs = self._seqs
+        if any(seqs[i] > seqs[i + 1] for i in range(len(seqs) - 1)):
+            # 生成新的存储，界面在收到 finished 之前仍读取原存储
+            self.results = self.results.sorted_by(seqs)
+            self._seqs = array('q', sorted(seqs))
+
+    def _report_path(self, path):
+        """按时间节流地发送当前搜索路径，并发送已积压超过间隔的结果"""
+        self._maybe_flush()
+        now = time.monotonic()
+        if now - self._last_path_emit >= self.BATCH_INTERVAL:
+            self._last_path_emit = now
+            self.path_changed.emit(path)
+
+    def _maybe_flush(self):
+        """累计到一定数量或时间后发送一批结果"""
+        pending = len(self.results) - self._sent
+        if not pending:
+            return
+        if pending >= self.BATCH_SIZE or \
+           time.monotonic() - self._last_flush >= self.BATCH_INTERVAL:
+            self._flush()
+
+    def _flush(self):
+        """通知界面显示到目前为止的全部结果行"""
+        self._last_flush = time.monotonic()
+        if len(self.results) > self._sent:
+            self._sent = len(self.results)
+            self.files_found.emit(self.results, self._sent)
+
+
+class IndexWorker(QObject):
+    """文件名索引工作者，依次为每个根目录建立或刷新索引"""
+
+    # 当前处理的根目录
+    progress = pyqtSignal(str)
+    # 全部完成: {根目录: RefreshStats}
+    finished = pyqtSignal(object)
+
+    def __init__(self, roots, rebuild=False):
+        """
+        Args:
+            roots: 根目录列表
+            rebuild: True 表示清空重建，False 表示刷新
+        """
+        super().__init__()
+        self.roots = list(roots)
+        self.rebuild = rebuild
+        self.results = {}
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消，可从任意线程调用"""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+
+    def run(self):
+        """建立或刷新索引，结束时总会发出 finished 信号"""
+        try:
+            for root in self.roots:
+                if self.is_cancelled():
+                    break
+                if not os.path.isdir(root):
+                    continue
+                self.progress.emit(root)
+                try:
+                    with FileIndex(root) as index:
+                        if self.rebuild:
+                            stats = index.rebuild(cancel=self.is_cancelled)
+                        else:
+                            stats = index.refresh(cancel=self.is_cancelled)
+                    self.results[root] = stats
+                except Exception as e:
+                    print(f"建立索引失败: {root} - {str(e)}")
+        finally:
+            self.finished.emit(self.results)
+
+
+def start_worker_thread(worker):
+    """
+    创建 QThread 并在其中运行工作者
+
+    Returns:
+        已启动的 QThread；工作者结束后线程自动退出
+    """
+    thread = QThread()
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    worker.finished.connect(thread.quit)
+    thread.start()
+    return thread
@@ -11,6 +11,7 @@ os.environ['QT_DEBUG_PLUGINS'] = '0'
 os.environ['QT_XCB_SCREEN_SCALING_FACTOR'] = '1'
 
 import pytest
+import datetime
 import tempfile
 from pathlib import Path
 
@@ -86,6 +87,20 @@ def sample_directory_structure():
         yield base
 
 
+@pytest.fixture
+def result_mtime():
+    """Modification time used for search results: 2026-01-02 midday local time"""
+    return datetime.datetime(2026, 1, 2, 12).timestamp()
+
+
+@pytest.fixture
+def add_result(result_mtime):
+    """Provide a helper that adds a result to a ResultStore the way the search worker does"""
+    def add(store, path, size=2048, keywords=()):
+        return store.add(path, os.path.basename(path), size, result_mtime, keywords)
+    return add
+
+
 @pytest.fixture
 def mock_search_result():
     """Provide mock search result"""
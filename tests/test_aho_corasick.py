@@ -0,0 +1,62 @@
+"""
+Unit Tests: Aho-Corasick Matcher (components.aho_corasick)
+Tests for the multi-pattern automaton used by large keyword lists
+"""
+
+import sys
+import os
+import random
+import pytest
+
+# Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.aho_corasick import AhoCorasick
+
+
+class TestAhoCorasick:
+    """Aho-Corasick automaton tests"""
+
+    def test_finds_all_patterns(self):
+        """Test every occurring pattern is reported"""
+        automaton = AhoCorasick(["he", "she", "his", "hers"])
+        found = {automaton.patterns[i] for i in automaton.find("ushers")}
+        assert found == {"he", "she", "hers"}
+
+    def test_no_match(self):
+        """Test text without patterns returns an empty set"""
+        automaton = AhoCorasick(["abc", "xyz"])
+        assert automaton.find("nothing here") == set()
+
+    def test_overlapping_and_nested_patterns(self):
+        """Test patterns that are suffixes of other patterns"""
+        automaton = AhoCorasick(["a", "aa", "aaa", "ba"])
+        found = {automaton.patterns[i] for i in automaton.find("baaa")}
+        assert found == {"a", "aa", "aaa", "ba"}
+
+    def test_chinese_patterns(self):
+        """Test CJK patterns are matched"""
+        automaton = AhoCorasick(["报告", "财务", "草稿"])
+        found = {automaton.patterns[i] for i in automaton.find("2025年度财务报告.xlsx")}
+        assert found == {"报告", "财务"}
+
+    def test_duplicate_patterns(self):
+        """Test duplicate patterns report both ids"""
+        automaton = AhoCorasick(["pn1", "pn1"])
+        assert automaton.find("pn1.pdf") == {0, 1}
+
+    def test_agrees_with_substring_search(self):
+        """Test results agree with a brute-force substring check"""
+        rng = random.Random(7)
+        patterns = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(60)]
+        automaton = AhoCorasick(patterns)
+        for _ in range(300):
+            text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 15)))
+            expected = {i for i, p in enumerate(patterns) if p in text}
+            assert automaton.find(text) == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,346 @@
+"""
+Unit Tests: Content Search Module (components.content_search)
+Tests that document text is extracted once per file and matched against all keywords
+"""
+
+import sys
+import os
+import time
+import pytest
+from pathlib import Path
+
+# Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.content_search import (
+    ContentSearcher, ContentPipeline, resolve_process_count, SKIP_TIMEOUT, SKIP_MEMORY, SKIP_CRASHED,
+    SKIP_TOO_LARGE
+)
+from components.search_logic import CompiledQuery, search_content, extract_text
+from components.text_cache import TextCache
+from components.workers import SearchWorker
+
+
+@pytest.fixture
+def docx_file(temp_dir):
+    """A DOCX document mentioning a few of the keywords"""
+    from docx import Document
+    path = Path(temp_dir) / "minutes.docx"
+    doc = Document()
+    doc.add_paragraph("Meeting minutes: budget approved for project code07 and code21")
+    doc.save(str(path))
+    return path
+
+
+class TestContentSearcher:
+    """ContentSearcher tests"""
+
+    def test_one_extraction_for_many_keywords(self, docx_file):
+        """Test 50 keywords cost a single extraction"""
+        keywords = [f"code{i:02d}" for i in range(50)] + ["budget"]
+        searcher = ContentSearcher(CompiledQuery(keywords))
+
+        matched = searcher.match(docx_file)
+        assert matched == ["code07", "code21", "budget"]
+        assert searcher.extractor_calls == 1
+
+    def test_matches_per_keyword_search(self, docx_file):
+        """Test the result equals calling search_content once per keyword"""
+        keywords = ["budget", "+meeting +approved", "project|program", "-minutes", '"code21"', "bud*ed"]
+        searcher = ContentSearcher(CompiledQuery(keywords))
+        expected = [kw for kw in keywords if search_content(docx_file, kw)]
+        assert searcher.match(docx_file) == expected
+
+    def test_keyword_subset(self, docx_file):
+        """Test only the requested keywords are evaluated"""
+        searcher = ContentSearcher(CompiledQuery(["budget", "meeting", "missing"]))
+        assert searcher.match(docx_file, ["missing", "meeting"]) == ["meeting"]
+        assert searcher.match(docx_file, []) == []
+        assert searcher.extractor_calls == 1
+
+    def test_invalid_wildcard_only_fails_that_keyword(self, temp_dir):
+        """Test a keyword that cannot be compiled does not hide other matches"""
+        path = Path(temp_dir) / "notes.txt"
+        path.write_text("alpha beta")
+        searcher = ContentSearcher(CompiledQuery(["alpha", "(*"]))
+        assert searcher.match(path) == ["alpha"]
+
+    def test_invalid_wildcard_in_streamed_docx(self, temp_dir):
+        """Test an invalid wildcard does not stop a streamed DOCX from matching other keywords"""
+        from docx import Document
+        path = Path(temp_dir) / "long.docx"
+        doc = Document()
+        doc.add_paragraph("budget")
+        for i in range(40):
+            doc.add_paragraph(f"paragraph {i} of filler text for the early exit check")
+        doc.save(str(path))
+        searcher = ContentSearcher(CompiledQuery(["budget", "(*"]))
+        assert searcher.match(path) == ["budget"]
+
+    def test_unsupported_type(self, temp_dir):
+        """Test unsupported files are skipped without extraction"""
+        path = Path(temp_dir) / "image.png"
+        path.write_bytes(b"budget")
+        searcher = ContentSearcher(CompiledQuery(["budget"]))
+        assert searcher.match(path) == []
+        assert searcher.extractor_calls == 0
+
+    def test_cache_hit_skips_extraction(self, docx_file, temp_dir):
+        """Test cached documents are not extracted again"""
+        with TextCache(1 << 20, db_path=Path(temp_dir) / "cache.sqlite3") as cache:
+            ContentSearcher(CompiledQuery(["budget"]), cache).match(docx_file)
+            searcher = ContentSearcher(CompiledQuery(["budget"]), cache)
+            assert searcher.match(docx_file) == ["budget"]
+            assert searcher.extractor_calls == 0
+
+
+class TestWorkerContentSearch:
+    """SearchWorker content search tests"""
+
+    def test_worker_extracts_each_file_once(self, docx_file):
+        """Test a content search with many keywords extracts every file once"""
+        keywords = [f"code{i:02d}" for i in range(50)]
+        worker = SearchWorker([str(docx_file.parent)], keywords, search_mode="content")
+        worker.run()
+        assert worker.content_searcher.extractor_calls == 1
+        assert [kw for kw, files in worker.keyword_results.items() if files] == ["code07", "code21"]
+
+    def test_both_mode_skips_extraction_when_name_matches_all(self, docx_file):
+        """Test no extraction is needed when the file name already matches every keyword"""
+        worker = SearchWorker([str(docx_file.parent)], ["minutes"], search_mode="both")
+        worker.run()
+        assert worker.content_searcher.extractor_calls == 0
+        assert len(worker.keyword_results["minutes"]) == 1
+
+    def test_both_mode_combines_name_and_content(self, docx_file):
+        """Test name hits and content hits are merged in keyword order"""
+        worker = SearchWorker([str(docx_file.parent)], ["budget", "minutes", "absent"],
+                              search_mode="both")
+        worker.run()
+        assert worker.content_searcher.extractor_calls == 1
+        assert len(worker.keyword_results["budget"]) == 1
+        assert len(worker.keyword_results["minutes"]) == 1
+        assert worker.keyword_results["absent"] == []
+
+    def test_all_text_files(self, temp_dir):
+        """Test the all-text option adds text files with unknown extensions and skips binaries"""
+        root = Path(temp_dir)
+        (root / "README.md").write_text("budget overview")
+        (root / "config.json").write_text('{"budget": 1}')
+        (root / "archive.dat").write_bytes(b"\x1f\x8b\x08budget")
+        (root / "dump.log").write_bytes(b"budget\x00\x00\x00")
+
+        default = SearchWorker([temp_dir], ["budget"], search_mode="content")
+        default.run()
+        all_text = SearchWorker([temp_dir], ["budget"], search_mode="content", all_text=True)
+        all_text.run()
+
+        assert default.keyword_results["budget"] == []
+        assert default.content_searcher.binary_skipped == 1
+        assert sorted(f["name"] for f in all_text.keyword_results["budget"]) == [
+            "README.md", "config.json"]
+        assert all_text.content_searcher.binary_skipped == 2
+
+    def test_all_text_routes_documents_by_magic(self, temp_dir):
+        """Test the all-text option extracts a renamed PDF through its magic bytes"""
+        import pymupdf
+        doc = pymupdf.open()
+        doc.new_page().insert_text((72, 72), "quarterly budget")
+        doc.save(str(Path(temp_dir) / "scan.dat"))
+        doc.close()
+
+        default = SearchWorker([temp_dir], ["budget"], search_mode="content")
+        default.run()
+        all_text = SearchWorker([temp_dir], ["budget"], search_mode="content", all_text=True)
+        all_text.run()
+
+        assert default.keyword_results["budget"] == []
+        assert [f["name"] for f in all_text.keyword_results["budget"]] == ["scan.dat"]
+        assert all_text.content_searcher.extractor_calls == 1
+        assert all_text.content_searcher.binary_skipped == 0
+
+    def test_records_document_timings(self, docx_file, temp_dir):
+        """Test extraction time is recorded per document but not for plain text"""
+        (Path(temp_dir) / "notes.txt").write_text("budget")
+        worker = SearchWorker([temp_dir], ["budget"], search_mode="content")
+        worker.run()
+        assert [path for path, _ in worker.extract_timings] == [str(docx_file)]
+        assert worker.extract_timings[0][1] >= 0
+
+    def test_large_pdf_skipped(self, temp_dir):
+        """Test PDFs above the size cap are skipped but still match by file name"""
+        path = Path(temp_dir) / "scan budget.pdf"
+        path.write_bytes(b"%PDF-1.4 budget" + b"0" * (2 * 1024 * 1024))
+        worker = SearchWorker([temp_dir], ["budget", "scan"], search_mode="both", pdf_max_mb=1)
+        worker.run()
+        assert worker.skipped == [(str(path), SKIP_TOO_LARGE)]
+        assert worker.content_searcher.extractor_calls == 0
+        assert len(worker.keyword_results["budget"]) == 1
+
+    def test_scan_depth(self, temp_dir):
+        """Test text past the default depth is only found when scanning whole files"""
+        path = Path(temp_dir) / "app.log"
+        path.write_text("日志" * 2500 + " needle", encoding="utf-8")
+
+        shallow = SearchWorker([temp_dir], ["needle"], search_mode="content")
+        shallow.run()
+        deep = SearchWorker([temp_dir], ["needle"], search_mode="content", scan_chars=0)
+        deep.run()
+        assert shallow.keyword_results["needle"] == []
+        assert len(deep.keyword_results["needle"]) == 1
+
+
+def misbehaving_extractor(path):
+    """Extractor run in the child process that hangs, crashes or exhausts memory by file name"""
+    name = os.path.basename(path)
+    if name.startswith("hang"):
+        time.sleep(60)
+    elif name.startswith("crash"):
+        os._exit(3)
+    elif name.startswith("huge"):
+        blocks = []
+        while True:
+            blocks.append(bytearray(64 * 1024 * 1024))
+    return extract_text(path)
+
+
+@pytest.fixture
+def docx_tree(temp_dir):
+    """Several DOCX documents in nested folders"""
+    from docx import Document
+    root = Path(temp_dir) / "docs"
+    for i in range(6):
+        folder = root / f"part{i % 2}"
+        folder.mkdir(parents=True, exist_ok=True)
+        doc = Document()
+        doc.add_paragraph(f"report {i:02d} " + ("budget" if i % 3 else "forecast"))
+        doc.save(str(folder / f"report{i:02d}.docx"))
+    (root / "notes.txt").write_text("budget notes")
+    return root
+
+
+class TestContentPipeline:
+    """Process-pool extraction pipeline tests"""
+
+    def test_resolve_process_count(self):
+        """Test zero means one process per CPU"""
+        assert resolve_process_count(3) == 3
+        assert resolve_process_count(0) == max(1, os.cpu_count() or 1)
+
+    def test_backpressure(self, docx_tree):
+        """Test no more files are in flight than there are processes"""
+        pipeline = ContentPipeline(2)
+        results = []
+        try:
+            for i, path in enumerate(sorted(docx_tree.rglob("*.docx"))):
+                results.extend(pipeline.submit(i, path))
+                assert len(pipeline) <= 2
+            results.extend(pipeline.drain())
+        finally:
+            pipeline.close()
+        assert sorted(token for token, _, _ in results) == list(range(6))
+        assert all("report" in text and reason is None for _, text, reason in results)
+        assert pipeline.pool_starts == 2
+
+    def test_worker_results_match_in_thread_search(self, docx_tree):
+        """Test the pipeline gives the same results, in walk order, as in-thread extraction"""
+        def run(processes):
+            worker = SearchWorker([str(docx_tree)], ["budget", "forecast", "report"],
+                                  search_mode="content", processes=processes)
+            worker.run()
+            return worker
+
+        serial = run(1)
+        pooled = run(2)
+        assert pooled.pipeline is not None and pooled.pipeline.submitted == 6
+        assert serial.keyword_results == pooled.keyword_results
+        assert list(serial.results) == list(pooled.results)
+        assert len(pooled.keyword_results["budget"]) == 5
+
+    def test_costly_formats_submitted_first(self, docx_tree, monkeypatch):
+        """Test cheap files run in-thread first and PDFs are submitted before DOCX files"""
+        import pymupdf
+        folder = docx_tree / "part0"
+        doc = pymupdf.open()
+        doc.new_page().insert_text((72, 72), "report zz budget")
+        doc.save(str(folder / "zz.pdf"))
+        doc.close()
+        (folder / "aa.txt").write_text("report budget")
+
+        submitted = []
+        original = ContentPipeline.submit
+        monkeypatch.setattr(ContentPipeline, "submit", lambda self, token, path: (
+            submitted.append(Path(path).name), original(self, token, path))[1])
+        worker = SearchWorker([str(folder)], ["budget"], search_mode="content", processes=2)
+        worker.run()
+
+        assert submitted == ["zz.pdf", "report00.docx", "report02.docx", "report04.docx"]
+        assert [f["name"] for f in worker.keyword_results["budget"]] == [
+            "aa.txt", "report02.docx", "report04.docx", "zz.pdf"]
+
+
+class TestExtractionWatchdog:
+    """Per-file timeout and crash isolation tests"""
+
+    @pytest.fixture
+    def bad_files(self, docx_tree):
+        """The DOCX tree plus files that make the test extractor misbehave"""
+        for name in ("hang.txt", "crash.txt", "huge.txt"):
+            (docx_tree / name).write_text("budget")
+        return docx_tree
+
+    def run_pipeline(self, paths, **kwargs):
+        pipeline = ContentPipeline(1, extractor=misbehaving_extractor, **kwargs)
+        results = {}
+        try:
+            for path in paths:
+                for token, text, reason in pipeline.submit(path.name, path):
+                    results[token] = (text, reason)
+            for token, text, reason in pipeline.drain():
+                results[token] = (text, reason)
+        finally:
+            pipeline.close()
+        return pipeline, results
+
+    def test_timeout_and_crash_are_skipped(self, bad_files):
+        """Test a hanging and a crashing file are skipped while later files are still extracted"""
+        paths = [bad_files / "hang.txt", bad_files / "crash.txt",
+                 bad_files / "part0" / "report00.docx"]
+        start = time.monotonic()
+        pipeline, results = self.run_pipeline(paths, timeout=2)
+
+        assert time.monotonic() - start < 30
+        assert results["hang.txt"] == (None, SKIP_TIMEOUT)
+        assert results["crash.txt"] == (None, SKIP_CRASHED)
+        assert "report 00" in results["report00.docx"][0]
+        assert pipeline.pool_starts == 3
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="memory limit needs the resource module")
+    def test_memory_limit(self, bad_files):
+        """Test a file that exhausts the memory limit is skipped"""
+        _, results = self.run_pipeline([bad_files / "huge.txt", bad_files / "notes.txt"],
+                                       timeout=30, memory_limit=1024 * 1024 * 1024)
+        assert results["huge.txt"] == (None, SKIP_MEMORY)
+        assert results["notes.txt"] == ("budget notes", None)
+
+    def test_worker_reports_skipped_files(self, bad_files, monkeypatch):
+        """Test the search continues past a crashed extraction and lists the skipped file"""
+        monkeypatch.setattr("components.workers.ContentPipeline",
+                            lambda *args, **kwargs: ContentPipeline(
+                                *args, **dict(kwargs, extractor=misbehaving_extractor)))
+        (bad_files / "crash.docx").write_bytes(b"not a document")
+        worker = SearchWorker([str(bad_files)], ["budget", "crash"], search_mode="both",
+                              processes=1, extract_timeout=10)
+        worker.run()
+
+        assert worker.skipped == [(str(bad_files / "crash.docx"), SKIP_CRASHED)]
+        # The file name still matches even though its content was skipped
+        assert [f["name"] for f in worker.keyword_results["crash"]] == ["crash.docx", "crash.txt"]
+        # 4 budget reports, notes.txt and the three .txt files read in-thread
+        assert len(worker.keyword_results["budget"]) == 8
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
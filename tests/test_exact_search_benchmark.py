@@ -0,0 +1,105 @@
+"""
+Benchmark Tests: Hash-lookup exact search (components.search_logic.ExactQuery)
+Compares the per-keyword exact_match_filename loop with the ExactQuery hash lookup
+on a generated directory tree
+"""
+
+import sys
+import os
+import time
+import random
+import pytest
+from pathlib import Path
+
+# Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.search_logic import exact_match_filename, ExactQuery, filename_stem
+from components.traversal import walk_entries
+from components.workers import SearchWorker
+
+
+def generate_tree(base, file_count, dirs=10):
+    """Generate a tree of part-number style files"""
+    rng = random.Random(42)
+    names = []
+    for i in range(file_count):
+        folder = Path(base) / f"batch_{i % dirs:02d}"
+        folder.mkdir(exist_ok=True)
+        name = f"PN{rng.randint(100000, 999999)}{rng.choice(['.pdf', '.dwg', '.xlsx', ''])}"
+        (folder / name).touch()
+        names.append(name)
+    return names
+
+
+class TestExactQuery:
+    """ExactQuery behaviour tests"""
+
+    def test_agrees_with_exact_match_filename(self):
+        """Test hash lookup agrees with the per-keyword comparison"""
+        keywords = ["report", "Report", " budget ", "a.b", ".bashrc", "trailing."]
+        names = ["report.xlsx", "REPORT.pdf", "budget.docx", "a.b.txt", ".bashrc",
+                 "trailing.", "annual_report.xlsx", "noext"]
+        query = ExactQuery(keywords)
+        for name in names:
+            expected = [kw for kw in query.keywords if exact_match_filename(name, kw)]
+            assert query.match(name) == expected
+
+    def test_stem_matches_pathlib(self):
+        """Test filename_stem follows Path.stem"""
+        for name in ["a.txt", ".bashrc", "archive.tar.gz", "noext", "trailing.", "报告.xlsx"]:
+            assert filename_stem(name) == Path(name).stem
+
+    def test_case_variants_all_reported(self):
+        """Test every keyword spelling that normalizes equally is reported"""
+        query = ExactQuery(["报告", "REPORT", "report"])
+        assert query.match("Report.pdf") == ["REPORT", "report"]
+        assert query.match("报告.xlsx") == ["报告"]
+
+
+@pytest.mark.slow
+def test_exact_search_benchmark(temp_dir):
+    """Hash lookup must beat the per-keyword loop by a wide margin on a generated tree"""
+    file_count = int(os.environ.get("FILEGATHER_BENCH_FILES", "500"))
+    names = generate_tree(temp_dir, file_count)
+    rng = random.Random(1)
+    keywords = [filename_stem(name) for name in rng.sample(names, 100)]
+    keywords += [f"PN{rng.randint(100000, 999999)}" for _ in range(900)]
+    keywords = list(dict.fromkeys(keywords))
+
+    entries = [e for listing in walk_entries(temp_dir) for e in listing.files]
+
+    start = time.perf_counter()
+    legacy = {}
+    for entry in entries:
+        for keyword in keywords:
+            if exact_match_filename(entry.name, keyword):
+                legacy.setdefault(keyword, []).append(entry.path)
+    legacy_time = time.perf_counter() - start
+
+    query = ExactQuery(keywords)
+    start = time.perf_counter()
+    indexed = {}
+    for entry in entries:
+        for keyword in query.match(entry.name):
+            indexed.setdefault(keyword, []).append(entry.path)
+    indexed_time = time.perf_counter() - start
+
+    print(f"\n{len(entries)} files x {len(keywords)} keywords: "
+          f"per-keyword {legacy_time:.3f}s, hash lookup {indexed_time:.4f}s, "
+          f"speedup {legacy_time / max(indexed_time, 1e-9):.0f}x")
+    assert indexed == legacy
+    assert indexed_time * 50 < legacy_time
+
+    # 端到端：精确查找工作者与逐关键词比较结果一致
+    worker = SearchWorker([temp_dir], keywords, exact=True)
+    worker.run()
+    assert {kw: sorted(info['path'] for info in files)
+            for kw, files in worker.keyword_results.items() if files} == \
+        {kw: sorted(paths) for kw, paths in legacy.items()}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short", "-s"])
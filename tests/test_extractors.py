@@ -0,0 +1,111 @@
+"""
+Unit Tests: Extractor Registry Module (components.extractors)
+Tests for format registration, capability lookup and dispatch through the registry
+"""
+
+import sys
+import os
+import pytest
+from pathlib import Path
+
+# Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.extractors import Extractor, ExtractorRegistry
+from components.search_logic import (
+    EXTRACTORS, TEXT_EXTENSIONS, compile_keyword, extract_text, search_content
+)
+
+
+def upper_extractor(file_path, limit=3000, matchers=(), shout=False):
+    """Test extractor that returns the file text, optionally upper-cased"""
+    text = Path(file_path).read_text()[:limit or None]
+    return text.upper() if shout else text
+
+
+@pytest.fixture
+def registry():
+    """An empty registry with one test format"""
+    registry = ExtractorRegistry()
+    registry.register(Extractor('notes', upper_extractor, ['.notes', '.NB'], magic=[b'NOTE'],
+                                cost=3, options=['shout']))
+    return registry
+
+
+class TestExtractorRegistry:
+    """ExtractorRegistry tests"""
+
+    def test_lookup_by_extension(self, registry):
+        """Test lookups are case-insensitive and unknown extensions return None"""
+        assert registry.for_extension('.NOTES').name == 'notes'
+        assert registry.for_extension('.nb').name == 'notes'
+        assert registry.for_extension('.pdf') is None
+        assert '.Notes' in registry
+        assert registry.cost('.notes') == 3
+        assert registry.cost('.pdf') == 0
+
+    def test_reregister_replaces(self, registry):
+        """Test registering a format again drops the extensions it no longer declares"""
+        registry.register(Extractor('notes', upper_extractor, ['.notes']))
+        assert registry.for_extension('.nb') is None
+        assert [e.name for e in registry] == ['notes']
+        registry.unregister('notes')
+        assert registry.for_extension('.notes') is None
+
+    def test_for_head(self, registry):
+        """Test magic bytes identify a format only when exactly one format matches"""
+        registry.register(Extractor('memo', upper_extractor, ['.memo'], magic=[b'NOTE']))
+        registry.register(Extractor('pdf', upper_extractor, ['.pdf'], magic=[b'%PDF-']))
+        assert registry.for_head(b'%PDF-1.7').name == 'pdf'
+        assert registry.for_head(b'NOTE 1') is None
+        assert registry.for_head(b'plain') is None
+
+    def test_extract_passes_declared_options(self, registry, temp_dir):
+        """Test only declared options and, for streaming formats, matchers are passed"""
+        path = Path(temp_dir) / "a.notes"
+        path.write_text("hello")
+        extractor = registry.for_extension('.notes')
+        assert extractor.extract(path, limit=0, shout=True, max_pages=3) == "HELLO"
+        assert extractor.extract(path, [compile_keyword("x")], limit=2) == "he"
+
+    def test_extensions_by_capability(self):
+        """Test the built-in formats declare their capabilities"""
+        assert sorted(EXTRACTORS.extensions(needs_process=True)) == ['.docx', '.pdf', '.xlsx']
+        assert set(EXTRACTORS.extensions(name='text')) == set(TEXT_EXTENSIONS)
+        assert EXTRACTORS.cost('.pdf') > EXTRACTORS.cost('.docx') > EXTRACTORS.cost('.txt')
+
+
+class TestRegistryDispatch:
+    """search_content and extract_text dispatch tests"""
+
+    @pytest.fixture
+    def notes_format(self):
+        """Register the test format in the shared registry for one test"""
+        EXTRACTORS.register(Extractor('notes', upper_extractor, ['.notes'], options=['shout']))
+        yield
+        EXTRACTORS.unregister('notes')
+
+    def test_registered_format_is_searched(self, notes_format, temp_dir):
+        """Test a newly registered format is used by extract_text and search_content"""
+        path = Path(temp_dir) / "todo.notes"
+        path.write_text("Call the auditor")
+        assert extract_text(path) == "Call the auditor"
+        assert search_content(path, "auditor") is True
+        assert search_content(path, "lawyer") is False
+
+    def test_magic_routes_unknown_extension(self, temp_dir):
+        """Test all_text routes a PDF with an unknown extension to the PDF extractor"""
+        import pymupdf
+        path = Path(temp_dir) / "scan.dat"
+        doc = pymupdf.open()
+        doc.new_page().insert_text((72, 72), "quarterly budget")
+        doc.save(str(path))
+        doc.close()
+        assert search_content(path, "budget") is False
+        assert search_content(path, "budget", all_text=True) is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,275 @@
+"""
+Unit Tests: Filename Index Module (components.file_index)
+Tests for building, refreshing and querying the per-root SQLite filename index
+"""
+
+import sys
+import os
+import time
+import shutil
+import sqlite3
+import pytest
+from pathlib import Path
+
+# Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.file_index import FileIndex, RefreshStats, index_path_for, describe_age
+from components.workers import SearchWorker
+
+
+@pytest.fixture
+def data_dir(temp_dir, monkeypatch):
+    """Keep index databases out of the user's home directory"""
+    path = Path(temp_dir) / "appdata"
+    monkeypatch.setenv("FILEGATHER_DATA_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def index_root(temp_dir, data_dir):
+    """A small tree to index"""
+    root = Path(temp_dir) / "root"
+    (root / "docs" / "old").mkdir(parents=True)
+    (root / "report_2025.txt").write_text("a")
+    (root / "docs" / "Budget.XLSX").write_bytes(b"x" * 50)
+    (root / "docs" / "old" / "report_2019.doc").write_text("b")
+    return root
+
+
+def age_directories(root, seconds=3600):
+    """Move every directory's mtime into the past so it is outside the racy window"""
+    past = time.time() - seconds
+    for path, dirs, _ in os.walk(root):
+        os.utime(path, (past, past))
+
+
+def run_worker(worker):
+    """Run a SearchWorker synchronously and return its results"""
+    results = {}
+    worker.finished.connect(lambda found: results.update(
+        files=[info['path'] for info in found], kw=found.keyword_results()))
+    worker.run()
+    return results
+
+
+class TestFileIndex:
+    """FileIndex tests"""
+
+    def test_index_path_per_root(self, temp_dir, data_dir):
+        """Test every root gets its own database under the data directory"""
+        first = index_path_for(os.path.join(temp_dir, "a"))
+        second = index_path_for(os.path.join(temp_dir, "b"))
+        assert first != second
+        assert first.parent == data_dir / "index"
+
+    def test_not_built(self, index_root):
+        """Test a fresh index reports it does not exist and is stale"""
+        with FileIndex(index_root) as index:
+            assert not index.exists()
+            assert index.updated_at() is None
+            assert index.is_stale()
+
+    def test_rebuild_records_files(self, index_root):
+        """Test rebuild stores every file with its metadata"""
+        with FileIndex(index_root) as index:
+            stats = index.rebuild()
+            assert stats.files == 3
+            assert index.exists()
+            assert index.file_count() == 3
+            assert not index.is_stale()
+
+            entries = {e.name: e for listing in index.iter_listings() for e in listing.files}
+        budget = entries["Budget.XLSX"]
+        assert budget.size == 50
+        assert budget.suffix == ".xlsx"
+        assert budget.path == str(index_root / "docs" / "Budget.XLSX")
+        assert budget.mtime == pytest.approx((index_root / "docs" / "Budget.XLSX").stat().st_mtime)
+
+    def test_query_filters(self, index_root):
+        """Test recursion, size and extension filters are applied in the query"""
+        with FileIndex(index_root) as index:
+            index.rebuild()
+            top = [e.name for listing in index.iter_listings(recursive=False) for e in listing.files]
+            big = [e.name for listing in index.iter_listings(size_range=(10, float('inf')))
+                   for e in listing.files]
+            docs = [e.name for listing in index.iter_listings(extensions=[".doc"])
+                    for e in listing.files]
+        assert top == ["report_2025.txt"]
+        assert big == ["Budget.XLSX"]
+        assert docs == ["report_2019.doc"]
+
+    def test_refresh_applies_changes(self, index_root):
+        """Test refresh picks up added, removed and deleted-directory changes"""
+        with FileIndex(index_root) as index:
+            index.rebuild()
+            (index_root / "new.txt").write_text("n")
+            (index_root / "report_2025.txt").unlink()
+            (index_root / "docs" / "old" / "report_2019.doc").unlink()
+            (index_root / "docs" / "old").rmdir()
+
+            index.refresh()
+            names = sorted(e.name for listing in index.iter_listings() for e in listing.files)
+        assert names == ["Budget.XLSX", "new.txt"]
+
+    def test_cancelled_rebuild_keeps_old_index(self, index_root):
+        """Test a cancelled rebuild rolls back to the previous contents"""
+        with FileIndex(index_root) as index:
+            index.rebuild()
+            index.rebuild(cancel=lambda: True)
+            assert index.file_count() == 3
+
+    def test_describe_age(self):
+        """Test age descriptions"""
+        now = time.time()
+        assert describe_age(None) == "未建立"
+        assert describe_age(now, now) == "刚刚"
+        assert describe_age(now - 7200, now) == "2 小时前"
+
+
+class TestIncrementalRefresh:
+    """Incremental refresh tests"""
+
+    def test_unchanged_tree_only_stats_directories(self, index_root):
+        """Test refreshing an unchanged tree costs one stat per directory"""
+        age_directories(index_root)
+        with FileIndex(index_root) as index:
+            index.rebuild()
+            stats = index.refresh()
+            assert index.file_count() == 3
+
+        assert isinstance(stats, RefreshStats)
+        assert stats.dirs_rescanned == 0
+        assert stats.dirs_skipped == 3
+        assert stats.syscalls == 3
+        assert stats.elapsed >= 0
+
+    def test_only_changed_directory_rescanned(self, index_root):
+        """Test a new file only causes its own directory to be listed again"""
+        age_directories(index_root)
+        with FileIndex(index_root) as index:
+            index.rebuild()
+            (index_root / "docs" / "report_new.txt").write_text("n")
+            stats = index.refresh()
+            names = [e.name for listing in index.iter_listings() for e in listing.files]
+
+        assert stats.dirs_rescanned == 1
+        assert stats.dirs_skipped == 2
+        assert "report_new.txt" in names
+
+    def test_new_subdirectory_is_indexed(self, index_root):
+        """Test a new sub directory below an unchanged parent chain is picked up"""
+        age_directories(index_root)
+        with FileIndex(index_root) as index:
+            index.rebuild()
+            (index_root / "docs" / "old" / "deeper").mkdir()
+            (index_root / "docs" / "old" / "deeper" / "x.txt").write_text("x")
+            stats = index.refresh()
+            assert index.file_count() == 4
+        assert stats.dirs_rescanned == 2
+
+    def test_deleted_subtree_pruned(self, index_root):
+        """Test removing a directory prunes it and everything below it"""
+        (index_root / "docs" / "old" / "deeper").mkdir()
+        (index_root / "docs" / "old" / "deeper" / "x.txt").write_text("x")
+        age_directories(index_root)
+        with FileIndex(index_root) as index:
+            index.rebuild()
+            shutil.rmtree(index_root / "docs" / "old")
+            stats = index.refresh()
+            names = sorted(e.name for listing in index.iter_listings() for e in listing.files)
+
+        assert stats.dirs_pruned == 2
+        assert names == ["Budget.XLSX", "report_2025.txt"]
+
+    def test_recent_directory_rescanned_again(self, index_root):
+        """Test directories modified inside the racy window are listed again next time"""
+        with FileIndex(index_root) as index:
+            index.rebuild()
+            stats = index.refresh()
+        assert stats.dirs_rescanned == 3
+
+    def test_old_schema_is_rebuilt(self, index_root):
+        """Test an index written with an older schema is replaced on rebuild"""
+        db_path = index_path_for(index_root)
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE dirs (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE);
+            INSERT INTO meta VALUES ('schema_version', '1'), ('updated_at', '0');
+        """)
+        conn.close()
+
+        with FileIndex(index_root) as index:
+            assert not index.exists()
+            index.refresh()
+            assert index.exists()
+            assert index.file_count() == 3
+
+
+class TestIndexedSearch:
+    """SearchWorker index integration tests"""
+
+    def test_index_matches_walk(self, index_root):
+        """Test indexed filename search returns the same files as a disk walk"""
+        with FileIndex(index_root) as index:
+            index.rebuild()
+
+        walked = run_worker(SearchWorker([str(index_root)], ["report"]))
+        worker = SearchWorker([str(index_root)], ["report"], use_index=True)
+        indexed = run_worker(worker)
+
+        assert worker.indexed_roots == [str(index_root)]
+        assert sorted(indexed["files"]) == sorted(walked["files"])
+        assert len(indexed["kw"]["report"]) == 2
+
+    def test_index_used_without_disk_walk(self, index_root):
+        """Test indexed search reports files from the index, not from disk"""
+        with FileIndex(index_root) as index:
+            index.rebuild()
+        (index_root / "report_2025.txt").unlink()
+
+        worker = SearchWorker([str(index_root)], ["report_2025"], exact=True, use_index=True)
+        results = run_worker(worker)
+        assert worker.traversal_stats.files == 0
+        assert len(results["kw"]["report_2025"]) == 1
+
+    def test_unindexed_root_falls_back_to_walk(self, index_root):
+        """Test roots without an index are still walked"""
+        worker = SearchWorker([str(index_root)], ["report"], use_index=True)
+        results = run_worker(worker)
+        assert worker.indexed_roots == []
+        assert len(results["kw"]["report"]) == 2
+
+    def test_content_mode_ignores_index(self, index_root):
+        """Test content searches never use the filename index"""
+        worker = SearchWorker([str(index_root)], ["a"], search_mode="content", use_index=True)
+        assert not worker.use_index
+
+
+@pytest.mark.slow
+def test_incremental_refresh_benchmark(temp_dir, data_dir):
+    """Compare a full rebuild with refreshing an unchanged tree"""
+    total = int(os.environ.get("FILEGATHER_BENCH_FILES", "5000"))
+    root = Path(temp_dir) / "tree"
+    for d in range(100):
+        folder = root / f"dir_{d:03d}"
+        folder.mkdir(parents=True)
+        for f in range(total // 100):
+            (folder / f"file_{f:05d}.txt").write_text("x")
+    age_directories(root)
+
+    with FileIndex(root) as index:
+        full = index.rebuild()
+        incremental = index.refresh()
+
+    print(f"\nrebuild: {full.as_dict()}\nrefresh: {incremental.as_dict()}")
+    assert incremental.dirs_rescanned == 0
+    assert incremental.syscalls == incremental.dirs_skipped == 101
+    assert incremental.elapsed < full.elapsed
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
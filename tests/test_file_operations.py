@@ -9,6 +9,7 @@ import pytest
 import tempfile
 from pathlib import Path
 import shutil
+from unittest.mock import MagicMock
 
 # Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
 os.environ['QT_QPA_PLATFORM'] = 'offscreen'
@@ -361,6 +362,19 @@ class TestDeleteFilesBatch:
             assert not folder1.exists()
             assert not file2.exists()
 
+    def test_delete_batch_returns_removed_paths(self):
+        """Test delete_files_batch reports every path that is gone, including missing ones"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            present = Path(tmpdir, "present.txt")
+            present.write_text("content")
+            missing = str(Path(tmpdir, "missing.txt"))
+
+            removed, error_files = delete_files_batch(MagicMock(), [str(present), missing])
+
+            assert removed == [str(present), missing]
+            assert len(error_files) == 1 and "missing.txt" in error_files[0]
+            assert not present.exists()
+
 
 class TestCalculateHash:
     """File hash calculation tests"""
@@ -0,0 +1,101 @@
+"""
+Unit Tests: File Sniffer Module (components.file_sniffer)
+Tests for telling text files from binary files by their first bytes
+"""
+
+import sys
+import os
+import pytest
+from pathlib import Path
+
+# Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.file_sniffer import (
+    sniff_bytes, sniff_file, KIND_TEXT, KIND_BINARY, SNIFF_BYTES
+)
+from components.search_logic import compile_keyword, scan_text_file, search_content
+
+
+class TestSniffBytes:
+    """sniff_bytes tests"""
+
+    @pytest.mark.parametrize("head", [
+        b"",
+        b"# Title\n\nSome *markdown* text\n",
+        b'{"name": "budget", "values": [1, 2, 3]}',
+        "配置文件：数据库地址\r\n".encode("gbk"),
+        b"\xef\xbb\xbfkey=value\n",
+        b"\x1b[31mERROR\x1b[0m disk full\n\tat line 3\f",
+    ])
+    def test_text(self, head):
+        """Test plain text in common encodings and with usual control characters is text"""
+        assert sniff_bytes(head) == KIND_TEXT
+
+    @pytest.mark.parametrize("head", [
+        b"\x89PNG\r\n\x1a\n" + b"x" * 100,
+        b"PK\x03\x04" + b"x" * 100,
+        b"%PDF-1.7\n",
+        b"\x7fELF\x02\x01\x01",
+        "utf-16 text".encode("utf-16"),
+        b"plain start\x00then a NUL",
+        bytes(range(1, 32)) * 10,
+    ])
+    def test_binary(self, head):
+        """Test magic numbers, NUL bytes and dense control characters mean binary"""
+        assert sniff_bytes(head) == KIND_BINARY
+
+    @pytest.mark.parametrize("head", [b"ID3 tag cleanup\n", b"RIFF,WAVE,budget\n", b"%PDF-1.7 notes\n"])
+    def test_ascii_signature_in_known_text(self, head):
+        """Test printable magics only mean binary when the extension is not a text format"""
+        assert sniff_bytes(head) == KIND_BINARY
+        assert sniff_bytes(head, known_text=True) == KIND_TEXT
+
+    def test_sniff_file_reads_head_only(self, temp_dir):
+        """Test only the first SNIFF_BYTES bytes decide the kind"""
+        path = Path(temp_dir) / "data.bin"
+        path.write_bytes(b"a" * SNIFF_BYTES + b"\x00" * 100)
+        assert sniff_file(path) == KIND_TEXT
+
+
+class TestSniffedScanning:
+    """Sniffing before text scanning tests"""
+
+    def test_binary_with_text_extension_skipped(self, temp_dir):
+        """Test a binary file named .txt is not scanned"""
+        path = Path(temp_dir) / "photo.txt"
+        path.write_bytes(b"\x89PNG\r\n\x1a\nbudget")
+        assert scan_text_file(path, [compile_keyword("budget")], skip_binary=True) is None
+        assert search_content(path, "budget") is False
+
+    @pytest.mark.parametrize("name, content", [
+        ("todo.txt", "ID3 tags still wrong, see budget\n"),
+        ("audio.csv", "RIFF,OggS,fLaC,budget\n"),
+        ("export.log", "GIF89a exports for the budget deck\n"),
+    ])
+    def test_text_starting_with_ascii_magic_searched(self, temp_dir, name, content):
+        """Test text files whose first line starts like a binary magic are still searched"""
+        path = Path(temp_dir) / name
+        path.write_text(content)
+        assert search_content(path, "budget") is True
+
+    def test_head_reused_as_first_block(self, temp_dir):
+        """Test the sniffed head is matched without reading the file again"""
+        path = Path(temp_dir) / "notes.txt"
+        path.write_text("budget " + "x" * 10000)
+        stream = scan_text_file(path, [compile_keyword("budget")], limit=0, skip_binary=True)
+        assert stream.result() == ["budget"]
+        assert stream.chars == SNIFF_BYTES
+
+    def test_unknown_extension_needs_all_text(self, temp_dir):
+        """Test unknown extensions are only searched with all_text"""
+        path = Path(temp_dir) / "deploy.yaml"
+        path.write_text("image: budget-service\n")
+        assert search_content(path, "budget") is False
+        assert search_content(path, "budget", all_text=True) is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -293,7 +293,46 @@ class TestErrorHandling:
         search_cancelled = True
         
         assert search_cancelled is True
-    
+
+    def test_cancel_keeps_search_buttons_disabled(self):
+        """Test cancelling leaves the search buttons disabled until the worker thread finishes"""
+        from components.functions.ui_interactions import cancel_search_action
+        window = Mock()
+        cancel_search_action(window)
+        assert window.cancel_search is True
+        window.search_worker.cancel.assert_called_once()
+        window.search_button.setEnabled.assert_not_called()
+        window.exact_search_button.setEnabled.assert_not_called()
+
+    def test_delete_rebuilds_keyword_results(self):
+        """Test deleting a file rebuilds each keyword's file list, counts and unfound list"""
+        from types import MethodType
+        from components.result_store import ResultStore
+        from components.functions.file_operations_ui import delete_files
+        from components.functions.results_manager import _update_keyword_summary
+
+        results = ResultStore(["a", "b"])
+        results.add("/data/a1.txt", "a1.txt", 1, 0, ["a"])
+        results.add("/data/b1.txt", "b1.txt", 1, 0, ["b"])
+        results.add("/data/a2.txt", "a2.txt", 1, 0, ["a"])
+        window = Mock()
+        window.search_results = results
+        window.results_model.remove_rows.side_effect = results.remove_rows
+        window._update_keyword_summary = MethodType(_update_keyword_summary, window)
+        window.keyword_results = results.keyword_results()
+
+        with patch('components.functions.file_operations_ui.QMessageBox') as message_box, \
+                patch('components.functions.file_operations_ui.delete_files_batch',
+                      return_value=(["/data/a1.txt"], [])):
+            message_box.warning.return_value = message_box.StandardButton.Ok
+            message_box.question.return_value = message_box.StandardButton.Yes
+            delete_files(window)
+
+        assert [f["path"] for f in window.keyword_results["a"]] == ["/data/a2.txt"]
+        assert [f["path"] for f in window.keyword_results["b"]] == ["/data/b1.txt"]
+        assert window.unfound_keywords == []
+        window._create_keyword_view_buttons.assert_called_once_with([])
+
     def test_handle_permission_errors(self):
         """Test handling permission errors"""
         restricted_path = "/restricted/path"
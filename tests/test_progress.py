@@ -0,0 +1,90 @@
+"""
+Unit Tests: Progress Reporter Module (components.progress)
+Tests for counter accumulation and timer-driven widget updates
+"""
+
+import sys
+import os
+import time
+import pytest
+
+# Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication, QLabel, QProgressBar
+
+from components.progress import ProgressReporter
+
+
+@pytest.fixture(scope="module")
+def app():
+    """A QApplication for the widgets"""
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def widgets(app):
+    """Progress bar, status, path and count labels"""
+    return QProgressBar(), QLabel(), QLabel(), QLabel()
+
+
+@pytest.fixture
+def reporter(widgets):
+    return ProgressReporter(*widgets)
+
+
+class TestProgressReporter:
+    """ProgressReporter tests"""
+
+    def test_counters_reach_widgets_only_on_refresh(self, widgets, reporter):
+        """Test counting does not touch the widgets until the timer refreshes them"""
+        bar, status, path, count = widgets
+        reporter.start("正在复制文件...", total=4, status_format="{files}/{total} {bytes}",
+                       count_format="已找到: {hits} 个文件")
+        assert status.text() == "正在复制文件..."
+        assert count.text() == "已找到: 0 个文件"
+        reporter.add_file(1024, path="/data/a.txt")
+        reporter.add_hits(2)
+        assert status.text() == "正在复制文件..."
+        reporter.refresh()
+        assert bar.value() == 25
+        assert status.text() == "1/4 1.00 KB"
+        assert path.text() == "当前搜索路径: /data/a.txt"
+        assert count.text() == "已找到: 2 个文件"
+
+    def test_unknown_total_is_busy(self, widgets, reporter):
+        """Test an operation without a total shows a busy progress bar"""
+        bar = widgets[0]
+        reporter.start("正在搜索文件...")
+        assert (bar.minimum(), bar.maximum()) == (0, 0)
+        reporter.finish()
+        assert (bar.minimum(), bar.maximum()) == (0, 100)
+        assert bar.isHidden()
+
+    def test_timer_pushes_updates(self, app, widgets, reporter):
+        """Test the timer refreshes the widgets while the event loop runs"""
+        status = widgets[1]
+        reporter.start("正在搜索文件...", status_format="正在搜索: {path}")
+        reporter.add_dir("/data/reports")
+        deadline = time.monotonic() + 2
+        while status.text() != "正在搜索: /data/reports" and time.monotonic() < deadline:
+            app.processEvents()
+        assert status.text() == "正在搜索: /data/reports"
+        reporter.finish()
+
+    def test_pump_is_rate_limited(self, reporter, monkeypatch):
+        """Test pump only processes events once per interval"""
+        calls = []
+        monkeypatch.setattr(QApplication, "processEvents", lambda *args: calls.append(1))
+        reporter.start("正在删除文件...", total=1000)
+        for _ in range(1000):
+            reporter.add_file()
+            reporter.pump()
+        assert len(calls) <= 1
+        reporter.finish()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,143 @@
+"""
+Unit Tests: Result Store Module (components.result_store)
+Tests for the columnar search result store and its dict-like record views
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.result_store import ResultStore, ResultRecord
+
+
+@pytest.fixture
+def store(add_result):
+    """A store with three results over two directories"""
+    store = ResultStore(["report", "budget", "absent"])
+    add_result(store, os.path.join("root", "a", "report.txt"), 10, ["report"])
+    add_result(store, os.path.join("root", "a", "budget.xlsx"), 20, ["budget"])
+    add_result(store, os.path.join("root", "b", "report budget.pdf"), 30, ["report", "budget"])
+    return store
+
+
+class TestResultStore:
+    """ResultStore tests"""
+
+    def test_columns(self, store):
+        """Test paths are rebuilt from the interned directory and the name"""
+        assert len(store) == 3
+        assert store.path(2) == os.path.join("root", "b", "report budget.pdf")
+        assert store.name(1) == "budget.xlsx"
+        assert store.size(1) == 20
+        assert store.mod_date(0) == "2026-01-02"
+        assert store.keywords_at(2) == ("report", "budget")
+        assert len(store._dirs) == 2
+
+    def test_record_view(self, store):
+        """Test records read like the old file_info dicts and keep extra keys locally"""
+        record = store[0]
+        assert isinstance(record, ResultRecord)
+        assert dict(record) == {"path": os.path.join("root", "a", "report.txt"),
+                                "name": "report.txt", "size": 10, "mod_date": "2026-01-02"}
+        record["new_name"] = "report_1.txt"
+        assert record["new_name"] == "report_1.txt"
+        assert record.get("action", "overwrite") == "overwrite"
+        assert "new_name" not in store[0]
+        assert store[-1]["name"] == "report budget.pdf"
+        with pytest.raises(IndexError):
+            store[3]
+
+    def test_keyword_results(self, store):
+        """Test per-keyword hits are row arrays exposed as sequences of records"""
+        assert list(store.hits("report")) == [0, 2]
+        results = store.keyword_results()
+        assert list(results) == ["report", "budget", "absent"]
+        assert [f["name"] for f in results["budget"]] == ["budget.xlsx", "report budget.pdf"]
+        assert results["absent"] == []
+        assert len(results["report"]) == 2
+
+    def test_duplicate_path_merges_keywords(self, store, add_result):
+        """Test adding a known path merges its keywords instead of adding a row"""
+        path = os.path.join("root", "a", "budget.xlsx")
+        assert add_result(store, path, keywords=["report"]) is None
+        assert len(store) == 3
+        assert store.keywords_at(1) == ("report", "budget")
+        assert list(store.hits("report")) == [0, 2, 1]
+
+    def test_row_of(self, store):
+        """Test rows are found by full path"""
+        assert store.row_of(os.path.join("root", "b", "report budget.pdf")) == 2
+        assert store.row_of(os.path.join("root", "b", "missing.txt")) is None
+        assert store.row_of(os.path.join("elsewhere", "report.txt")) is None
+
+    def test_subset_and_sort(self, store):
+        """Test subsets keep the chosen rows in order with their keyword hits"""
+        subset = store.subset([2, 0])
+        assert [f["name"] for f in subset] == ["report budget.pdf", "report.txt"]
+        assert list(subset.hits("report")) == [0, 1]
+        assert list(subset.hits("budget")) == [0]
+        ordered = store.sorted_by([5, 3, 4])
+        assert [f["name"] for f in ordered] == ["budget.xlsx", "report budget.pdf", "report.txt"]
+
+    def test_remove_rows(self, store, add_result):
+        """Test removed rows disappear and the rest are renumbered in order"""
+        add_result(store, os.path.join("root", "b", "budget.doc"), keywords=["budget"])
+        store.remove_rows([0, 2])
+        assert [f["name"] for f in store] == ["budget.xlsx", "budget.doc"]
+        assert list(store.hits("report")) == []
+        assert list(store.hits("budget")) == [0, 1]
+        assert store.row_of(os.path.join("root", "b", "budget.doc")) == 1
+        assert store.row_of(os.path.join("root", "a", "report.txt")) is None
+        assert add_result(store, os.path.join("root", "a", "report.txt"), keywords=["report"]) == 2
+
+    def test_keyword_results_after_remove(self, store):
+        """Test keyword results taken after a removal list each keyword's remaining files"""
+        store.remove_rows([0])
+        keyword_results = store.keyword_results()
+        assert [f["name"] for f in keyword_results["report"]] == ["report budget.pdf"]
+        assert [f["name"] for f in keyword_results["budget"]] == ["budget.xlsx", "report budget.pdf"]
+        assert keyword_results["absent"] == []
+
+    def test_keyword_tuples_shared(self, store, add_result):
+        """Test rows matching the same keywords share one tuple"""
+        add_result(store, os.path.join("root", "c", "report.doc"), keywords=["report"])
+        assert store.keywords_at(3) is store.keywords_at(0)
+
+
+@pytest.mark.slow
+def test_remove_many_rows(result_mtime):
+    """Test removing 100k of 200k rows by path stays fast"""
+    store = ResultStore(["file"])
+    paths = [f"/data/dir{i % 1000}/file{i}.txt" for i in range(200_000)]
+    for i, path in enumerate(paths):
+        store.add(path, f"file{i}.txt", i, result_mtime, ("file",))
+    start = time.perf_counter()
+    store.remove_rows([store.row_of(path) for path in paths[::2]])
+    elapsed = time.perf_counter() - start
+    print(f"\nremoved 100000 rows in {elapsed:.2f}s")
+    assert len(store) == 100_000
+    assert store.path(0) == paths[1]
+    assert elapsed < 2
+
+
+@pytest.mark.slow
+def test_large_store_memory(result_mtime):
+    """Test results stay far below the size of per-file dicts (about 460 bytes each)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = ResultStore(["file"])
+    for i in range(200_000):
+        store.add(f"/data/dir{i % 1000}/file{i}.txt", f"file{i}.txt", i, result_mtime, ("file",))
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\n{len(store)} results: {size / len(store):.0f} bytes per file, {elapsed:.2f}s")
+    assert size / len(store) < 250
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,111 @@
+"""
+Unit Tests: Results Model Module (components.results_model)
+Tests for the table model that backs the search results view
+"""
+
+import sys
+import os
+import time
+import pytest
+
+# Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import Qt
+
+from components.result_store import ResultStore
+from components.results_model import ResultsModel
+
+
+@pytest.fixture
+def model(add_result):
+    """A model holding two results"""
+    store = ResultStore(["budget", "docs", "absent"])
+    add_result(store, os.path.join("root", "docs", "budget.xlsx"), keywords=["budget", "docs"])
+    add_result(store, os.path.join("root", "notes.txt"), size=10)
+    model = ResultsModel()
+    model.set_results(store)
+    return model
+
+
+def cell(model, row, column, role=Qt.ItemDataRole.DisplayRole):
+    return model.data(model.index(row, column), role)
+
+
+class TestResultsModel:
+    """ResultsModel tests"""
+
+    def test_shape_and_headers(self, model):
+        """Test one row per file and the five result columns"""
+        assert model.rowCount() == 2
+        assert model.columnCount() == 5
+        assert [model.headerData(c, Qt.Orientation.Horizontal) for c in range(5)] == [
+            "文件名", "路径", "大小", "修改日期", "匹配关键词"]
+
+    def test_display_text(self, model):
+        """Test the displayed text is formatted from the raw values"""
+        assert [cell(model, 0, c) for c in range(5)] == [
+            "budget.xlsx", os.path.join("root", "docs"), "2.00 KB", "2026-01-02", "budget, docs"]
+        assert cell(model, 1, 2) == "10 B"
+        assert cell(model, 1, 4) == "-"
+
+    def test_tooltips_and_path_role(self, model):
+        """Test tooltips and the full path are available per row"""
+        assert cell(model, 0, 4, Qt.ItemDataRole.ToolTipRole) == "匹配关键词: budget, docs"
+        assert cell(model, 0, 1, Qt.ItemDataRole.ToolTipRole) == os.path.join("root", "docs")
+        assert cell(model, 1, 0, ResultsModel.PATH_ROLE) == os.path.join("root", "notes.txt")
+        assert model.path_at(1) == os.path.join("root", "notes.txt")
+
+    def test_clear(self, model):
+        """Test clearing shows an empty store"""
+        model.clear()
+        assert model.rowCount() == 0
+        assert len(model.store) == 0
+
+    def test_remove_rows(self, model):
+        """Test a contiguous block is removed with one rowsRemoved notification"""
+        removed = []
+        model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+        model.remove_rows([0])
+        assert removed == [(0, 0)]
+        assert model.rowCount() == 1
+        assert cell(model, 0, 0) == "notes.txt"
+
+    def test_append_results(self, add_result):
+        """Test rows stored by a running search are shown only once announced"""
+        store = ResultStore(["data"])
+        model = ResultsModel()
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        for i in range(3):
+            add_result(store, f"/data/{i}.txt", keywords=["data"])
+        model.append_results(store, 2)
+        assert model.rowCount() == 2
+        add_result(store, "/data/3.txt")
+        model.append_results(store, 4)
+        assert inserted == [(0, 1), (2, 3)]
+        assert cell(model, 2, 4) == "data"
+        assert cell(model, 3, 4) == "-"
+        assert model.holds(store)
+        assert not model.holds(ResultStore())
+
+
+@pytest.mark.slow
+def test_large_result_set(result_mtime):
+    """Test showing a million results does not format every row"""
+    store = ResultStore(["file"])
+    for i in range(1_000_000):
+        store.add(f"/data/dir{i % 1000}/file{i}.txt", f"file{i}.txt", i, result_mtime, ("file",))
+    model = ResultsModel()
+    start = time.perf_counter()
+    model.set_results(store)
+    elapsed = time.perf_counter() - start
+    print(f"\nset_results for {len(store)} rows: {elapsed:.2f}s")
+    assert model.rowCount() == 1_000_000
+    assert cell(model, 999_999, 2) == "976.56 KB"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -14,7 +14,13 @@ os.environ['QT_QPA_PLATFORM'] = 'offscreen'
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from components.search_logic import exact_match_filename, matches_keyword, search_content
+from components.search_logic import (
+    exact_match_filename, matches_keyword, search_content, compile_keyword, CompiledQuery,
+    extract_docx_text, iter_docx_text, read_docx_until, search_docx,
+    extract_excel_text, iter_xlsx_text, search_excel,
+    extract_pdf_text, iter_pdf_text, read_text_until, search_pdf,
+    StreamMatcher, scan_text_file, extract_text_file, is_byte_searchable
+)
 
 
 class TestExactMatchFilename:
@@ -113,6 +119,80 @@ class TestMatchesKeyword:
         assert matches_keyword("test\nstring", "test string") is True
 
 
+class TestCompiledQuery:
+    """Compiled keyword query tests"""
+
+    def test_compile_is_cached(self):
+        """Test a keyword is parsed only once"""
+        assert compile_keyword("+report -draft") is compile_keyword("+report -draft")
+
+    def test_parsed_terms_are_lowered(self):
+        """Test terms are pre-lowered at compile time"""
+        matcher = compile_keyword('"Annual Report" +Final -DRAFT Plan|Budget')
+        assert matcher.phrases == ("annual report",)
+        assert matcher.must_include == ("final",)
+        assert matcher.must_exclude == ("draft",)
+        assert [term for term, _ in matcher.any_include] == ["plan", "budget"]
+
+    def test_wildcard_precompiled(self):
+        """Test wildcard terms carry a compiled regex"""
+        matcher = compile_keyword("proj*report")
+        term, regex = matcher.any_include[0]
+        assert regex.search("project_report")
+        assert matcher.matches("my project annual report")
+        assert not matcher.matches("report project")
+
+    def test_invalid_wildcard_raises_like_before(self):
+        """Test invalid wildcard patterns still raise at match time"""
+        with pytest.raises(Exception):
+            matches_keyword("abc", "(a*")
+
+    def test_match_returns_keywords_in_order(self):
+        """Test CompiledQuery.match keeps keyword order"""
+        query = CompiledQuery(["report", "2025", "draft"])
+        assert query.match("Report_2025.xlsx") == ["report", "2025"]
+        assert query.match("notes.txt") == []
+
+    def test_duplicate_keywords_removed(self):
+        """Test duplicate keywords are compiled once"""
+        query = CompiledQuery(["a", "b", "a"])
+        assert query.keywords == ["a", "b"]
+        assert len(query) == 2
+
+    def test_match_subset(self):
+        """Test matching only a subset of keywords"""
+        query = CompiledQuery(["alpha", "beta", "gamma"])
+        assert query.match_lower("alpha gamma", keywords=["gamma"]) == ["gamma"]
+
+    def test_same_result_as_wrapper(self):
+        """Test compiled matching agrees with matches_keyword"""
+        keywords = ["+include -exclude", '"quick brown"', "apple|banana", "test*file", "-"]
+        texts = ["include this", "the quick brown fox", "banana split", "test_data_file", "x"]
+        query = CompiledQuery(keywords)
+        for text in texts:
+            expected = [kw for kw in keywords if matches_keyword(text, kw)]
+            assert query.match(text) == expected
+
+    def test_large_keyword_list_uses_automaton(self):
+        """Test plain keyword lists switch to the Aho-Corasick matcher"""
+        keywords = [f"pn{i:05d}" for i in range(2000)] + ["+drawing -old", "rev*b"]
+        query = CompiledQuery(keywords)
+        assert query.uses_automaton
+
+        assert query.match("PN00042_drawing_revB.pdf") == ["pn00042", "+drawing -old", "rev*b"]
+        assert query.match("pn01999|pn00007 old drawing") == ["pn00007", "pn01999"]
+        assert query.match("unrelated.txt") == []
+
+    def test_automaton_agrees_with_per_keyword_matching(self):
+        """Test the automaton gives the same result as per-keyword evaluation"""
+        keywords = [f"part{i}" for i in range(40)] + ["part1|part2", '"part 3"', "-part4"]
+        query = CompiledQuery(keywords)
+        assert query.uses_automaton
+        for text in ["part12 part3", "Part 3 final", "part4", "nothing"]:
+            expected = [kw for kw in query.keywords if matches_keyword(text, kw)]
+            assert query.match(text) == expected
+
+
 class TestSearchContent:
     """Content search tests"""
     
@@ -172,5 +252,525 @@ class TestSearchContent:
                     pass
 
 
+@pytest.fixture
+def rich_docx(temp_dir):
+    """A DOCX document with a table, a header and a footer"""
+    from docx import Document
+    path = Path(temp_dir) / "rich.docx"
+    doc = Document()
+    doc.add_paragraph("Opening paragraph")
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "cell alpha"
+    table.cell(0, 1).text = "cell beta"
+    doc.add_paragraph("Closing paragraph")
+    doc.sections[0].header.paragraphs[0].text = "Confidential header"
+    doc.sections[0].footer.paragraphs[0].text = "Page footer"
+    doc.save(str(path))
+    return path
+
+
+class TestDocxStreaming:
+    """Streaming DOCX extractor tests"""
+
+    def test_paragraphs_tables_headers_footers(self, rich_docx):
+        """Test body paragraphs and table cells come in document order, then header and footer"""
+        assert list(iter_docx_text(rich_docx)) == [
+            "Opening paragraph", "cell alpha", "cell beta", "Closing paragraph",
+            "Confidential header", "Page footer"]
+        assert "Page footer" not in list(iter_docx_text(rich_docx, include_headers=False))
+
+    def test_matches_python_docx_paragraph_text(self, temp_dir):
+        """Test the extracted body text equals the python-docx paragraph text"""
+        from docx import Document
+        path = Path(temp_dir) / "plain.docx"
+        doc = Document()
+        for i in range(20):
+            doc.add_paragraph(f"line {i} with\ttab")
+        doc.save(str(path))
+        expected = "".join(p.text + " " for p in Document(str(path)).paragraphs)
+        assert extract_docx_text(path) == expected
+
+    def test_character_limit(self, temp_dir):
+        """Test extraction stops after the character limit"""
+        from docx import Document
+        path = Path(temp_dir) / "long.docx"
+        doc = Document()
+        for i in range(500):
+            doc.add_paragraph(f"paragraph number {i:04d}")
+        doc.save(str(path))
+        text = extract_docx_text(path)
+        assert 3000 < len(text) < 3100
+        assert "paragraph number 0499" not in text
+
+    def test_stops_once_keywords_decided(self, temp_dir):
+        """Test reading stops early once every keyword has a final result"""
+        from docx import Document
+        path = Path(temp_dir) / "early.docx"
+        doc = Document()
+        doc.add_paragraph("needle " * 100)
+        for i in range(400):
+            doc.add_paragraph(f"filler {i}")
+        doc.save(str(path))
+
+        assert len(read_docx_until(path, [compile_keyword("needle")])) < 1000
+        # An exclusion keyword is only decided by reading to the limit
+        assert len(read_docx_until(path, [compile_keyword("needle -absent")])) > 3000
+        assert search_docx(path, "needle") is True
+        assert search_docx(path, "needle -filler") is False
+
+    def test_invalid_file(self, temp_dir):
+        """Test a file that is not a DOCX archive yields None"""
+        path = Path(temp_dir) / "broken.docx"
+        path.write_bytes(b"not a zip")
+        assert extract_docx_text(path) is None
+        assert search_content(path, "anything") is False
+
+
+def write_workbook(path, rows):
+    """Save rows with openpyxl (which stores strings inline) plus a second sheet"""
+    from openpyxl import Workbook
+    wb = Workbook()
+    for row in rows:
+        wb.active.append(row)
+    wb.create_sheet("second").append(["second sheet text"])
+    wb.save(str(path))
+    return path
+
+
+def write_shared_strings_workbook(path):
+    """Write a minimal workbook the way Excel does, with a shared-strings table"""
+    import zipfile
+    main = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    rel = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    parts = {
+        "[Content_Types].xml": (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            '</Types>'),
+        "_rels/.rels": (
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{rel}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'),
+        "xl/workbook.xml": (
+            f'<workbook xmlns="{main}" xmlns:r="{rel}"><sheets>'
+            '<sheet name="data" sheetId="1" r:id="rId1"/></sheets></workbook>'),
+        "xl/_rels/workbook.xml.rels": (
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{rel}/worksheet" Target="worksheets/sheet1.xml"/>'
+            f'<Relationship Id="rId2" Type="{rel}/sharedStrings" Target="sharedStrings.xml"/>'
+            '</Relationships>'),
+        "xl/sharedStrings.xml": (
+            f'<sst xmlns="{main}" count="3" uniqueCount="3">'
+            '<si><t>Quarterly budget</t></si>'
+            '<si><r><t>rich </t></r><r><rPr><b/></rPr><t>text</t></r></si>'
+            '<si><t>東京</t><rPh sb="0" eb="2"><t>トウキョウ</t></rPh></si>'
+            '</sst>'),
+        "xl/worksheets/sheet1.xml": (
+            f'<worksheet xmlns="{main}"><sheetData>'
+            '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1"><v>42</v></c></row>'
+            '<row r="2"><c r="A2" t="s"><v>1</v></c><c r="B2" t="inlineStr"><is><t>inline marker</t></is></c></row>'
+            '<row r="3"><c r="A3" t="s"><v>2</v></c><c r="B3" t="str"><v>formula result</v></c></row>'
+            '</sheetData></worksheet>'),
+    }
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+    return path
+
+
+def openpyxl_text(path):
+    """The text the openpyxl extractor produced before the fast path existed"""
+    from openpyxl import load_workbook
+    wb = load_workbook(str(path), read_only=True)
+    text = ""
+    for sheet in wb:
+        for row in sheet.iter_rows(values_only=True):
+            for cell in row:
+                if cell:
+                    text += str(cell) + " "
+    wb.close()
+    return text
+
+
+class TestXlsxStreaming:
+    """Streaming XLSX extractor tests"""
+
+    ROWS = [
+        ["name", "city", "amount", "ratio", "flag", "empty", "zero"],
+        ["Alice", "Shanghai", 120, 0.25, True, None, 0],
+        ["Bob", "Beijing", -7, 1e-07, False, None, 0.0],
+    ]
+
+    def test_same_values_as_openpyxl(self, temp_dir):
+        """Test the fast path yields the same cell values as openpyxl"""
+        path = write_workbook(Path(temp_dir) / "book.xlsx", self.ROWS)
+        assert " ".join(iter_xlsx_text(path)).split() == openpyxl_text(path).split()
+
+    def test_shared_strings(self, temp_dir):
+        """Test shared strings are yielded in cell order where the cells reference them"""
+        path = write_shared_strings_workbook(Path(temp_dir) / "shared.xlsx")
+        assert list(iter_xlsx_text(path)) == [
+            "Quarterly budget", "42", "rich text", "inline marker", "東京", "formula result"]
+        assert " ".join(iter_xlsx_text(path)).split() == openpyxl_text(path).split()
+
+    def test_date_cells(self, temp_dir):
+        """Test date-formatted cells come out as dates, not serial numbers"""
+        import datetime
+        from openpyxl import Workbook
+        path = Path(temp_dir) / "dates.xlsx"
+        wb = Workbook()
+        wb.active.append([datetime.datetime(2024, 1, 15), 45306, datetime.time(9, 30)])
+        wb.active["B1"].number_format = "mm-dd-yy"
+        wb.save(str(path))
+        assert list(iter_xlsx_text(path)) == [
+            "2024-01-15 00:00:00", "2024-01-15 00:00:00", "09:30:00"]
+        assert " ".join(iter_xlsx_text(path)).split() == openpyxl_text(path).split()
+        assert search_excel(path, "2024-01-15") is True
+        assert search_excel(path, "45306") is False
+
+    def test_large_integers(self, temp_dir):
+        """Test integers stored in e-notation are written out in full"""
+        path = write_workbook(Path(temp_dir) / "numbers.xlsx", [[1.2345e19, 2.5e-07]])
+        assert list(iter_xlsx_text(path))[:2] == ["12345000000000000000", "2.5e-07"]
+        assert search_excel(path, "12345000000000000000") is True
+
+    def test_search(self, temp_dir):
+        """Test keywords are found in shared and inline strings"""
+        path = write_shared_strings_workbook(Path(temp_dir) / "shared.xlsx")
+        assert search_excel(path, "budget") is True
+        assert search_excel(path, "marker") is True
+        assert search_excel(path, "トウキョウ") is False
+
+    def test_character_limit(self, temp_dir):
+        """Test large sheets stop at the character limit"""
+        rows = [[f"row {i:05d}", i] for i in range(2000)]
+        path = write_workbook(Path(temp_dir) / "large.xlsx", rows)
+        text = extract_excel_text(path)
+        assert 3000 < len(text) < 3100
+        assert "row 01999" not in text
+
+    def test_invalid_file(self, temp_dir):
+        """Test a file that is not an XLSX archive yields None"""
+        path = Path(temp_dir) / "broken.xlsx"
+        path.write_bytes(b"not a zip")
+        assert extract_excel_text(path) is None
+        assert search_excel(path, "anything") is False
+
+
+class TestStreamMatcher:
+    """Chunked streaming matcher tests"""
+
+    KEYWORDS = ["budget", '"annual report"', "+alpha +omega", "alpha -omega",
+                "beta|gamma", "rep*rt", "missing"]
+    TEXT = ("The annual report covers the budget. alpha starts here, "
+            "and much later the omega ends it. gamma rays.")
+
+    def run(self, text, block, keywords=None):
+        matchers = [compile_keyword(kw) for kw in (keywords or self.KEYWORDS)]
+        stream = StreamMatcher(matchers)
+        for i in range(0, len(text), block):
+            stream.feed(text[i:i + block].lower())
+        return stream.result()
+
+    def test_same_as_whole_text_for_any_block_size(self):
+        """Test every block size gives the same result as matching the whole text"""
+        expected = [kw for kw in self.KEYWORDS if matches_keyword(self.TEXT, kw)]
+        for block in range(1, len(self.TEXT) + 1):
+            assert self.run(self.TEXT, block) == expected, block
+
+    def test_phrase_across_boundary(self):
+        """Test a phrase split across two blocks is found"""
+        assert self.run("xx annual report yy", 7, ['"annual report"']) == ['"annual report"']
+
+    def test_decided(self):
+        """Test the stream reports when every keyword is final"""
+        stream = StreamMatcher([compile_keyword("budget"), compile_keyword("alpha -omega")])
+        stream.feed("budget alpha")
+        assert not stream.decided
+        stream.feed(" omega")
+        assert stream.decided
+        assert stream.result() == ["budget"]
+
+
+class TestScanTextFile:
+    """Block-wise text file scanning tests"""
+
+    @pytest.fixture
+    def log_file(self, temp_dir):
+        path = Path(temp_dir) / "server.log"
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(20000):
+                f.write(f"{i:06d} INFO request handled\n")
+            f.write("FATAL disk quota exceeded\n")
+        return path
+
+    def test_default_depth(self, log_file):
+        """Test the default depth only looks at the start of the file"""
+        stream = scan_text_file(log_file, [compile_keyword("quota")])
+        assert stream.result() == []
+        assert stream.chars == 3000
+
+    def test_default_depth_counts_characters(self, temp_dir):
+        """Test the default depth covers 3000 CJK characters even though UTF-8 needs 3 bytes each"""
+        path = Path(temp_dir) / "notes.txt"
+        path.write_text("财务" * 1400 + "预算" + "其他" * 2000, encoding="utf-8")
+        assert scan_text_file(path, [compile_keyword("预算")]).result() == ["预算"]
+
+    @pytest.mark.parametrize("keywords", [["budget"], ["budget", "émile"]])
+    @pytest.mark.parametrize("prefix", ["x", "财"])
+    @pytest.mark.parametrize("options", [
+        {}, {"skip_binary": True}, {"mmap_threshold": 1}, {"block": 1000}])
+    def test_same_depth_for_bytes_and_text(self, temp_dir, keywords, prefix, options):
+        """Test the byte path and the decode path stop at the same character"""
+        matchers = [compile_keyword(kw) for kw in keywords]
+        assert is_byte_searchable(matchers[-1]) == (len(keywords) == 1)
+        inside = Path(temp_dir) / "inside.txt"
+        inside.write_text(prefix * 2994 + "budget" + "y" * 5000, encoding="utf-8")
+        past = Path(temp_dir) / "past.txt"
+        past.write_text(prefix * 2995 + "budget" + "y" * 5000, encoding="utf-8")
+        assert scan_text_file(inside, matchers, limit=3000, **options).result() == ["budget"]
+        assert scan_text_file(past, matchers, limit=3000, **options).result() == []
+
+    @pytest.mark.parametrize("keyword", ["*", "|", "émile|*"])
+    def test_empty_file_matches_empty_terms(self, temp_dir, keyword):
+        """Test an empty file still matches keywords that match empty text"""
+        path = Path(temp_dir) / "empty.txt"
+        path.write_bytes(b"")
+        matcher = compile_keyword(keyword)
+        assert matcher.matches("")
+        assert scan_text_file(path, [matcher], skip_binary=True).result() == [keyword]
+        assert scan_text_file(path, [compile_keyword("budget")]).result() == []
+
+    def test_whole_file(self, log_file):
+        """Test the whole file is scanned block by block and the phrase is found at the end"""
+        stream = scan_text_file(log_file, [compile_keyword('"disk quota"')], limit=0, block=4096)
+        assert stream.result() == ['"disk quota"']
+        assert stream.chars == log_file.stat().st_size
+
+    def test_stops_once_decided(self, log_file):
+        """Test scanning stops after the block that decides every keyword"""
+        stream = scan_text_file(log_file, [compile_keyword("request")], limit=0, block=4096)
+        assert stream.result() == ["request"]
+        assert stream.chars == 4096
+
+
+class TestByteScanning:
+    """Undecoded byte-level text scanning tests"""
+
+    def write(self, temp_dir, text, encoding):
+        path = Path(temp_dir) / f"notes_{encoding}.txt"
+        path.write_bytes(text.encode(encoding))
+        return path
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "gbk"])
+    def test_cjk_in_both_encodings(self, temp_dir, encoding):
+        """Test CJK keywords are found in UTF-8 and GBK files without decoding"""
+        path = self.write(temp_dir, "第三季度财务报告 Budget", encoding)
+        matchers = [compile_keyword("报告"), compile_keyword("budget"), compile_keyword("合同")]
+        assert all(is_byte_searchable(m) for m in matchers)
+        assert scan_text_file(path, matchers).result() == ["报告", "budget"]
+
+    def test_gbk_trail_byte_in_ascii_range(self, temp_dir):
+        """Test GBK characters whose second byte is an ASCII letter survive lowering"""
+        text = "".join(ch for ch in map(chr, range(0x4e00, 0x9fa6))
+                       if len(ch.encode("gbk", "ignore")) == 2
+                       and 0x41 <= ch.encode("gbk")[1] <= 0x5a)[:20]
+        assert text
+        path = self.write(temp_dir, "前缀 " + text, "gbk")
+        assert scan_text_file(path, [compile_keyword(text)]).result() == [text]
+
+    def test_wildcard_and_exclusion(self, temp_dir):
+        """Test wildcard and exclusion syntax on raw bytes"""
+        path = self.write(temp_dir, "季度报告：收入增长 ERROR-42", "gbk")
+        keywords = ["季度*增长", "error-4*", "报告 -收入", "+季度 +增长"]
+        stream = scan_text_file(path, [compile_keyword(kw) for kw in keywords])
+        assert stream.result() == ["季度*增长", "error-4*", "+季度 +增长"]
+
+    def test_non_ascii_cased_falls_back_to_text(self, temp_dir):
+        """Test keywords with non-ASCII cased letters are matched case-insensitively after decoding"""
+        path = self.write(temp_dir, "Letters from ÉMILE", "utf-8")
+        matcher = compile_keyword("émile")
+        assert not is_byte_searchable(matcher)
+        assert scan_text_file(path, [matcher]).result() == ["émile"]
+
+    def test_extract_gbk_text(self, temp_dir):
+        """Test whole-text extraction decodes GBK files instead of dropping their characters"""
+        path = self.write(temp_dir, "财务报告", "gbk")
+        assert extract_text_file(path) == "财务报告"
+        assert search_content(path, "报告") is True
+
+
+class TestMappedScanning:
+    """Memory-mapped text file scanning tests"""
+
+    @pytest.fixture
+    def big_log(self, temp_dir):
+        path = Path(temp_dir) / "app.log"
+        with open(path, "wb") as f:
+            f.write("2026-01-01 INFO 请求完成\n".encode("utf-8") * 20000)
+            f.write("FATAL Disk Quota 磁盘已满\n".encode("gbk"))
+        return path
+
+    @pytest.mark.parametrize("keywords", [
+        ["磁盘已满", "请求", "不存在"],
+        ["fatal", '"disk quota"', "info -quota", "disk*满"],
+    ])
+    def test_same_result_as_buffered(self, big_log, keywords):
+        """Test mmap scanning finds exactly what buffered reads find"""
+        matchers = [compile_keyword(kw) for kw in keywords]
+        buffered = scan_text_file(big_log, matchers, limit=0, block=4096, mmap_threshold=0)
+        mapped = scan_text_file(big_log, matchers, limit=0, block=4096, mmap_threshold=1)
+        assert mapped.result() == buffered.result()
+        assert mapped.chars == buffered.chars
+
+    def test_uncased_terms_scan_whole_mapping(self, big_log):
+        """Test terms without ASCII letters are searched in the mapping as a single window"""
+        stream = scan_text_file(big_log, [compile_keyword("磁盘已满")], limit=0, block=4096,
+                                mmap_threshold=1)
+        assert stream.case_free
+        assert stream.result() == ["磁盘已满"]
+        assert stream.chars == big_log.stat().st_size
+
+    def test_limit(self, big_log):
+        """Test only the bytes covering the first limit characters are mapped"""
+        stream = scan_text_file(big_log, [compile_keyword("fatal")], limit=3000, mmap_threshold=1)
+        assert stream.result() == []
+        assert stream.chars == len(("2026-01-01 INFO 请求完成\n" * 200)[:3000].encode("utf-8"))
+
+    def test_small_file_not_mapped(self, temp_dir, monkeypatch):
+        """Test files below the threshold are read normally"""
+        path = Path(temp_dir) / "small.txt"
+        path.write_text("budget")
+        monkeypatch.setattr("components.search_logic.mmap.mmap", None)
+        assert scan_text_file(path, [compile_keyword("budget")]).result() == ["budget"]
+
+
+def write_pdf(path, pages):
+    """Write a PDF with one line of text per page"""
+    import pymupdf
+    doc = pymupdf.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (36, 36, -36, -36), text)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+class TestPdfStreaming:
+    """Page-streaming PDF extractor tests"""
+
+    def test_pages_in_order(self, temp_dir):
+        """Test each page is yielded separately and in order"""
+        path = write_pdf(Path(temp_dir) / "doc.pdf", ["first page", "second page", "third page"])
+        assert [text.strip() for text in iter_pdf_text(path)] == [
+            "first page", "second page", "third page"]
+
+    def test_page_cap(self, temp_dir):
+        """Test pages beyond max_pages are not read"""
+        path = write_pdf(Path(temp_dir) / "doc.pdf", [f"page {i} text" for i in range(10)])
+        assert len(list(iter_pdf_text(path, max_pages=3))) == 3
+        text = extract_pdf_text(path, max_pages=2)
+        assert "page 1" in text and "page 2" not in text
+
+    def test_early_exit(self, temp_dir):
+        """Test reading stops after the page that decides every keyword"""
+        filler = "lorem ipsum dolor sit amet " * 25
+        path = write_pdf(Path(temp_dir) / "doc.pdf",
+                         [f"needle {filler}"] + [filler] * 9)
+        consumed = []
+
+        def pages():
+            for text in iter_pdf_text(path):
+                consumed.append(text)
+                yield text
+
+        read_text_until(pages(), [compile_keyword("needle")])
+        assert len(consumed) == 1
+        assert search_pdf(path, "needle") is True
+        assert search_pdf(path, "haystack") is False
+
+    def test_early_exit_in_extraction_process(self, temp_dir):
+        """Test the extractor run in the process pool stops early when given the keywords"""
+        from components.search_logic import extract_text
+        filler = "lorem ipsum dolor sit amet " * 25
+        path = write_pdf(Path(temp_dir) / "doc.pdf", [f"needle {filler}"] + [filler] * 9)
+        full = extract_text(path, limit=0)
+        early = extract_text(path, limit=0, keywords=("needle",))
+        assert "needle" in early
+        assert len(early) < len(full) / 5
+
+    def test_full_scan_is_linear(self):
+        """Test a never-matching keyword over several MB is checked chunk by chunk, not re-scanned"""
+        import time
+        chunks = [f"paragraph {i:06d} lorem ipsum dolor sit amet" for i in range(100_000)]
+        start = time.perf_counter()
+        text = read_text_until(chunks, [compile_keyword('"absent phrase"')], limit=0)
+        elapsed = time.perf_counter() - start
+        print(f"\nscanned {len(text) / 1e6:.1f}M characters in {elapsed:.3f}s")
+        assert len(text) > 4_000_000
+        assert elapsed < 2
+
+    def test_invalid_file(self, temp_dir):
+        """Test a file that is not a PDF yields None"""
+        path = Path(temp_dir) / "broken.pdf"
+        path.write_bytes(b"not a pdf")
+        assert extract_pdf_text(path) is None
+
+
+@pytest.mark.slow
+def test_xlsx_fast_path_benchmark(temp_dir):
+    """Compare full scans of a 100k-row spreadsheet by the streaming extractor and by openpyxl"""
+    import time
+    from openpyxl import Workbook, load_workbook
+    rows = int(os.environ.get("FILEGATHER_BENCH_ROWS", "100000"))
+    path = Path(temp_dir) / "large.xlsx"
+    wb = Workbook(write_only=True)
+    sheet = wb.create_sheet("data")
+    for i in range(rows):
+        sheet.append([i, f"customer {i:06d}", ["Shanghai", "Beijing"][i % 2], i * 1.5])
+    wb.save(str(path))
+
+    start = time.perf_counter()
+    wb = load_workbook(str(path), read_only=True)
+    cells = sum(1 for sheet in wb for row in sheet.iter_rows(values_only=True) for cell in row)
+    wb.close()
+    openpyxl_elapsed = time.perf_counter() - start
+
+    # 从不命中的关键词使两条路径都读完整个表格
+    start = time.perf_counter()
+    text = extract_excel_text(path, [compile_keyword("absent")], limit=0)
+    fast_elapsed = time.perf_counter() - start
+
+    assert f"customer {rows - 1:06d}" in text
+    print(f"\n{cells} cells: openpyxl {openpyxl_elapsed:.3f}s, fast path {fast_elapsed:.3f}s")
+
+
+@pytest.mark.slow
+def test_mmap_scan_benchmark(temp_dir):
+    """Compare buffered reads with mmap scanning on a generated log (FILEGATHER_BENCH_MB=1024 for 1 GB)"""
+    import time
+    size = int(os.environ.get("FILEGATHER_BENCH_MB", "64")) * 1024 * 1024
+    path = Path(temp_dir) / "large.log"
+    line = "2026-01-01 12:00:00 INFO request handled user=42 订单已处理\n".encode("utf-8")
+    with open(path, "wb") as f:
+        for _ in range(size // (len(line) * 10000)):
+            f.write(line * 10000)
+
+    for keywords in (["磁盘已满"], ["quota", "fatal"]):
+        matchers = [compile_keyword(kw) for kw in keywords]
+        timings = {}
+        for name, threshold in (("buffered", 0), ("mmap", 1)):
+            start = time.perf_counter()
+            result = scan_text_file(path, matchers, limit=0, mmap_threshold=threshold).result()
+            timings[name] = time.perf_counter() - start
+            assert result == []
+        print(f"\n{keywords}: buffered {timings['buffered']:.3f}s, mmap {timings['mmap']:.3f}s")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
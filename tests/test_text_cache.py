@@ -0,0 +1,138 @@
+"""
+Unit Tests: Text Cache Module (components.text_cache)
+Tests for the persistent extracted-text cache and its use by content search
+"""
+
+import sys
+import os
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+# Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.text_cache import TextCache
+from components.search_logic import search_content, extract_text
+from components.workers import SearchWorker
+
+
+@pytest.fixture
+def cache(temp_dir):
+    """A cache stored in the temporary directory"""
+    with TextCache(1024 * 1024, db_path=Path(temp_dir) / "cache.sqlite3") as text_cache:
+        yield text_cache
+
+
+@pytest.fixture
+def docx_file(temp_dir):
+    """A small DOCX document"""
+    from docx import Document
+    path = Path(temp_dir) / "contract.docx"
+    doc = Document()
+    doc.add_paragraph("Quarterly budget for the Shanghai office")
+    doc.save(str(path))
+    return path
+
+
+class TestTextCache:
+    """TextCache tests"""
+
+    def test_miss_then_hit(self, cache):
+        """Test a stored text is returned for the same path, size and mtime"""
+        assert cache.get("/a.pdf", 10, 1) is TextCache.MISS
+        cache.put("/a.pdf", 10, 1, "hello 世界")
+        assert cache.get("/a.pdf", 10, 1) == "hello 世界"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_changed_file_misses(self, cache):
+        """Test a different size or mtime invalidates the entry"""
+        cache.put("/a.pdf", 10, 1, "old")
+        assert cache.get("/a.pdf", 11, 1) is TextCache.MISS
+        assert cache.get("/a.pdf", 10, 2) is TextCache.MISS
+
+    def test_failed_extraction_cached(self, cache):
+        """Test documents that could not be extracted are remembered as None"""
+        cache.put("/broken.docx", 5, 1, None)
+        assert cache.get("/broken.docx", 5, 1) is None
+
+    def test_persists_across_instances(self, temp_dir):
+        """Test entries survive closing and reopening the cache"""
+        db_path = Path(temp_dir) / "cache.sqlite3"
+        with TextCache(1024 * 1024, db_path=db_path) as first:
+            first.put("/a.xlsx", 1, 1, "cells")
+        with TextCache(1024 * 1024, db_path=db_path) as second:
+            assert second.get("/a.xlsx", 1, 1) == "cells"
+
+    def test_variant_mismatch_misses(self, temp_dir):
+        """Test text extracted with other parameters is not reused"""
+        db_path = Path(temp_dir) / "cache.sqlite3"
+        with TextCache(1024 * 1024, db_path=db_path, variant="chars=3000") as shallow:
+            shallow.put("/a.pdf", 1, 1, "short")
+        with TextCache(1024 * 1024, db_path=db_path, variant="chars=0") as deep:
+            assert deep.get("/a.pdf", 1, 1) is TextCache.MISS
+
+    def test_lru_eviction(self, temp_dir):
+        """Test the least recently used entries are evicted above the size cap"""
+        blob = os.urandom(2000).hex()  # about 2 KB once compressed
+        with TextCache(6000, db_path=Path(temp_dir) / "cache.sqlite3") as cache:
+            cache.put("/1", 1, 1, blob)
+            cache.put("/2", 1, 1, blob)
+            cache.get("/1", 1, 1)
+            cache.put("/3", 1, 1, blob)
+
+            assert cache.total_bytes() <= 6000
+            assert cache.get("/2", 1, 1) is TextCache.MISS
+            assert cache.get("/3", 1, 1) == blob
+            assert cache.get("/1", 1, 1) == blob
+
+
+class TestCachedContentSearch:
+    """search_content cache integration tests"""
+
+    def test_extract_text_docx(self, docx_file):
+        """Test the DOCX extractor returns the paragraph text"""
+        assert "Shanghai" in extract_text(docx_file)
+
+    def test_second_search_skips_extractor(self, cache, docx_file):
+        """Test an unchanged document is only parsed once"""
+        assert search_content(docx_file, "budget", cache=cache) is True
+        with patch("components.search_logic.extract_docx_text") as extractor:
+            assert search_content(docx_file, "shanghai", cache=cache) is True
+            assert search_content(docx_file, "beijing", cache=cache) is False
+            extractor.assert_not_called()
+
+    def test_modified_document_reparsed(self, cache, docx_file):
+        """Test changing the document invalidates its cached text"""
+        from docx import Document
+        search_content(docx_file, "budget", cache=cache)
+
+        doc = Document()
+        doc.add_paragraph("Annual report for Beijing")
+        doc.save(str(docx_file))
+        os.utime(docx_file, ns=(1, 10 ** 18))
+
+        assert search_content(docx_file, "beijing", cache=cache) is True
+
+    def test_worker_uses_cache(self, docx_file, temp_dir, monkeypatch):
+        """Test content searches in the worker populate and reuse the cache"""
+        monkeypatch.setenv("FILEGATHER_DATA_DIR", str(Path(temp_dir) / "appdata"))
+
+        def run():
+            worker = SearchWorker([str(docx_file.parent)], ["budget"], search_mode="content",
+                                  text_cache_bytes=1024 * 1024)
+            worker.run()
+            return worker
+
+        first = run()
+        second = run()
+        assert len(first.keyword_results["budget"]) == 1
+        assert (first.text_cache.hits, first.text_cache.misses) == (0, 1)
+        assert (second.text_cache.hits, second.text_cache.misses) == (1, 0)
+        assert len(second.keyword_results["budget"]) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
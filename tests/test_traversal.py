@@ -0,0 +1,213 @@
+"""
+Unit Tests: Directory Traversal Module (components.traversal)
+Tests for the os.scandir based walker, cached entry metadata and syscall counters
+"""
+
+import sys
+import os
+import time
+import pytest
+from pathlib import Path
+
+# Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.traversal import (
+    FileEntry, TraversalStats, ParallelWalker, scan_directory, walk_entries,
+    STAT_FROM_LISTING
+)
+
+
+def make_tree(base, dirs, files_per_dir):
+    """Create a synthetic tree with dirs x files_per_dir small files"""
+    for d in range(dirs):
+        folder = Path(base) / f"dir_{d:04d}"
+        folder.mkdir()
+        for f in range(files_per_dir):
+            (folder / f"file_{f:05d}.txt").write_text("x")
+
+
+class TestScanDirectory:
+    """scan_directory tests"""
+
+    def test_lists_files_and_dirs(self, sample_directory_structure):
+        """Test files and sub directories are separated"""
+        listing = scan_directory(str(sample_directory_structure / "documents"))
+        assert sorted(e.name for e in listing.files) == ["readme.txt", "report1.txt"]
+        assert [d.name for d in listing.dirs] == ["reports"]
+
+    def test_entry_carries_stat(self, temp_dir):
+        """Test entries carry size and mtime from the directory listing"""
+        path = Path(temp_dir) / "data.bin"
+        path.write_bytes(b"a" * 123)
+        listing = scan_directory(temp_dir)
+
+        entry = listing.files[0]
+        assert isinstance(entry, FileEntry)
+        assert entry.size == 123
+        assert entry.mtime == pytest.approx(path.stat().st_mtime)
+        assert entry.suffix == ".bin"
+
+    def test_suffix_matches_pathlib(self):
+        """Test suffix rules follow Path.suffix"""
+        for name in ["a.TXT", ".bashrc", "archive.tar.gz", "noext", "trailing."]:
+            entry = FileEntry(name, name, 0, 0)
+            assert entry.suffix == Path(name).suffix.lower()
+
+    def test_unreadable_directory(self):
+        """Test missing directories return None and count an error"""
+        stats = TraversalStats()
+        assert scan_directory("/nonexistent/folder/path", stats) is None
+        assert stats.errors == 1
+
+
+class TestWalkEntries:
+    """walk_entries tests"""
+
+    def test_recursive_walk(self, sample_directory_structure):
+        """Test recursive walk visits every file"""
+        names = sorted(e.name for listing in walk_entries(str(sample_directory_structure))
+                       for e in listing.files)
+        assert names == ["photo.jpg", "readme.txt", "report1.txt", "report2.txt", "script.py"]
+
+    def test_top_down_order(self, sample_directory_structure):
+        """Test parents are yielded before their children"""
+        paths = [listing.path for listing in walk_entries(str(sample_directory_structure))]
+        assert paths[0] == str(sample_directory_structure)
+        documents = str(sample_directory_structure / "documents")
+        reports = str(sample_directory_structure / "documents" / "reports")
+        assert paths.index(documents) < paths.index(reports)
+
+    def test_non_recursive_walk(self, sample_directory_structure):
+        """Test non-recursive walk only lists the root"""
+        listings = list(walk_entries(str(sample_directory_structure), recursive=False))
+        assert len(listings) == 1
+        assert listings[0].files == []
+
+    def test_cancel(self, sample_directory_structure):
+        """Test cancel callback stops the walk"""
+        listings = list(walk_entries(str(sample_directory_structure), cancel=lambda: True))
+        assert listings == []
+
+    def test_syscall_counter(self, temp_dir):
+        """Test the walker needs at most one syscall per file"""
+        make_tree(temp_dir, 5, 40)
+        stats = TraversalStats()
+        for _ in walk_entries(temp_dir, stats=stats):
+            pass
+
+        assert stats.dirs == 6
+        assert stats.files == 200
+        # 每个目录一次 scandir；POSIX 下每个文件一次 stat，Windows 下为零
+        expected = stats.dirs + (0 if STAT_FROM_LISTING else stats.files)
+        assert stats.syscalls == expected
+        assert stats.syscalls_per_file <= 1.1
+
+
+class TestParallelWalker:
+    """ParallelWalker tests"""
+
+    def test_matches_sequential_walk(self, temp_dir):
+        """Test the parallel walker finds exactly the files of the sequential walk"""
+        make_tree(temp_dir, 8, 10)
+        (Path(temp_dir) / "dir_0001" / "nested").mkdir()
+        (Path(temp_dir) / "dir_0001" / "nested" / "deep.txt").write_text("x")
+
+        sequential = sorted(e.path for listing in walk_entries(temp_dir) for e in listing.files)
+        parallel = sorted(e.path for listing in ParallelWalker([temp_dir], workers=4)
+                          for e in listing.files)
+        assert parallel == sequential
+
+    def test_deterministic_order(self, temp_dir):
+        """Test output order does not depend on the worker count"""
+        make_tree(temp_dir, 12, 5)
+        for d in range(0, 12, 3):
+            sub = Path(temp_dir) / f"dir_{d:04d}" / "sub"
+            sub.mkdir()
+            (sub / "inner.txt").write_text("x")
+
+        def order(workers):
+            return [e.path for listing in ParallelWalker([temp_dir], workers=workers)
+                    for e in listing.files]
+
+        baseline = order(1)
+        assert baseline == sorted(baseline, key=lambda p: Path(p).relative_to(temp_dir).parts)
+        for workers in (2, 4, 8):
+            assert order(workers) == baseline
+
+    def test_multiple_roots_in_order(self, temp_dir):
+        """Test roots are yielded in the configured order"""
+        roots = []
+        for name in ("b_root", "a_root"):
+            root = Path(temp_dir) / name
+            root.mkdir()
+            (root / f"{name}.txt").write_text("x")
+            roots.append(str(root))
+
+        names = [e.name for listing in ParallelWalker(roots, workers=3) for e in listing.files]
+        assert names == ["b_root.txt", "a_root.txt"]
+
+    def test_non_recursive(self, sample_directory_structure):
+        """Test non-recursive mode yields only root listings with their sub dirs"""
+        listings = list(ParallelWalker([str(sample_directory_structure)], recursive=False))
+        assert len(listings) == 1
+        assert [d.name for d in listings[0].dirs] == ["code", "documents", "images"]
+
+    def test_stats_merged(self, temp_dir):
+        """Test per-thread statistics are merged after the walk"""
+        make_tree(temp_dir, 6, 7)
+        stats = TraversalStats()
+        for _ in ParallelWalker([temp_dir], workers=3, stats=stats):
+            pass
+        assert stats.dirs == 7
+        assert stats.files == 42
+
+    def test_small_buffer_does_not_deadlock(self, temp_dir):
+        """Test the walker keeps making progress with a tiny look-ahead buffer"""
+        make_tree(temp_dir, 20, 2)
+        files = [e for listing in ParallelWalker([temp_dir], workers=4, max_buffered=1)
+                 for e in listing.files]
+        assert len(files) == 40
+
+    def test_cancel(self, temp_dir):
+        """Test cancel stops the walk and joins the worker threads"""
+        make_tree(temp_dir, 10, 1)
+        seen = []
+        walker = ParallelWalker([temp_dir], workers=2, cancel=lambda: len(seen) >= 2)
+        for listing in walker:
+            seen.append(listing)
+        assert len(seen) == 2
+
+
+@pytest.mark.slow
+def test_traversal_benchmark(temp_dir):
+    """Compare os.scandir traversal against the os.walk + exists/access/stat loop"""
+    files_per_dir = int(os.environ.get("FILEGATHER_BENCH_FILES", "20000")) // 20
+    make_tree(temp_dir, 20, files_per_dir)
+
+    start = time.perf_counter()
+    legacy_count = 0
+    for root, _, files in os.walk(temp_dir):
+        for file in files:
+            file_path = Path(root) / file
+            if not file_path.exists() or not os.access(str(file_path), os.R_OK):
+                continue
+            file_path.stat()
+            legacy_count += 1
+    legacy_time = time.perf_counter() - start
+
+    stats = TraversalStats()
+    start = time.perf_counter()
+    scandir_count = sum(len(listing.files) for listing in walk_entries(temp_dir, stats=stats))
+    scandir_time = time.perf_counter() - start
+
+    print(f"\nos.walk + stat: {legacy_time:.3f}s, scandir: {scandir_time:.3f}s, "
+          f"stats: {stats.as_dict()}")
+    assert scandir_count == legacy_count
+    assert scandir_time < legacy_time
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,114 @@
+"""
+Unit Tests: Background Search Worker (components.workers)
+Tests for the SearchWorker matching loop, batched result signals and cancellation
+"""
+
+import sys
+import os
+import pytest
+
+# Set QT_QPA_PLATFORM to offscreen to avoid GUI issues
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.workers import SearchWorker
+
+
+def run_worker(worker):
+    """Run a worker synchronously and collect its signals"""
+    collected = {"counts": [], "finished": None}
+    worker.files_found.connect(lambda results, count: collected["counts"].append(count))
+    worker.finished.connect(lambda results: collected.__setitem__("finished", results))
+    worker.run()
+    return collected
+
+
+class TestSearchWorker:
+    """SearchWorker tests"""
+
+    def test_filename_search(self, sample_directory_structure):
+        """Test fuzzy filename search over a directory tree"""
+        worker = SearchWorker([str(sample_directory_structure)], ["report", "photo"])
+        collected = run_worker(worker)
+
+        found = collected["finished"]
+        names = sorted(info['name'] for info in found)
+        assert names == ["photo.jpg", "report1.txt", "report2.txt"]
+        assert len(found.hits("report")) == 2
+        assert len(found.hits("photo")) == 1
+
+    def test_results_streamed_in_batches(self, sample_directory_structure):
+        """Test every found file is delivered through files_found"""
+        worker = SearchWorker([str(sample_directory_structure)], ["report", "readme"])
+        collected = run_worker(worker)
+
+        found = collected["finished"]
+        assert collected["counts"] == sorted(set(collected["counts"]))
+        assert collected["counts"][-1] == len(found) == 3
+
+    def test_results_record_keywords(self, sample_directory_structure):
+        """Test each result row records the keywords it matched"""
+        worker = SearchWorker([str(sample_directory_structure)], ["report", "readme"])
+        found = run_worker(worker)["finished"]
+
+        matched = {found.name(row): found.keywords_at(row) for row in range(len(found))}
+        assert matched["readme.txt"] == ("readme",)
+        assert matched["report1.txt"] == ("report",)
+
+    def test_exact_search(self, sample_directory_structure):
+        """Test exact search only matches the full filename stem"""
+        worker = SearchWorker([str(sample_directory_structure)], ["report", "readme"], exact=True)
+        collected = run_worker(worker)
+
+        found = collected["finished"]
+        assert [info['name'] for info in found] == ["readme.txt"]
+        assert len(found.hits("report")) == 0
+
+    def test_content_search(self, sample_directory_structure):
+        """Test content search mode"""
+        worker = SearchWorker([str(sample_directory_structure)], ["hello"], search_mode="content")
+        collected = run_worker(worker)
+
+        found = collected["finished"]
+        assert [info['name'] for info in found] == ["script.py"]
+
+    def test_file_type_filter(self, sample_directory_structure):
+        """Test extension filter is applied"""
+        worker = SearchWorker([str(sample_directory_structure)], ["report", "script"],
+                              file_types=[".py"])
+        collected = run_worker(worker)
+
+        found = collected["finished"]
+        assert [info['name'] for info in found] == ["script.py"]
+
+    def test_without_subfolders(self, sample_directory_structure):
+        """Test non-recursive search only lists the root folder"""
+        root = sample_directory_structure / "documents"
+        worker = SearchWorker([str(root)], ["report"], include_subfolders=False)
+        collected = run_worker(worker)
+
+        found = collected["finished"]
+        assert [info['name'] for info in found] == ["report1.txt"]
+
+    def test_cancel_before_run(self, sample_directory_structure):
+        """Test a cancelled worker still emits finished with no results"""
+        worker = SearchWorker([str(sample_directory_structure)], ["report"])
+        worker.cancel()
+        collected = run_worker(worker)
+
+        found = collected["finished"]
+        assert len(found) == 0
+        assert found.keywords == ["report"]
+
+    def test_missing_folder(self):
+        """Test non-existent search folders are skipped"""
+        worker = SearchWorker(["/nonexistent/folder/path"], ["report"])
+        collected = run_worker(worker)
+
+        found = collected["finished"]
+        assert len(found) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])